@@ -0,0 +1,142 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src import windowing
+
+
+MODULE = "src.app"
+RUNS = 7
+TOP = 10
+BUDGET_MS = 400.0
+
+GUI_MODULES = ("tkinter", "customtkinter", "PIL", "pystray")
+
+# Runs the app from a fresh interpreter and exits as soon as the hotkey
+# listener is started from the skeleton in the keybinds file header.
+ARMED_PROGRAM = r'''
+import os, sys, time
+start = time.perf_counter()
+
+from src import skeleton
+
+def armed(listener):
+    print((time.perf_counter() - start) * 1000, flush=True)
+    os._exit(0)
+
+skeleton.SkeletonListener.start = armed
+
+from src.app import QuickKeysApp
+QuickKeysApp().run()
+sys.exit("the hotkeys were never armed from the skeleton")
+'''
+
+
+def _import_times(module: str) -> Dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    times: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def _write_data_dir(home: str) -> None:
+    from src.config import APP_NAME
+    from src.skeleton import HotkeySkeleton
+    from src.storage import KeybindStore
+
+    data_dir = Path(home) / ".config" / APP_NAME
+    data_dir.mkdir(parents=True)
+    (data_dir / "settings.json").write_text(json.dumps({'hotkey_skeleton_enabled': True}))
+
+    hotkeys = [f"<ctrl>+<alt>+{key}" for key in "abcdefghijklmnopqrstuvwxyz0123456789"]
+    skeleton = HotkeySkeleton.build(hotkeys).to_bytes()
+    (data_dir / "keybinds.enc").write_bytes(
+        KeybindStore.HEADER.pack(KeybindStore.MAGIC, 1) +
+        KeybindStore.SKELETON_LENGTH.pack(len(skeleton)) +
+        skeleton
+    )
+
+
+def _armed_times() -> List[float]:
+    samples = []
+    for _ in range(RUNS):
+        with tempfile.TemporaryDirectory() as home:
+            _write_data_dir(home)
+            result = subprocess.run(
+                [sys.executable, "-c", ARMED_PROGRAM],
+                cwd=ROOT,
+                env=dict(os.environ, HOME=home),
+                capture_output=True,
+                text=True,
+            )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        samples.append(float(result.stdout.split()[-1]))
+    return samples
+
+
+def _check_armed() -> Optional[str]:
+    if not windowing.is_supported():
+        print("hotkeys armed: skipped, no X display (run under xvfb-run)")
+        return None
+
+    samples = _armed_times()
+    median = statistics.median(samples)
+    print(f"hotkeys armed from skeleton: median {median:.1f} ms "
+          f"(min {min(samples):.1f} ms, {RUNS} runs, budget {BUDGET_MS:.0f} ms)")
+    if median > BUDGET_MS:
+        return f"hotkeys armed after {median:.1f} ms, over the {BUDGET_MS:.0f} ms budget"
+    return None
+
+
+def main() -> int:
+    runs: List[Dict[str, int]] = [_import_times(MODULE) for _ in range(RUNS)]
+    totals = [times[MODULE] for times in runs]
+    last = runs[-1]
+
+    print(f"import {MODULE}: median {statistics.median(totals) / 1000:.1f} ms "
+          f"(min {min(totals) / 1000:.1f} ms, {RUNS} runs)")
+
+    top: List[Tuple[int, str]] = sorted(
+        ((us, name) for name, us in last.items() if name.startswith("src.") and name != MODULE),
+        reverse=True,
+    )[:TOP]
+    for us, name in top:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    failures = []
+    loaded = [name for name in GUI_MODULES if name in last]
+    if loaded:
+        failures.append(f"GUI modules imported eagerly: {', '.join(loaded)}")
+
+    failures.append(_check_armed())
+
+    failures = [failure for failure in failures if failure]
+    for failure in failures:
+        print(failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
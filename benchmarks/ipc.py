@@ -0,0 +1,85 @@
+import json
+import socket
+import statistics
+import sys
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.ipc import recv_message, send_message
+from src.storage import Keybind
+
+
+SIZES = (100, 1_000, 10_000)
+REPEAT = 9
+BUDGET_MS = {100: 5.0, 1_000: 25.0, 10_000: 250.0}
+
+
+def _keybinds(count: int) -> List[Dict[str, Any]]:
+    return [
+        asdict(Keybind.create_new(
+            hotkey=f"<ctrl>+<alt>+{i % 10}",
+            name=f"Keybind {i}",
+            action_type='launch_paste',
+            username=f"user{i}",
+            password=f"secret-{i:08d}",
+            program_path="/usr/bin/firefox",
+            program_args="--new-window https://example.com",
+        ))
+        for i in range(count)
+    ]
+
+
+def _serve(sock: socket.socket, result: List[Dict[str, Any]]) -> None:
+    while recv_message(sock) is not None:
+        send_message(sock, {'ok': True, 'result': result})
+
+
+def _median_ms(action) -> float:
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        action()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    failures = []
+    for count in SIZES:
+        keybinds = _keybinds(count)
+        response = {'ok': True, 'result': keybinds}
+        payload = json.dumps(response, separators=(',', ':')).encode('utf-8')
+
+        client, server = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        thread = threading.Thread(target=_serve, args=(server, keybinds), daemon=True)
+        thread.start()
+
+        def round_trip():
+            send_message(client, {'command': 'list'})
+            recv_message(client)
+
+        encode = _median_ms(lambda: json.dumps(response, separators=(',', ':')).encode('utf-8'))
+        decode = _median_ms(lambda: json.loads(payload.decode('utf-8')))
+        total = _median_ms(round_trip)
+
+        client.close()
+        thread.join()
+        server.close()
+
+        print(f"{count:>6} keybinds: {len(payload) / 1024:8.1f} KiB  encode {encode:7.2f} ms  "
+              f"decode {decode:7.2f} ms  list round trip {total:7.2f} ms")
+        if total > BUDGET_MS[count]:
+            failures.append(f"list of {count} keybinds took {total:.2f} ms (budget {BUDGET_MS[count]} ms)")
+
+    for failure in failures:
+        print(failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+import statistics
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.gui.config_window import ConfigWindow, _VirtualKeybindList
+from src.search import KeybindSearchIndex
+from src.storage import Keybind, StoreChanges
+
+
+SIZES = (100, 1_000, 10_000)
+REPEAT = 15
+VIEWPORT_HEIGHT = 600
+
+BUDGET_MS = {
+    'full refresh': 80.0,
+    'search refresh': 40.0,
+    'apply 1 update': 2.0,
+    'scroll 1 row': 2.0,
+}
+
+PROGRAMS = ("firefox", "code", "slack", "thunderbird", "gimp", "terminal", "spotify", "obsidian")
+
+
+class _Store:
+
+    def __init__(self, keybinds: List[Keybind]):
+        self.keybinds: Dict[str, Keybind] = {kb.id: kb for kb in keybinds}
+        self._listeners = []
+
+    def add_listener(self, listener) -> None:
+        self._listeners.append(listener)
+
+    def get(self, keybind_id: str):
+        return self.keybinds.get(keybind_id)
+
+    def get_all(self) -> List[Keybind]:
+        return list(self.keybinds.values())
+
+
+class _Viewport:
+
+    def winfo_height(self) -> int:
+        return VIEWPORT_HEIGHT
+
+
+class _Scrollbar:
+
+    def set(self, first: float, last: float) -> None:
+        pass
+
+
+class _Card:
+
+    shown = 0
+
+    def __init__(self):
+        self.keybind = None
+
+    def show_keybind(self, keybind, label, selected) -> None:
+        self.keybind = keybind
+        _Card.shown += 1
+
+    def place(self, **kwargs) -> None:
+        pass
+
+    def place_forget(self) -> None:
+        pass
+
+
+def _keybinds(count: int) -> List[Keybind]:
+    return [
+        Keybind(
+            id=f"kb-{i:05d}",
+            name=f"{PROGRAMS[i % len(PROGRAMS)].title()} {i}",
+            hotkey=f"<ctrl>+<alt>+{i % 10}",
+            action_type='launch',
+            program_path=f"/usr/bin/{PROGRAMS[i % len(PROGRAMS)]}",
+            created_at=float(i),
+        )
+        for i in range(count)
+    ]
+
+
+def _window(store: _Store) -> ConfigWindow:
+    keybind_list = _VirtualKeybindList.__new__(_VirtualKeybindList)
+    keybind_list._label_for = lambda kb: kb.name
+    keybind_list.items = []
+    keybind_list.reverse = False
+    keybind_list.selected_id = None
+    keybind_list._keys = []
+    keybind_list._key_by_id = {}
+    keybind_list._offset = 0
+    keybind_list._pool = []
+    keybind_list.viewport = _Viewport()
+    keybind_list.scrollbar = _Scrollbar()
+    keybind_list._ensure_pool = lambda size: keybind_list._pool.extend(
+        _Card() for _ in range(size - len(keybind_list._pool))
+    )
+
+    window = ConfigWindow.__new__(ConfigWindow)
+    window.store = store
+    window.search_index = KeybindSearchIndex(store)
+    window.keybind_list = keybind_list
+    window._sort_column = 'name'
+    window._sort_cycle = 0
+    window._query = ""
+    window._search_query = lambda: window._query
+    window._update_empty_label = lambda: None
+    return window
+
+
+def _median_ms(action: Callable[[], None]) -> float:
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        action()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def _measure(count: int) -> Dict[str, Any]:
+    store = _Store(_keybinds(count))
+    window = _window(store)
+    keybind_list = window.keybind_list
+    results: Dict[str, Any] = {}
+
+    results['full refresh'] = _median_ms(window._refresh_list)
+
+    def search_refresh():
+        window._query = "thunder"
+        window._refresh_list()
+        window._query = ""
+
+    window.search_index.search("")
+    results['search refresh'] = _median_ms(search_refresh)
+    window._refresh_list()
+
+    target = store.get(f"kb-{count // 2:05d}")
+    keybind_list.selected_id = target.id
+    keybind_list._scroll_to(keybind_list.items.index(target) * keybind_list.ROW_HEIGHT)
+    offset = keybind_list._offset
+    renames = iter(range(REPEAT))
+
+    def apply_update():
+        updated = replace(target, hotkey=f"<ctrl>+<shift>+{next(renames)}")
+        store.keybinds[updated.id] = updated
+        window.apply_changes(StoreChanges(updated=[updated.id]))
+
+    results['apply 1 update'] = _median_ms(apply_update)
+    results['selection kept'] = keybind_list.selected_id == target.id
+    results['offset kept'] = keybind_list._offset == offset
+
+    def scroll():
+        keybind_list._scroll_to(keybind_list._offset + keybind_list.ROW_HEIGHT)
+
+    _Card.shown = 0
+    results['scroll 1 row'] = _median_ms(scroll)
+    results['cards per render'] = _Card.shown / REPEAT
+    return results
+
+
+def main() -> int:
+    failures = []
+    for count in SIZES:
+        results = _measure(count)
+        cells = "  ".join(
+            f"{name} {value:6.2f} ms" for name, value in results.items() if name in BUDGET_MS
+        )
+        print(f"{count:>6} keybinds:  {cells}  cards/render {results['cards per render']:.0f}")
+        if not results['selection kept']:
+            failures.append(f"editing the selected keybind cleared the selection at {count} keybinds")
+        if not results['offset kept']:
+            failures.append(f"editing the selected keybind moved the scroll position at {count} keybinds")
+        for name, budget in BUDGET_MS.items():
+            if results[name] > budget:
+                failures.append(f"{name} at {count} keybinds took {results[name]:.2f} ms (budget {budget} ms)")
+
+    for failure in failures:
+        print(failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
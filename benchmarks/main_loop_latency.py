@@ -0,0 +1,169 @@
+import heapq
+import itertools
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.app import QuickKeysApp
+from src.encryption import EncryptionManager
+from src.events import EventBus
+from src.gui.worker import TkWorker
+from src.storage import Keybind, KeybindStore
+
+
+KEYBINDS = 1_000
+PASSWORD = "benchmark-password"
+HEARTBEAT_MS = 10
+BUDGET_MS = 60.0
+TIMEOUT = 30.0
+
+
+class _Variable:
+
+    def __init__(self, value: bool = False):
+        self.value = value
+
+    def set(self, value: bool) -> None:
+        self.value = value
+
+    def get(self) -> bool:
+        return self.value
+
+
+class _FakeRoot:
+
+    def __init__(self):
+        self._timers = []
+        self._sequence = itertools.count()
+        self.lateness: List[float] = []
+
+    def after(self, ms: int, callback: Callable[[], None]) -> None:
+        heapq.heappush(self._timers, (time.perf_counter() + ms / 1000, next(self._sequence), callback))
+
+    def after_idle(self, callback: Callable[[], None]) -> None:
+        self.after(0, callback)
+
+    def _heartbeat(self, due: float) -> None:
+        now = time.perf_counter()
+        self.lateness.append(now - due)
+        next_due = now + HEARTBEAT_MS / 1000
+        heapq.heappush(self._timers, (next_due, next(self._sequence), lambda: self._heartbeat(next_due)))
+
+    def start_heartbeat(self) -> None:
+        self.lateness.clear()
+        due = time.perf_counter()
+        heapq.heappush(self._timers, (due, next(self._sequence), lambda: self._heartbeat(due)))
+
+    def wait_variable(self, variable: _Variable, timeout: float = TIMEOUT) -> bool:
+        deadline = time.perf_counter() + timeout
+        while not variable.get():
+            now = time.perf_counter()
+            if now > deadline:
+                return False
+            if not self._timers:
+                time.sleep(0.001)
+                continue
+            due, _, callback = self._timers[0]
+            if due > now:
+                time.sleep(min(due - now, 0.001))
+                continue
+            heapq.heappop(self._timers)
+            callback()
+        return True
+
+
+def _create_store(data_dir: Path) -> None:
+    encryption = EncryptionManager()
+    encryption.initialize_new(PASSWORD)
+    store = KeybindStore(encryption, data_dir)
+    store.add_many([
+        Keybind.create_new(hotkey=f"<ctrl>+<alt>+{i % 10}", name=f"Keybind {i}", action_type="paste",
+                           username=f"user{i}", password=f"secret{i}")
+        for i in range(KEYBINDS)
+    ])
+
+
+def _app(data_dir: Path) -> SimpleNamespace:
+    app = SimpleNamespace(data_dir=data_dir, encryption=EncryptionManager())
+    app.store = KeybindStore(app.encryption, data_dir)
+    app._verify_password = lambda password: QuickKeysApp._verify_password(app, password)
+    return app
+
+
+def _run_in_nested_wait(root: _FakeRoot, events: EventBus, worker: TkWorker,
+                        operation: Callable) -> Optional[float]:
+    delivered: List[bool] = []
+
+    def handler(_):
+        closed = _Variable(False)
+        worker.submit(operation, on_done=lambda _: closed.set(True), on_error=print)
+        delivered.append(root.wait_variable(closed))
+
+    events.subscribe('benchmark', handler)
+    events.post('benchmark')
+    root.start_heartbeat()
+
+    finished = _Variable(False)
+
+    def poll():
+        if delivered:
+            finished.set(True)
+        else:
+            root.after(HEARTBEAT_MS, poll)
+
+    root.after(0, poll)
+    if not root.wait_variable(finished) or not delivered[0]:
+        return None
+    return max(root.lateness) * 1000
+
+
+def main() -> int:
+    root = _FakeRoot()
+    events = EventBus(root)
+    worker = TkWorker(events)
+    failures = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        _create_store(data_dir)
+        app = _app(data_dir)
+
+        scenarios = [
+            ("unlock", lambda: QuickKeysApp._unlock_store(app, PASSWORD)),
+            ("save", lambda: app.store.update_many([
+                replace(kb, name=kb.name + " (renamed)") for kb in app.store.get_all()
+            ])),
+        ]
+
+        for name, operation in scenarios:
+            start = time.perf_counter()
+            worst = _run_in_nested_wait(root, events, worker, operation)
+            elapsed = (time.perf_counter() - start) * 1000
+            if worst is None:
+                failures.append(f"{name}: completion never reached the nested wait_variable")
+                print(f"{name:>8}: no completion after {TIMEOUT:.0f} s")
+                continue
+            print(f"{name:>8}: took {elapsed:7.1f} ms, worst main-loop stall {worst:5.1f} ms")
+            if worst > BUDGET_MS:
+                failures.append(f"{name}: main loop stalled {worst:.1f} ms (budget {BUDGET_MS} ms)")
+
+        start = time.perf_counter()
+        QuickKeysApp._unlock_store(app, PASSWORD)
+        print(f"  inline: unlock on the Tk thread would stall it {(time.perf_counter() - start) * 1000:7.1f} ms")
+
+    worker.shutdown()
+    events.detach()
+
+    for failure in failures:
+        print(failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
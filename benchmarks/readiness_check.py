@@ -0,0 +1,105 @@
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src import windowing
+from src.readiness import PathProbe, ReadinessProbe, WindowProbe, wait_until_ready
+
+
+READY_AFTER = 0.5
+TIMEOUT = 5.0
+TOLERANCE = 0.5
+
+# Becomes "ready" after a delay: either by creating a file, or by mapping
+# a window with _NET_WM_PID set and publishing it in _NET_CLIENT_LIST the
+# way a window manager would, so the check also works on a bare Xvfb.
+STUB_PROGRAM = r'''
+import ctypes, ctypes.util, os, sys, time
+
+delay, ready_path = float(sys.argv[1]), sys.argv[2]
+time.sleep(delay)
+
+if ready_path:
+    open(ready_path, "w").close()
+else:
+    xlib = ctypes.cdll.LoadLibrary(ctypes.util.find_library("X11"))
+    xlib.XOpenDisplay.restype = ctypes.c_void_p
+    xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+    xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+    xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+    xlib.XCreateSimpleWindow.restype = ctypes.c_ulong
+    xlib.XCreateSimpleWindow.argtypes = [
+        ctypes.c_void_p, ctypes.c_ulong, ctypes.c_int, ctypes.c_int, ctypes.c_uint,
+        ctypes.c_uint, ctypes.c_uint, ctypes.c_ulong, ctypes.c_ulong,
+    ]
+    xlib.XInternAtom.restype = ctypes.c_ulong
+    xlib.XInternAtom.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int]
+    xlib.XChangeProperty.argtypes = [
+        ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong,
+        ctypes.c_int, ctypes.c_int, ctypes.c_void_p, ctypes.c_int,
+    ]
+    xlib.XMapWindow.argtypes = [ctypes.c_void_p, ctypes.c_ulong]
+    xlib.XFlush.argtypes = [ctypes.c_void_p]
+
+    XA_CARDINAL, XA_WINDOW = 6, 33
+    PROP_MODE_REPLACE, PROP_MODE_APPEND = 0, 2
+
+    display = xlib.XOpenDisplay(None)
+    root = xlib.XDefaultRootWindow(display)
+    window = xlib.XCreateSimpleWindow(display, root, 0, 0, 200, 100, 0, 0, 0)
+    pid = ctypes.c_ulong(os.getpid())
+    xlib.XChangeProperty(display, window, xlib.XInternAtom(display, b"_NET_WM_PID", 0),
+                         XA_CARDINAL, 32, PROP_MODE_REPLACE, ctypes.byref(pid), 1)
+    xlib.XMapWindow(display, window)
+    client = ctypes.c_ulong(window)
+    xlib.XChangeProperty(display, root, xlib.XInternAtom(display, b"_NET_CLIENT_LIST", 0),
+                         XA_WINDOW, 32, PROP_MODE_APPEND, ctypes.byref(client), 1)
+    xlib.XFlush(display)
+
+time.sleep(60)
+'''
+
+
+def _check(name: str, probes: List[ReadinessProbe], ready_path: str = "") -> Optional[str]:
+    process = subprocess.Popen([sys.executable, "-c", STUB_PROGRAM, str(READY_AFTER), ready_path])
+    try:
+        ready_after = wait_until_ready(process, probes, TIMEOUT)
+    finally:
+        process.kill()
+        process.wait()
+
+    if ready_after is None:
+        print(f"{name:>12}: not ready within {TIMEOUT:.0f} s")
+        return f"{name} never reported the stub program as ready"
+
+    print(f"{name:>12}: ready after {ready_after * 1000:6.1f} ms (stub ready at {READY_AFTER * 1000:.0f} ms)")
+    if not READY_AFTER <= ready_after <= READY_AFTER + TOLERANCE:
+        return f"{name} reported ready after {ready_after:.3f} s, expected {READY_AFTER}-{READY_AFTER + TOLERANCE} s"
+    return None
+
+
+def main() -> int:
+    failures = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ready_path = os.path.join(tmp, "ready")
+        failures.append(_check("PathProbe", [PathProbe(ready_path)], ready_path))
+
+    if windowing.is_supported():
+        failures.append(_check("WindowProbe", [WindowProbe()]))
+    else:
+        print(" WindowProbe: skipped, no X display (run under xvfb-run)")
+
+    failures = [failure for failure in failures if failure]
+    for failure in failures:
+        print(failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+import os
+import shutil
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.launcher import Launcher
+from src.supervisor import ProcessSupervisor
+
+
+LAUNCHES = 200
+PARENT_HEAP_MB = (0, 512)
+MARGIN = 1.25
+PROGRAM = "true"
+
+
+def _spawn_times(backend: str) -> List[float]:
+    supervisor = ProcessSupervisor()
+    launcher = Launcher(supervisor, backend)
+    prepared = launcher.prepare(PROGRAM, [])
+
+    samples = []
+    for _ in range(LAUNCHES):
+        result = launcher.launch_prepared(prepared)
+        if not result.ok:
+            raise RuntimeError(result.error)
+        if result.backend != backend:
+            raise RuntimeError(f"expected the {backend} backend, launched with {result.backend}")
+        samples.append(result.spawn_seconds * 1000)
+
+    deadline = time.monotonic() + 10
+    while supervisor.stats().live and time.monotonic() < deadline:
+        time.sleep(0.05)
+    supervisor.stop()
+    return samples
+
+
+def _absolute_path_launch() -> str:
+    supervisor = ProcessSupervisor()
+    launcher = Launcher(supervisor, 'posix_spawn')
+    prepared = launcher.prepare(shutil.which(PROGRAM), [])
+    result = launcher.launch_prepared(prepared)
+    supervisor.stop()
+    if not result.ok:
+        raise RuntimeError(result.error)
+    return f"absolute path, cwd {prepared.cwd}: launched with {result.backend}"
+
+
+def _summary(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        'median': statistics.median(ordered),
+        'p95': ordered[int(0.95 * (len(ordered) - 1))],
+    }
+
+
+def main() -> int:
+    if not hasattr(os, 'posix_spawn'):
+        print("posix_spawn is not available on this platform")
+        return 0
+
+    failures = []
+    for heap_mb in PARENT_HEAP_MB:
+        ballast = bytearray(heap_mb * 1024 * 1024)
+        for offset in range(0, len(ballast), 4096):
+            ballast[offset] = 1
+
+        results = {backend: _summary(_spawn_times(backend)) for backend in ('popen', 'posix_spawn')}
+        del ballast
+
+        for backend, summary in results.items():
+            print(f"parent heap {heap_mb:>4} MB  {backend:<12} "
+                  f"median {summary['median']:6.3f} ms  p95 {summary['p95']:6.3f} ms")
+
+        if results['posix_spawn']['median'] > results['popen']['median'] * MARGIN:
+            failures.append(f"posix_spawn is slower than Popen with a {heap_mb} MB parent heap")
+
+    # os.posix_spawn has no chdir file action, so a launch whose working
+    # directory differs from ours (the program's own directory, by default
+    # for absolute paths) always goes through Popen.
+    print(_absolute_path_launch())
+
+    for failure in failures:
+        print(failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,10 +2,35 @@ import sys
 
 
 def main():
+    from src.config import get_data_dir
+    from src.instance import InstanceLock, hand_off
+
+    daemon = '--daemon' in sys.argv[1:]
+    data_dir = get_data_dir()
+    instance_lock = InstanceLock(data_dir)
+    if not instance_lock.acquire():
+        if daemon:
+            print("QuickKeys is already running; stop it before starting the daemon", file=sys.stderr)
+            sys.exit(1)
+        response = hand_off(data_dir, 'configure')
+        if response is None:
+            print("QuickKeys is already running but did not respond")
+            sys.exit(1)
+        if not response.get('ok'):
+            print(response.get('error', "QuickKeys is already running"))
+            sys.exit(1)
+        sys.exit(0)
+
     try:
+        if daemon:
+            from src.daemon import QuickKeysDaemon
+
+            QuickKeysDaemon(instance_lock=instance_lock).run()
+            return
+
         from src.app import QuickKeysApp
 
-        app = QuickKeysApp()
+        app = QuickKeysApp(instance_lock=instance_lock)
         app.run()
 
     except ImportError as e:
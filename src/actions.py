@@ -0,0 +1,254 @@
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .clipboard import ClipboardBackup, ClipboardManager
+from .launch_stats import LaunchStats
+from .launcher import Launcher, LaunchResult, PreparedLaunch
+from . import windowing
+from .macro import compile_macro
+from .prewarm import Prewarmer
+from .process_index import ProcessIndex
+from .readiness import build_probes
+from .settings import AppSettings
+from .storage import Keybind, KeybindStore
+from .workspace import WorkspaceError, WorkspaceMember, WorkspacePlan, order_members
+
+
+class PreparedAction:
+
+    def __init__(
+        self,
+        keybind: Keybind,
+        run: Callable[[], None],
+        launches: Optional[List[PreparedLaunch]] = None,
+        member_ids: Optional[List[str]] = None
+    ):
+        self.keybind = keybind
+        self.run = run
+        self.launches = launches or []
+        self.member_ids = member_ids or []
+
+    def is_stale(self) -> bool:
+        return any(launch.is_stale() for launch in self.launches)
+
+
+class ActionRuntime:
+
+    def __init__(
+        self,
+        clipboard: ClipboardManager,
+        launcher: Launcher,
+        settings: AppSettings,
+        launch_stats: Optional[LaunchStats] = None,
+        prewarmer: Optional[Prewarmer] = None
+    ):
+        self.clipboard = clipboard
+        self.launcher = launcher
+        self.settings = settings
+        self.launch_stats = launch_stats
+        self.prewarmer = prewarmer
+        self.process_index = ProcessIndex(launcher.supervisor)
+        self.store: Optional[KeybindStore] = None
+        self._prepared: Dict[str, PreparedAction] = {}
+        self._lock = threading.Lock()
+
+    def prepare(self, keybind: Keybind) -> PreparedAction:
+        builder = self._BUILDERS.get(keybind.action_type)
+        if builder is None:
+            raise ValueError(f"Unknown action type '{keybind.action_type}'")
+
+        if self.store is not None:
+            keybind = self.store.resolve(keybind)
+        prepared = builder(self, keybind)
+
+        with self._lock:
+            self._prepared[keybind.id] = prepared
+        return prepared
+
+    def get(self, keybind_id: str) -> Optional[PreparedAction]:
+        with self._lock:
+            prepared = self._prepared.get(keybind_id)
+
+        if prepared is not None and prepared.is_stale():
+            prepared = self.prepare(prepared.keybind)
+
+        return prepared
+
+    def invalidate(self, keybind_id: Optional[str] = None) -> List[str]:
+        with self._lock:
+            if keybind_id is None:
+                self._prepared.clear()
+                return []
+
+            self._prepared.pop(keybind_id, None)
+            dependents = [
+                other_id for other_id, prepared in self._prepared.items()
+                if keybind_id in prepared.member_ids
+            ]
+            for other_id in dependents:
+                del self._prepared[other_id]
+            return dependents
+
+    def prepared_launches(self) -> List[Tuple[str, str]]:
+        with self._lock:
+            prepared = list(self._prepared.values())
+        return [
+            (launch.program_path, launch.executable)
+            for action in prepared
+            for launch in action.launches
+        ]
+
+    def execute(self, keybind_id: str) -> None:
+        if self.prewarmer is not None:
+            self.prewarmer.note_activity()
+
+        prepared = None
+        try:
+            prepared = self.get(keybind_id)
+            if prepared is not None:
+                prepared.run()
+        except Exception as e:
+            name = prepared.keybind.name if prepared else keybind_id
+            print(f"Error executing keybind {name}: {e}")
+
+    def _clipboard_backup(self, keybind: Keybind) -> ClipboardBackup:
+        return ClipboardBackup(
+            self.clipboard,
+            enabled=keybind.restore_clipboard,
+            max_size=self.settings.clipboard_backup_max_bytes
+        )
+
+    def _paste(self, keybind: Keybind) -> None:
+        with self._clipboard_backup(keybind):
+            if keybind.custom_text:
+                self.clipboard.paste_custom_text(keybind.custom_text)
+            else:
+                self.clipboard.paste_credentials(
+                    keybind.username,
+                    keybind.password
+                )
+
+    def _prepare_launch(self, keybind: Keybind) -> PreparedLaunch:
+        return self.launcher.prepare(
+            keybind.program_path,
+            self.launcher._parse_args(keybind.program_args)
+        )
+
+    def _learned_wait(self, keybind: Keybind) -> Optional[float]:
+        if keybind.adaptive_wait and self.launch_stats is not None:
+            return self.launch_stats.learned_wait(keybind.program_path)
+        return None
+
+    def _record_ready(self, keybind: Keybind, seconds: float) -> None:
+        if self.launch_stats is not None:
+            self.launch_stats.record(keybind.program_path, seconds)
+        if self.prewarmer is not None:
+            self.prewarmer.record_launch(keybind.program_path, seconds)
+
+    def _record_timeout(self, keybind: Keybind, seconds: float) -> None:
+        if self.launch_stats is not None and seconds < keybind.wait_seconds:
+            self.launch_stats.record(keybind.program_path, seconds)
+
+    def _wait_ready(self, keybind: Keybind, result: LaunchResult) -> bool:
+        learned = self._learned_wait(keybind)
+        probes = build_probes(keybind.ready_probe, keybind.ready_path)
+        measure = build_probes('auto') if keybind.adaptive_wait and not probes else None
+        return self.launcher.wait_ready(
+            result,
+            learned if learned is not None else keybind.wait_seconds,
+            probes,
+            on_ready=lambda seconds: self._record_ready(keybind, seconds),
+            on_timeout=lambda seconds: self._record_timeout(keybind, seconds),
+            measure=measure,
+        )
+
+    def _record_launch(self, keybind: Keybind, result: LaunchResult) -> None:
+        if not result.ok:
+            return
+        if self.launch_stats is not None:
+            self.launch_stats.record_fire(keybind.program_path)
+        if self.prewarmer is not None:
+            self.prewarmer.observe(keybind.program_path, result.pid)
+
+    def _build_paste(self, keybind: Keybind) -> PreparedAction:
+        return PreparedAction(keybind, lambda: self._paste(keybind))
+
+    def _focus_existing(self, launch: PreparedLaunch) -> bool:
+        pids = self.process_index.find(launch.executable)
+        if not pids:
+            return False
+
+        window_id = windowing.find_window_for_pids(pids)
+        return window_id is not None and windowing.activate_window(window_id)
+
+    def _build_launch(self, keybind: Keybind) -> PreparedAction:
+        launch = self._prepare_launch(keybind)
+
+        def run():
+            if keybind.focus_existing and self._focus_existing(launch):
+                return
+            self._record_launch(keybind, self.launcher.launch_prepared(launch))
+
+        return PreparedAction(keybind, run, [launch])
+
+    def _build_launch_paste(self, keybind: Keybind) -> PreparedAction:
+        launch = self._prepare_launch(keybind)
+
+        def run():
+            result = self.launcher.launch_prepared(launch)
+            self._record_launch(keybind, result)
+            if self._wait_ready(keybind, result):
+                self._paste(keybind)
+
+        return PreparedAction(keybind, run, [launch])
+
+    def _build_macro(self, keybind: Keybind) -> PreparedAction:
+        plan = compile_macro(keybind, self.clipboard, self.launcher)
+        return PreparedAction(
+            keybind,
+            lambda: plan.run(self._clipboard_backup(keybind)),
+            plan.launches
+        )
+
+    def _build_workspace(self, keybind: Keybind) -> PreparedAction:
+        if self.store is None:
+            raise WorkspaceError("Workspaces need an unlocked keybind store")
+
+        ordered = order_members(keybind.workspace_members)
+        dependents = {dep for member in ordered for dep in member.get('depends_on', [])}
+
+        members = []
+        for member in ordered:
+            member_keybind = self.store.get(member['keybind_id'])
+            if member_keybind is None:
+                raise WorkspaceError("A workspace program no longer exists")
+            member_keybind = self.store.resolve(member_keybind)
+
+            members.append(WorkspaceMember(
+                keybind=member_keybind,
+                launch=self._prepare_launch(member_keybind),
+                depends_on=list(member.get('depends_on', [])),
+                has_dependents=member['keybind_id'] in dependents,
+            ))
+
+        plan = WorkspacePlan(
+            keybind.name,
+            members,
+            self.launcher,
+            self._paste,
+            self._wait_ready
+        )
+        return PreparedAction(
+            keybind,
+            plan.run,
+            [member.launch for member in members],
+            [member.keybind.id for member in members]
+        )
+
+    _BUILDERS = {
+        'paste': _build_paste,
+        'launch': _build_launch,
+        'launch_paste': _build_launch_paste,
+        'macro': _build_macro,
+        'workspace': _build_workspace,
+    }
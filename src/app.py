@@ -1,47 +1,95 @@
 import platform
 import sys
 import threading
-import tkinter as tk
-from typing import Optional
-
-import customtkinter as ctk
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
 
 from .config import get_data_dir, get_icon_path, is_macos
+from .actions import ActionRuntime
 from .encryption import EncryptionManager
-from .storage import KeybindStore, Keybind
+from .events import EventBus
+from .storage import KeybindStore, Keybind, StoreChanges
+from .store_watcher import StoreWatcher
 from .hotkeys import HotkeyManager
-from .clipboard import ClipboardManager, ClipboardBackup
+from .clipboard import ClipboardManager
+from .instance import InstanceLock, InstanceServer
+from .launch_stats import LaunchStats
 from .launcher import Launcher
-from .tray import SystemTray
-from tkinter import messagebox as _messagebox
-from .gui.theme import configure_appearance
-from .gui.master_password import MasterPasswordDialog, WrongPasswordDialog
-from .gui.config_window import ConfigWindow
+from .prewarm import Prewarmer
+from .search import KeybindSearchIndex
+from .settings import AppSettings
+from .skeleton import HotkeySkeleton, SkeletonListener, combo_key
+
+if TYPE_CHECKING:
+    import tkinter as tk
+
+    from .gui.dialog_pool import DialogPool
+    from .gui.worker import TkWorker
+    from .gui.config_window import ConfigWindow
+    from .gui.palette import CommandPalette
+    from .tray import SystemTray
 
 
 class QuickKeysApp:
 
-    def __init__(self):
+    def __init__(self, instance_lock: Optional[InstanceLock] = None):
         self.data_dir = get_data_dir()
+        self.instance_lock = instance_lock
+        self.instance_server = InstanceServer(self.data_dir, self._on_instance_message)
+        self.settings = AppSettings.load(self.data_dir)
         self.encryption = EncryptionManager()
         self.store: Optional[KeybindStore] = None
+        self.store_watcher: Optional[StoreWatcher] = None
         self.hotkeys = HotkeyManager()
         self.clipboard = ClipboardManager()
         self.launcher = Launcher()
-        self.tray: Optional[SystemTray] = None
-        self.config_window: Optional[ConfigWindow] = None
+        self.launch_stats = LaunchStats(self.data_dir)
+        self.prewarmer: Optional[Prewarmer] = None
+        if self.settings.prewarm_enabled:
+            self.prewarmer = Prewarmer(self.data_dir, self.settings, self.launch_stats)
+        self.actions = ActionRuntime(
+            self.clipboard, self.launcher, self.settings, self.launch_stats, self.prewarmer
+        )
+        self.tray: Optional["SystemTray"] = None
+        self.config_window: Optional["ConfigWindow"] = None
+        self.search_index: Optional[KeybindSearchIndex] = None
+        self.palette: Optional["CommandPalette"] = None
+        self.dialogs: Optional["DialogPool"] = None
+        self.worker: Optional["TkWorker"] = None
+
+        self.skeleton_listener: Optional[SkeletonListener] = None
+        self._registered_hotkeys: Dict[str, str] = {}
 
         self._is_unlocked = False
-        self._tk_root: Optional[tk.Tk] = None
+        self._unlocking = False
+        self._tk_root: Optional["tk.Tk"] = None
+
+        self.events = EventBus()
+        self.events.subscribe('configure', lambda _: self._handle_configure())
+        self.events.subscribe('lock', lambda _: self._handle_lock())
+        self.events.subscribe('quit', lambda _: self._handle_quit())
+        self.events.subscribe('palette', lambda _: self._handle_palette())
+        self.events.subscribe('skeleton', self._handle_skeleton_trigger)
+        self.events.subscribe('store-changed', self._handle_store_changed, merge=StoreChanges.merge)
 
     def run(self):
+        self.instance_server.start()
+
+        import customtkinter as ctk
+        from .gui.dialog_pool import DialogPool
+        from .gui.theme import configure_appearance
+        from .gui.worker import TkWorker
+
         configure_appearance()
 
-        if not self._authenticate_startup():
+        skeleton = self._startup_skeleton()
+        if skeleton is None and not self._authenticate_startup():
             return
 
         self._tk_root = ctk.CTk()
         self._tk_root.withdraw()
+        self.dialogs = DialogPool(self._tk_root)
+        self.worker = TkWorker(self.events)
+        self.events.attach(self._tk_root)
 
         icon_path = get_icon_path()
         if icon_path:
@@ -51,153 +99,212 @@ class QuickKeysApp:
                 pass
 
         self.store = KeybindStore(self.encryption, self.data_dir)
+        self.store.skeleton_enabled = self.settings.hotkey_skeleton_enabled
+        self.store.add_listener(self._on_store_changed)
+        self.search_index = KeybindSearchIndex(self.store)
+        self.actions.store = self.store
 
-        if self.store.exists():
-            try:
-                self.store.load()
-            except Exception as e:
-                print(f"Failed to load keybinds: {e}")
-                self._cleanup()
-                return
+        if self.settings.palette_hotkey:
+            from .gui.palette import CommandPalette
+
+            self.palette = CommandPalette(
+                self._tk_root, self.store, self.search_index, self._execute_keybind
+            )
+
+        if skeleton is not None:
+            self._arm_skeleton(skeleton)
         else:
-            self.store.save()
+            if self.store.exists():
+                try:
+                    self.store.load()
+                except Exception as e:
+                    print(f"Failed to load keybinds: {e}")
+                    self._cleanup()
+                    return
+            else:
+                self.store.save()
+
+            self._on_unlocked()
+
+        self._start_tray()
 
+    def _startup_skeleton(self) -> Optional[HotkeySkeleton]:
+        if not self.settings.hotkey_skeleton_enabled:
+            return None
+        return KeybindStore.read_skeleton(self.data_dir / "keybinds.enc")
+
+    def _on_unlocked(self):
         self._is_unlocked = True
 
         self._register_all_hotkeys()
 
-        self._start_tray()
+        has_skeleton = KeybindStore.read_skeleton(self.store.data_path) is not None
+        if has_skeleton != self.store.skeleton_enabled:
+            self.store.save()
+
+        if self.store_watcher is None:
+            self.store_watcher = StoreWatcher(self.store)
+        self.store_watcher.start()
+
+        if self.prewarmer:
+            self.prewarmer.start(self.actions.prepared_launches)
+
+    def _arm_skeleton(self, skeleton: Optional[HotkeySkeleton] = None) -> bool:
+        if not self.settings.hotkey_skeleton_enabled or not self.store:
+            return False
+
+        skeleton = skeleton or KeybindStore.read_skeleton(self.store.data_path)
+        if skeleton is None:
+            return False
+
+        self._disarm_skeleton()
+        self.skeleton_listener = SkeletonListener(skeleton, self._on_skeleton_trigger)
+        self.skeleton_listener.start()
+        return True
+
+    def _disarm_skeleton(self):
+        if self.skeleton_listener:
+            self.skeleton_listener.stop()
+            self.skeleton_listener = None
+
+    def _on_skeleton_trigger(self, combo: str):
+        self.events.post('skeleton', combo)
+
+    def _handle_skeleton_trigger(self, combo: str):
+        if self._is_unlocked:
+            return
+
+        self._try_unlock()
+        if not self._is_unlocked:
+            return
+
+        for keybind in self.store.get_all():
+            if combo_key(keybind.hotkey) == combo:
+                self._execute_keybind(keybind)
+                break
+
+    def _execute_keybind(self, keybind: Keybind):
+        thread = threading.Thread(
+            target=self.actions.execute,
+            args=(keybind.id,),
+            daemon=True
+        )
+        thread.start()
+
+    def _verify_password(self, password: str) -> bool:
+        encrypted_data = KeybindStore.read_encrypted(self.data_dir / "keybinds.enc")
+        if not self.encryption.verify_password(password, encrypted_data):
+            return False
+        self.encryption.initialize_existing(password, encrypted_data)
+        return True
+
+    def _create_password(self, password: str) -> bool:
+        self.encryption.initialize_new(password)
+        return True
+
+    def _unlock_store(self, password: str) -> bool:
+        if not self._verify_password(password):
+            return False
+        if self.store:
+            self.store.load()
+        return True
 
     def _authenticate_startup(self) -> bool:
         store_file = self.data_dir / "keybinds.enc"
         is_new_setup = not store_file.exists()
 
+        from .gui.master_password import MasterPasswordDialog
+
         while True:
             dialog = MasterPasswordDialog(is_new_setup=is_new_setup)
-            password = dialog.show()
+            password = dialog.show(
+                on_submit=self._create_password if is_new_setup else self._verify_password
+            )
 
             if password == "__RESET_DATA__":
                 self._perform_data_reset()
                 is_new_setup = True  # Now treat as new setup
                 continue
 
-            if password is None:
-                return False
-
-            if is_new_setup:
-                self.encryption.initialize_new(password)
-                return True
-            else:
-                try:
-                    encrypted_data = store_file.read_bytes()
-                    if self.encryption.verify_password(password, encrypted_data):
-                        self.encryption.initialize_existing(password, encrypted_data)
-                        return True
-                    else:
-                        retry_dialog = WrongPasswordDialog()
-                        if not retry_dialog.show():
-                            return False
-                except Exception as e:
-                    print(f"Error reading store: {e}")
-                    retry_dialog = WrongPasswordDialog()
-                    if not retry_dialog.show():
-                        return False
+            return password is not None
 
     def _authenticate_relock(self) -> bool:
-        store_file = self.data_dir / "keybinds.enc"
-
-        while True:
-            dialog = MasterPasswordDialog(
-                is_new_setup=False,
-                parent=self._tk_root
-            )
-            password = dialog.show()
+        from .gui.master_password import MasterPasswordDialog
 
-            if password is None:
-                return False
-
-            try:
-                encrypted_data = store_file.read_bytes()
-                if self.encryption.verify_password(password, encrypted_data):
-                    self.encryption.initialize_existing(password, encrypted_data)
-                    return True
-                else:
-                    _messagebox.showerror(
-                        "Invalid Password",
-                        "The password you entered is incorrect.\nPlease try again.",
-                        parent=self._tk_root
-                    )
-            except Exception as e:
-                print(f"Error reading store: {e}")
-                _messagebox.showerror(
-                    "Error",
-                    f"Error reading encrypted store.\nPlease try again.",
-                    parent=self._tk_root
-                )
+        dialog = self.dialogs.get(
+            MasterPasswordDialog,
+            lambda: MasterPasswordDialog(is_new_setup=False, parent=self._tk_root, worker=self.worker)
+        )
+        return dialog.show(on_submit=self._unlock_store) is not None
 
     def _register_all_hotkeys(self):
         if not self.store:
             return
 
+        self.hotkeys.unregister_all()
+        self._registered_hotkeys.clear()
+        self.actions.invalidate()
         for keybind in self.store.get_all():
-            self._register_hotkey(keybind)
+            self._register_hotkey(keybind, restart=False)
+        self._register_palette_hotkey()
 
         self.hotkeys.start()
 
-    def _register_hotkey(self, keybind: Keybind):
-        def callback(kb=keybind):
-            thread = threading.Thread(
-                target=self._execute_keybind,
-                args=(kb,),
-                daemon=True
-            )
-            thread.start()
+    def _register_palette_hotkey(self):
+        hotkey = self.settings.palette_hotkey
+        if not self.palette or not hotkey:
+            return
 
-        self.hotkeys.register(keybind.hotkey, callback)
+        if self.store.hotkey_exists(hotkey):
+            print(f"Palette hotkey {hotkey} overrides the keybind using it")
+        self.hotkeys.register(hotkey, self._on_palette, restart=False)
 
-    def _unregister_hotkey(self, keybind: Keybind):
-        self.hotkeys.unregister(keybind.hotkey)
+    def _on_palette(self):
+        self.events.post('palette')
 
-    def _execute_keybind(self, keybind: Keybind):
-        action = keybind.action_type
+    def _handle_palette(self):
+        if self._is_unlocked and self.palette:
+            self.palette.toggle()
 
+    def _register_hotkey(self, keybind: Keybind, restart: bool = True):
         try:
-            if action == 'paste':
-                self._execute_paste(keybind)
-            elif action == 'launch':
-                self._execute_launch(keybind)
-            elif action == 'launch_paste':
-                self._execute_launch_paste(keybind)
-        except Exception as e:
-            print(f"Error executing keybind {keybind.name}: {e}")
+            self.actions.prepare(keybind)
+        except ValueError as e:
+            print(f"Invalid keybind {keybind.name}: {e}")
+            return
+        if not keybind.hotkey:
+            return
 
-    def _execute_paste(self, keybind: Keybind):
-        with ClipboardBackup():
-            if keybind.custom_text:
-                self.clipboard.paste_custom_text(keybind.custom_text)
-            else:
-                self.clipboard.paste_credentials(
-                    keybind.username,
-                    keybind.password
-                )
-
-    def _execute_launch(self, keybind: Keybind):
-        self.launcher.launch(
-            keybind.program_path,
-            keybind.program_args
-        )
+        def callback(keybind_id=keybind.id):
+            thread = threading.Thread(
+                target=self.actions.execute,
+                args=(keybind_id,),
+                daemon=True
+            )
+            thread.start()
 
-    def _execute_launch_paste(self, keybind: Keybind):
-        success = self.launcher.launch_and_wait(
-            keybind.program_path,
-            keybind.program_args,
-            keybind.wait_seconds
-        )
+        self.hotkeys.register(keybind.hotkey, callback, restart)
+        self._registered_hotkeys[keybind.id] = keybind.hotkey
+
+    def _unregister_hotkey(self, keybind_id: str, restart: bool = True):
+        hotkey = self._registered_hotkeys.pop(keybind_id, None)
+        if hotkey is not None:
+            self.hotkeys.unregister(hotkey, restart)
+        return self.actions.invalidate(keybind_id)
 
-        if success:
-            self._execute_paste(keybind)
+    def _prepare_dependents(self, keybind_ids: Iterable[str]):
+        for keybind_id in keybind_ids:
+            keybind = self.store.get(keybind_id)
+            if keybind is None:
+                continue
+            try:
+                self.actions.prepare(keybind)
+            except ValueError as e:
+                print(f"Invalid keybind {keybind.name}: {e}")
 
     def _start_tray(self):
+        from .tray import SystemTray
+
         self.tray = SystemTray(
             on_configure=self._on_configure,
             on_quit=self._on_quit,
@@ -207,9 +314,14 @@ class QuickKeysApp:
         self.tray.run_detached()
         self._tk_root.mainloop()
 
+    def _on_instance_message(self, message):
+        if message.get('command') != 'configure':
+            raise ValueError(f"Unknown command '{message.get('command')}'")
+        self._on_configure()
+        return True
+
     def _on_configure(self):
-        if self._tk_root:
-            self._tk_root.after(0, self._handle_configure)
+        self.events.post('configure')
 
     def _handle_configure(self):
         if not self.store:
@@ -221,22 +333,45 @@ class QuickKeysApp:
                 return
 
         if self.config_window is None:
+            from .gui.config_window import ConfigWindow
+
             self.config_window = ConfigWindow(
                 self._tk_root,
                 self.store,
                 self.hotkeys,
-                on_keybinds_changed=self._on_keybinds_changed
+                launch_stats=self.launch_stats,
+                search_index=self.search_index,
+                dialogs=self.dialogs,
+                worker=self.worker,
             )
 
         self.config_window.show()
 
-    def _on_keybinds_changed(self):
-        self.hotkeys.unregister_all()
-        self._register_all_hotkeys()
+    def _on_store_changed(self, changes: StoreChanges):
+        self.events.post('store-changed', changes)
+
+    def _handle_store_changed(self, changes: StoreChanges):
+        if not self._is_unlocked:
+            return
+
+        dependents = set()
+        for keybind_id in changes.removed + changes.updated:
+            dependents.update(self._unregister_hotkey(keybind_id, restart=False))
+
+        for keybind_id in changes.added + changes.updated:
+            keybind = self.store.get(keybind_id)
+            if keybind is not None:
+                self._register_hotkey(keybind, restart=False)
+        self._prepare_dependents(dependents - set(changes.added + changes.updated + changes.removed))
+        self._register_palette_hotkey()
+
+        self.hotkeys.start()
+
+        if self.config_window and self.config_window.root:
+            self.config_window.apply_changes(changes)
 
     def _on_lock(self):
-        if self._tk_root:
-            self._tk_root.after(0, self._handle_lock)
+        self.events.post('lock')
 
     def _handle_lock(self):
         if not self._is_unlocked:
@@ -247,23 +382,37 @@ class QuickKeysApp:
         self._is_unlocked = False
 
         self.hotkeys.unregister_all()
+        self._registered_hotkeys.clear()
+        self.actions.invalidate()
+
+        if self.palette:
+            self.palette.hide()
+        self.dialogs.close_all()
 
         if self.config_window and self.config_window.root:
             self.config_window.root.destroy()
             self.config_window = None
 
-        self._try_unlock()
+        if not self._arm_skeleton():
+            self._try_unlock()
 
     def _try_unlock(self):
-        if self._authenticate_relock():
-            self._is_unlocked = True
-            if self.store:
-                self.store.load()
-            self._register_all_hotkeys()
+        if self._unlocking:
+            return
+
+        self._unlocking = True
+        try:
+            self._disarm_skeleton()
+
+            if self._authenticate_relock():
+                self._on_unlocked()
+            else:
+                self._arm_skeleton()
+        finally:
+            self._unlocking = False
 
     def _on_quit(self):
-        if self._tk_root:
-            self._tk_root.after(0, self._handle_quit)
+        self.events.post('quit')
 
     def _handle_quit(self):
         self._cleanup()
@@ -272,13 +421,27 @@ class QuickKeysApp:
             self._tk_root.quit()
 
     def _cleanup(self):
+        self.events.detach()
+        if self.worker:
+            self.worker.shutdown()
+        self._disarm_skeleton()
         self.hotkeys.stop()
+        self.launcher.supervisor.stop()
+        if self.store_watcher:
+            self.store_watcher.stop()
+        if self.prewarmer:
+            self.prewarmer.stop()
+        self.launch_stats.flush()
 
         self.encryption.clear()
 
         if self.tray:
             self.tray.stop()
 
+        self.instance_server.stop()
+        if self.instance_lock:
+            self.instance_lock.release()
+
         self._is_unlocked = False
 
     def _perform_data_reset(self):
@@ -289,7 +452,9 @@ class QuickKeysApp:
             print("Data reset complete. Starting fresh setup.")
         except Exception as e:
             print(f"Error deleting data file: {e}")
-            _messagebox.showerror(
+            from tkinter import messagebox
+
+            messagebox.showerror(
                 "Reset Error",
                 f"Could not delete data file:\n{e}\n\n"
                 f"Please manually delete:\n{store_file}"
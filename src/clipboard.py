@@ -1,6 +1,10 @@
+import os
 import platform
+import shutil
+import subprocess
+import threading
 import time
-from typing import Optional
+from typing import List, Optional, Tuple
 
 import pyperclip
 from pynput.keyboard import Controller, Key
@@ -11,6 +15,10 @@ class ClipboardManager:
     def __init__(self):
         self.keyboard = Controller()
         self.system = platform.system()
+        self._local = threading.local()
+
+    def set_backup(self, backup: Optional["ClipboardBackup"]) -> None:
+        self._local.backup = backup
 
     def _get_paste_modifier(self) -> Key:
         if self.system == "Darwin":
@@ -18,8 +26,15 @@ class ClipboardManager:
         return Key.ctrl
 
     def copy_to_clipboard(self, text: str) -> None:
+        backup = getattr(self._local, 'backup', None)
+        if backup is not None:
+            backup.save()
+
         pyperclip.copy(text)
 
+        if backup is not None:
+            backup.mark_written()
+
     def get_from_clipboard(self) -> str:
         return pyperclip.paste()
 
@@ -40,6 +55,12 @@ class ClipboardManager:
         self.keyboard.tap(Key.enter)
         time.sleep(0.05)
 
+    def press_keys(self, keys: List) -> None:
+        for key in keys:
+            self.keyboard.press(key)
+        for key in reversed(keys):
+            self.keyboard.release(key)
+
     def type_text(self, text: str, delay: float = 0.01) -> None:
         for char in text:
             self.keyboard.type(char)
@@ -78,30 +99,159 @@ class ClipboardManager:
         self.paste_text(text, method)
 
 
+def _clipboard_sequence() -> Optional[int]:
+    system = platform.system()
+
+    try:
+        if system == "Windows":
+            import ctypes
+            return ctypes.windll.user32.GetClipboardSequenceNumber()
+
+        if system == "Darwin":
+            from AppKit import NSPasteboard
+            return int(NSPasteboard.generalPasteboard().changeCount())
+    except Exception:
+        pass
+
+    return None
+
+
+def _clipboard_size() -> Optional[int]:
+    system = platform.system()
+
+    try:
+        if system == "Windows":
+            import ctypes
+            user32 = ctypes.windll.user32
+            kernel32 = ctypes.windll.kernel32
+            user32.GetClipboardData.restype = ctypes.c_void_p
+            kernel32.GlobalSize.argtypes = [ctypes.c_void_p]
+            kernel32.GlobalSize.restype = ctypes.c_size_t
+            if not user32.OpenClipboard(None):
+                return None
+            try:
+                handle = user32.GetClipboardData(13)
+                return int(kernel32.GlobalSize(handle)) if handle else 0
+            finally:
+                user32.CloseClipboard()
+
+        if system == "Darwin":
+            from AppKit import NSPasteboard
+            data = NSPasteboard.generalPasteboard().dataForType_("public.utf8-plain-text")
+            return int(data.length()) if data is not None else 0
+    except Exception:
+        pass
+
+    return None
+
+
+def _paste_command() -> Optional[List[str]]:
+    if os.environ.get("WAYLAND_DISPLAY") and shutil.which("wl-paste"):
+        return ["wl-paste", "--no-newline"]
+    if shutil.which("xclip"):
+        return ["xclip", "-selection", "clipboard", "-o"]
+    if shutil.which("xsel"):
+        return ["xsel", "--clipboard", "--output"]
+    return None
+
+
+def _read_clipboard_bounded(max_bytes: int) -> Tuple[Optional[str], bool]:
+    size = _clipboard_size()
+    if size is not None:
+        if size > max_bytes:
+            return None, True
+        return pyperclip.paste(), False
+
+    command = _paste_command()
+    if command is None:
+        content = pyperclip.paste()
+        if len(content.encode('utf-8')) > max_bytes:
+            return None, True
+        return content, False
+
+    with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as proc:
+        data = proc.stdout.read(max_bytes + 1)
+        if len(data) > max_bytes:
+            proc.kill()
+            return None, True
+        try:
+            proc.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+    return data.decode('utf-8', errors='replace'), False
+
+
 class ClipboardBackup:
 
-    def __init__(self):
+    MAX_BACKUP_SIZE = 1024 * 1024
+
+    def __init__(
+        self,
+        manager: Optional[ClipboardManager] = None,
+        enabled: bool = True,
+        max_size: Optional[int] = None
+    ):
+        self.manager = manager
+        self.enabled = enabled
+        self.max_size = self.MAX_BACKUP_SIZE if max_size is None else max_size
         self.backup: Optional[str] = None
+        self._saved = False
+        self._written_sequence: Optional[int] = None
 
     def save(self) -> None:
+        if self._saved or not self.enabled:
+            return
+
+        self._saved = True
         try:
-            self.backup = pyperclip.paste()
+            if self.max_size > 0:
+                content, oversized = _read_clipboard_bounded(self.max_size)
+            else:
+                content, oversized = pyperclip.paste(), False
         except Exception:
-            self.backup = None
+            content, oversized = None, False
+
+        if oversized:
+            print("Clipboard is larger than the backup limit; it will not be restored")
+
+        self.backup = content
+
+    def mark_written(self) -> None:
+        self._written_sequence = _clipboard_sequence()
+
+    def needs_restore(self) -> bool:
+        if not self._saved or self.backup is None:
+            return False
+
+        if self._written_sequence is not None:
+            if _clipboard_sequence() != self._written_sequence:
+                return False
+
+        return True
 
     def restore(self) -> None:
-        if self.backup is not None:
+        if self.needs_restore():
             try:
                 pyperclip.copy(self.backup)
             except Exception:
                 pass
-            self.backup = None
+
+        self.backup = None
+        self._saved = False
+        self._written_sequence = None
 
     def __enter__(self):
-        self.save()
+        if self.manager is not None:
+            self.manager.set_backup(self)
+        else:
+            self.save()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        time.sleep(0.2)
+        if self.manager is not None:
+            self.manager.set_backup(None)
+
+        if self.needs_restore():
+            time.sleep(0.2)
         self.restore()
         return False
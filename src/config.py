@@ -21,6 +21,12 @@ def get_data_dir() -> Path:
     return data_dir
 
 
+def get_cache_dir() -> Path:
+    cache_dir = get_data_dir() / "cache"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
 def get_assets_dir() -> Path:
     import sys
     if getattr(sys, 'frozen', False):
@@ -0,0 +1,512 @@
+import os
+import signal
+import socket
+import socketserver
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import asdict, fields, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .actions import ActionRuntime
+from .clipboard import ClipboardManager
+from .config import get_data_dir
+from .encryption import EncryptionManager
+from .hotkeys import HotkeyManager
+from .instance import InstanceLock, InstanceServer
+from .ipc import IpcError, default_socket_path, recv_message, send_message
+from .launch_stats import LaunchStats
+from .launcher import Launcher
+from .prewarm import Prewarmer
+from .search import KeybindSearchIndex
+from .settings import AppSettings
+from .storage import Credential, Keybind, KeybindStore, StoreChanges
+from .store_watcher import StoreWatcher
+from .transfer import export_keybinds, import_keybinds
+
+
+SECRET_FIELDS = ('username', 'password', 'custom_text')
+KEYBIND_FIELDS = {f.name for f in fields(Keybind)}
+CREDENTIAL_FIELDS = {f.name for f in fields(Credential)}
+RECENT_PROCESSES = 10
+
+
+class DaemonError(Exception):
+    pass
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+
+    def handle(self):
+        daemon: QuickKeysDaemon = self.server.daemon
+        while True:
+            try:
+                message = recv_message(self.request)
+            except (IpcError, OSError):
+                return
+            if message is None:
+                return
+
+            try:
+                response = {'ok': True, 'result': daemon.dispatch(message)}
+            except (DaemonError, KeyError, TypeError, ValueError) as e:
+                response = {'ok': False, 'error': str(e)}
+            except Exception as e:
+                print(f"Daemon request failed: {e}")
+                response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+
+            try:
+                send_message(self.request, response)
+            except (IpcError, OSError):
+                return
+
+
+class _DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, daemon: "QuickKeysDaemon"):
+        self.daemon = daemon
+        super().__init__(str(socket_path), _RequestHandler)
+
+    def server_bind(self):
+        old_umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(old_umask)
+        os.chmod(self.server_address, 0o600)
+
+
+class QuickKeysDaemon:
+
+    def __init__(
+        self,
+        socket_path: Optional[Path] = None,
+        instance_lock: Optional[InstanceLock] = None
+    ):
+        self.data_dir = get_data_dir()
+        self.socket_path = socket_path or default_socket_path(self.data_dir)
+        self.instance_lock = instance_lock
+        self.instance_server = InstanceServer(self.data_dir, self._on_instance_message)
+        self.settings = AppSettings.load(self.data_dir)
+        self.encryption = EncryptionManager()
+        self.store = KeybindStore(self.encryption, self.data_dir)
+        self.store.skeleton_enabled = self.settings.hotkey_skeleton_enabled
+        self.hotkeys = HotkeyManager()
+        self.clipboard = ClipboardManager()
+        self.launcher = Launcher()
+        self.launch_stats = LaunchStats(self.data_dir)
+        self.prewarmer: Optional[Prewarmer] = None
+        if self.settings.prewarm_enabled:
+            self.prewarmer = Prewarmer(self.data_dir, self.settings, self.launch_stats)
+        self.actions = ActionRuntime(
+            self.clipboard, self.launcher, self.settings, self.launch_stats, self.prewarmer
+        )
+        self.actions.store = self.store
+        self.store.add_listener(self._on_store_changed)
+        self.store_watcher = StoreWatcher(self.store)
+        self.search_index = KeybindSearchIndex(self.store)
+
+        self.server: Optional[_DaemonServer] = None
+        self._is_unlocked = False
+        self._registered: Dict[str, str] = {}
+        self._lock = threading.RLock()
+
+        self._commands: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            'list': self._cmd_list,
+            'search': self._cmd_search,
+            'add': self._cmd_add,
+            'update': self._cmd_update,
+            'remove': self._cmd_remove,
+            'import': self._cmd_import,
+            'export': self._cmd_export,
+            'credentials': self._cmd_credentials,
+            'add_credential': self._cmd_add_credential,
+            'update_credential': self._cmd_update_credential,
+            'remove_credential': self._cmd_remove_credential,
+            'lock': self._cmd_lock,
+            'unlock': self._cmd_unlock,
+            'stats': self._cmd_stats,
+        }
+
+    def _remove_stale_socket(self) -> None:
+        if not self.socket_path.exists():
+            return
+
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(self.socket_path))
+        except OSError:
+            self.socket_path.unlink()
+        else:
+            raise DaemonError(f"A daemon is already listening on {self.socket_path}")
+        finally:
+            probe.close()
+
+    def run(self) -> None:
+        if not hasattr(socket, 'AF_UNIX'):
+            print("Daemon mode requires Unix domain socket support")
+            return
+
+        try:
+            self._remove_stale_socket()
+            self.server = _DaemonServer(self.socket_path, self)
+        except (DaemonError, OSError) as e:
+            print(f"Failed to start daemon: {e}")
+            return
+
+        def request_shutdown(signum, frame):
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, request_shutdown)
+            if hasattr(signal, 'SIGHUP'):
+                signal.signal(signal.SIGHUP, request_shutdown)
+
+        self.instance_server.start()
+        print(f"QuickKeys daemon listening on {self.socket_path}")
+        try:
+            self.server.serve_forever()
+        finally:
+            self._cleanup()
+
+    def _cleanup(self) -> None:
+        with self._lock:
+            self._lock_store()
+
+        self.launcher.supervisor.stop()
+        if self.prewarmer:
+            self.prewarmer.stop()
+        self.launch_stats.flush()
+
+        if self.server is not None:
+            self.server.server_close()
+            try:
+                self.socket_path.unlink()
+            except OSError:
+                pass
+
+        self.instance_server.stop()
+        if self.instance_lock:
+            self.instance_lock.release()
+
+    def _on_instance_message(self, message: Dict[str, Any]) -> Any:
+        raise DaemonError(
+            f"QuickKeys is running headless; use the control socket at {self.socket_path}"
+        )
+
+    def dispatch(self, message: Dict[str, Any]) -> Any:
+        name = message.get('command')
+        if name == 'trigger':
+            return self._trigger(message)
+
+        command = self._commands.get(name)
+        if command is None:
+            raise DaemonError(f"Unknown command '{name}'")
+
+        with self._lock:
+            if name not in ('unlock', 'stats'):
+                self._require_unlocked()
+            return command(message)
+
+    def _require_unlocked(self) -> None:
+        if not self._is_unlocked:
+            raise DaemonError("Daemon is locked")
+
+    def _trigger(self, message: Dict[str, Any]) -> bool:
+        with self._lock:
+            self._require_unlocked()
+            keybind_id = self._require_keybind(message.get('id')).id
+
+        self.actions.execute(keybind_id)
+        return True
+
+    def _require_keybind(self, keybind_id: Optional[str]) -> Keybind:
+        keybind = self.store.get(keybind_id) if keybind_id else None
+        if keybind is None:
+            raise DaemonError(f"No keybind with id '{keybind_id}'")
+        return keybind
+
+    def _register_hotkey(self, keybind: Keybind, restart: bool = True) -> None:
+        self.actions.prepare(keybind)
+        if not keybind.hotkey:
+            return
+
+        def callback(keybind_id=keybind.id):
+            thread = threading.Thread(
+                target=self.actions.execute,
+                args=(keybind_id,),
+                daemon=True
+            )
+            thread.start()
+
+        self.hotkeys.register(keybind.hotkey, callback, restart)
+        self._registered[keybind.id] = keybind.hotkey
+
+    def _unregister_hotkey(self, keybind_id: str, restart: bool = True) -> List[str]:
+        hotkey = self._registered.pop(keybind_id, None)
+        if hotkey is not None:
+            self.hotkeys.unregister(hotkey, restart)
+        return self.actions.invalidate(keybind_id)
+
+    def _register_all_hotkeys(self) -> None:
+        self.hotkeys.unregister_all()
+        self._registered.clear()
+        self.actions.invalidate()
+        for keybind in self.store.get_all():
+            try:
+                self._register_hotkey(keybind, restart=False)
+            except ValueError as e:
+                print(f"Invalid keybind {keybind.name}: {e}")
+        self.hotkeys.start()
+
+    def _on_store_changed(self, changes: StoreChanges) -> None:
+        with self._lock:
+            if not self._is_unlocked:
+                return
+
+            dependents = set()
+            for keybind_id in changes.removed + changes.updated:
+                dependents.update(self._unregister_hotkey(keybind_id, restart=False))
+
+            for keybind_id in changes.added + changes.updated:
+                keybind = self.store.get(keybind_id)
+                if keybind is None:
+                    continue
+                try:
+                    self._register_hotkey(keybind, restart=False)
+                except ValueError as e:
+                    print(f"Invalid keybind {keybind.name}: {e}")
+
+            for keybind_id in dependents - set(changes.added + changes.updated + changes.removed):
+                keybind = self.store.get(keybind_id)
+                if keybind is None:
+                    continue
+                try:
+                    self.actions.prepare(keybind)
+                except ValueError as e:
+                    print(f"Invalid keybind {keybind.name}: {e}")
+            self.hotkeys.start()
+
+    def _lock_store(self) -> None:
+        self.store_watcher.stop()
+        self.hotkeys.unregister_all()
+        self._registered.clear()
+        self.actions.invalidate()
+        self.store.clear()
+        self.encryption.clear()
+        self._is_unlocked = False
+
+    def _keybind_from_fields(self, data: Dict[str, Any]) -> Keybind:
+        if not isinstance(data, dict):
+            raise DaemonError("Keybind must be an object")
+
+        unknown = set(data) - KEYBIND_FIELDS
+        if unknown:
+            raise DaemonError(f"Unknown keybind fields: {', '.join(sorted(unknown))}")
+
+        values = dict(data)
+        values.setdefault('id', str(uuid.uuid4()))
+        values.setdefault('created_at', time.time())
+        values.setdefault('hotkey', "")
+        for required in ('name', 'action_type'):
+            if not values.get(required):
+                raise DaemonError(f"Keybind is missing '{required}'")
+        return Keybind(**values)
+
+    def _check_hotkeys(self, keybinds: List[Keybind]) -> None:
+        seen = set()
+        for keybind in keybinds:
+            if keybind.credential_id and keybind.credential_id not in self.store.credentials:
+                raise DaemonError(f"Credential '{keybind.credential_id}' not found")
+            if not keybind.hotkey:
+                continue
+            hotkey = keybind.hotkey.lower()
+            if hotkey in seen or self.store.hotkey_exists(keybind.hotkey, keybind.id):
+                raise DaemonError(f"The hotkey '{keybind.hotkey}' is already in use")
+            seen.add(hotkey)
+
+    @staticmethod
+    def _public_fields(keybind: Keybind, include_secrets: bool) -> Dict[str, Any]:
+        data = asdict(keybind)
+        if not include_secrets:
+            for name in SECRET_FIELDS:
+                data.pop(name, None)
+        return data
+
+    def _cmd_list(self, message: Dict[str, Any]) -> List[Dict[str, Any]]:
+        include_secrets = bool(message.get('secrets'))
+        return [self._public_fields(kb, include_secrets) for kb in self.store.get_all()]
+
+    def _cmd_search(self, message: Dict[str, Any]) -> List[Dict[str, Any]]:
+        limit = message.get('limit')
+        ids = self.search_index.search(str(message.get('query', '')), limit=limit)
+        keybinds = [self.store.get(keybind_id) for keybind_id in ids]
+        return [self._public_fields(kb, False) for kb in keybinds if kb is not None]
+
+    def _cmd_add(self, message: Dict[str, Any]) -> List[str]:
+        items = message.get('keybinds')
+        if items is None:
+            items = [message.get('keybind')]
+
+        keybinds = [self._keybind_from_fields(item) for item in items]
+        self._check_hotkeys(keybinds)
+        for keybind in keybinds:
+            if keybind.id in self.store.keybinds:
+                raise DaemonError(f"Keybind '{keybind.id}' already exists")
+            self.actions.prepare(keybind)
+
+        self.store.add_many(keybinds)
+        return [keybind.id for keybind in keybinds]
+
+    def _cmd_update(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        changes = dict(message.get('keybind') or {})
+        existing = self._require_keybind(changes.pop('id', None))
+
+        unknown = set(changes) - KEYBIND_FIELDS
+        if unknown:
+            raise DaemonError(f"Unknown keybind fields: {', '.join(sorted(unknown))}")
+
+        updated = replace(existing, **changes)
+        self._check_hotkeys([updated])
+        self.actions.prepare(updated)
+
+        self.store.update(updated)
+        return self._public_fields(updated, False)
+
+    def _cmd_remove(self, message: Dict[str, Any]) -> int:
+        ids = message.get('ids')
+        if ids is None:
+            ids = [message.get('id')]
+
+        keybinds = [self._require_keybind(keybind_id) for keybind_id in ids]
+        self.store.remove_many([keybind.id for keybind in keybinds])
+        return len(keybinds)
+
+    def _cmd_import(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        path = message.get('path')
+        if not path:
+            raise DaemonError("An import path is required")
+
+        result = import_keybinds(
+            self.store, Path(path),
+            fmt=message.get('format', 'auto'),
+            passphrase=message.get('passphrase'),
+        )
+        return {'imported': result.imported, 'skipped': result.skipped}
+
+    def _cmd_export(self, message: Dict[str, Any]) -> int:
+        path = message.get('path')
+        if not path:
+            raise DaemonError("An export path is required")
+
+        return export_keybinds(
+            [self.store.resolve(kb) for kb in self.store.get_all()], Path(path),
+            fmt=message.get('format', 'jsonl'),
+            passphrase=message.get('passphrase'),
+        )
+
+    def _cmd_credentials(self, message: Dict[str, Any]) -> List[Dict[str, Any]]:
+        include_secrets = bool(message.get('secrets'))
+        return [
+            {**self._public_fields(cred, include_secrets), 'keybinds': self.store.credential_users(cred.id)}
+            for cred in self.store.get_credentials()
+        ]
+
+    def _credential_fields(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        if not isinstance(data, dict):
+            raise DaemonError("Credential must be an object")
+
+        unknown = set(data) - CREDENTIAL_FIELDS
+        if unknown:
+            raise DaemonError(f"Unknown credential fields: {', '.join(sorted(unknown))}")
+        return dict(data)
+
+    def _cmd_add_credential(self, message: Dict[str, Any]) -> str:
+        values = self._credential_fields(message.get('credential'))
+        if not values.get('name'):
+            raise DaemonError("Credential is missing 'name'")
+
+        credential = Credential.create_new(values['name'], values.get('username', ""), values.get('password', ""))
+        keybind_ids = [self._require_keybind(kid).id for kid in message.get('keybind_ids', [])]
+        self.store.add_credential(credential, keybind_ids)
+        return credential.id
+
+    def _cmd_update_credential(self, message: Dict[str, Any]) -> List[str]:
+        values = self._credential_fields(message.get('credential') or {})
+        existing = self.store.get_credential(values.pop('id', None))
+        if existing is None:
+            raise DaemonError("Credential not found")
+
+        self.store.update_credential(replace(existing, **values))
+        return self.store.credential_users(existing.id)
+
+    def _cmd_remove_credential(self, message: Dict[str, Any]) -> List[str]:
+        credential_id = message.get('id')
+        if self.store.get_credential(credential_id) is None:
+            raise DaemonError("Credential not found")
+
+        detached = self.store.credential_users(credential_id)
+        self.store.remove_credential(credential_id)
+        return detached
+
+    def _cmd_lock(self, message: Dict[str, Any]) -> bool:
+        self._lock_store()
+        return True
+
+    def _cmd_unlock(self, message: Dict[str, Any]) -> bool:
+        if self._is_unlocked:
+            return True
+
+        password = message.get('password')
+        if not password:
+            raise DaemonError("A master password is required")
+
+        if not self.store.data_path.exists():
+            self.encryption.initialize_new(password)
+            self.store.clear()
+            self.store.save()
+        else:
+            encrypted_data = KeybindStore.read_encrypted(self.store.data_path)
+            if not self.encryption.verify_password(password, encrypted_data):
+                raise DaemonError("Invalid master password")
+            self.encryption.initialize_existing(password, encrypted_data)
+            self.store.load()
+
+        self._is_unlocked = True
+        self._register_all_hotkeys()
+        self.store_watcher.start()
+
+        if self.prewarmer:
+            self.prewarmer.start(self.actions.prepared_launches)
+        return True
+
+    def _cmd_stats(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        supervisor = self.launcher.supervisor.stats()
+        results = list(self.launcher.results)
+
+        return {
+            'locked': not self._is_unlocked,
+            'keybinds': len(self.store.keybinds),
+            'hotkeys': len(self.hotkeys.get_registered_hotkeys()),
+            'processes': {
+                'live': supervisor.live,
+                'started': supervisor.started,
+                'exited': supervisor.exited,
+                'failed': supervisor.failed,
+                'recent': [asdict(record) for record in supervisor.recent[-RECENT_PROCESSES:]],
+            },
+            'launches': {
+                'recent': len(results),
+                'failed': sum(1 for result in results if not result.ok),
+                'backends': dict(Counter(result.backend for result in results if result.ok)),
+                'mean_spawn_seconds': (
+                    sum(result.spawn_seconds for result in results) / len(results)
+                    if results else None
+                ),
+            },
+            'prewarm': asdict(self.prewarmer.stats()) if self.prewarmer else None,
+        }
@@ -0,0 +1,89 @@
+import queue
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+Merge = Callable[[Any, Any], Any]
+
+
+def _keep_latest(previous: Any, payload: Any) -> Any:
+    return payload
+
+
+def append_items(previous: List[Any], payload: List[Any]) -> List[Any]:
+    previous.extend(payload)
+    return previous
+
+
+class EventBus:
+
+    DRAIN_MS = 20
+
+    def __init__(self, root=None):
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._handlers: Dict[str, Tuple[Callable[[Any], None], Merge]] = {}
+        self._root = None
+        self._running = False
+        if root is not None:
+            self.attach(root)
+
+    def subscribe(self, topic: str, handler: Callable[[Any], None], merge: Optional[Merge] = None) -> None:
+        self._handlers[topic] = (handler, merge or _keep_latest)
+
+    def unsubscribe(self, topic: str) -> None:
+        self._handlers.pop(topic, None)
+
+    def post(self, topic: str, payload: Any = None) -> None:
+        self._queue.put((topic, payload))
+
+    def attach(self, root) -> None:
+        self._root = root
+        if not self._running:
+            self._running = True
+            root.after(self.DRAIN_MS, self._tick)
+
+    def detach(self) -> None:
+        self._running = False
+
+    def _tick(self) -> None:
+        if not self._running:
+            return
+
+        from tkinter import TclError
+
+        try:
+            self._root.after(self.DRAIN_MS, self._tick)
+        except TclError:
+            self._running = False
+            return
+
+        self.drain()
+
+    def drain(self) -> int:
+        batch: Dict[str, Any] = {}
+        count = 0
+
+        while True:
+            try:
+                topic, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+            count += 1
+            entry = self._handlers.get(topic)
+            if entry is None:
+                continue
+            if topic in batch:
+                batch[topic] = entry[1](batch[topic], payload)
+            else:
+                batch[topic] = payload
+
+        for topic, payload in batch.items():
+            entry = self._handlers.get(topic)
+            if entry is None:
+                continue
+            try:
+                entry[0](payload)
+            except Exception as e:
+                print(f"Event handler for '{topic}' failed: {e}")
+
+        return count
@@ -1,26 +1,35 @@
 import tkinter as tk
-from tkinter import messagebox
-from typing import Callable, Optional, List
+from bisect import bisect_left
+from pathlib import Path
+from tkinter import filedialog, messagebox, simpledialog
+from typing import Any, Callable, Dict, Optional, List, Tuple
 
 import customtkinter as ctk
 
-from ..storage import Keybind, KeybindStore
+from ..storage import Keybind, KeybindStore, StoreChanges
 from ..hotkeys import HotkeyManager
+from ..launch_stats import LaunchStats
+from ..search import KeybindSearchIndex
 from . import theme
+from .dialog_pool import DialogPool
+from ..events import EventBus
+from .worker import TkWorker
 
 
 class _KeybindCard(ctk.CTkFrame):
 
-    def __init__(self, master, keybind: Keybind, action_label: str,
-                 on_select: Callable, on_double_click: Callable, **kwargs):
+    HEIGHT = 56
+
+    def __init__(self, master, on_select: Callable, on_double_click: Callable,
+                 on_scroll: Callable, **kwargs):
         super().__init__(
             master,
             fg_color=theme.SURFACE,
             corner_radius=theme.CORNER_RADIUS,
-            height=56,
+            height=self.HEIGHT,
             **kwargs,
         )
-        self.keybind = keybind
+        self.keybind: Optional[Keybind] = None
         self._on_select = on_select
         self._on_double_click = on_double_click
         self._selected = False
@@ -29,7 +38,7 @@ class _KeybindCard(ctk.CTkFrame):
 
         self.badge = ctk.CTkLabel(
             self,
-            text=keybind.hotkey,
+            text="",
             font=theme.FONT_BADGE,
             text_color=theme.TEXT_PRIMARY,
             fg_color=theme.ACCENT,
@@ -45,7 +54,7 @@ class _KeybindCard(ctk.CTkFrame):
 
         self.name_label = ctk.CTkLabel(
             text_frame,
-            text=keybind.name,
+            text="",
             font=theme.FONT_BODY,
             text_color=theme.TEXT_PRIMARY,
             anchor="w",
@@ -54,18 +63,39 @@ class _KeybindCard(ctk.CTkFrame):
 
         self.type_label = ctk.CTkLabel(
             text_frame,
-            text=action_label,
+            text="",
             font=theme.FONT_TINY,
             text_color=theme.TEXT_MUTED,
             anchor="w",
         )
         self.type_label.pack(anchor="w")
 
+        self._texts = ("", "", "")
+
         for widget in (self, self.badge, text_frame, self.name_label, self.type_label):
             widget.bind("<Button-1>", self._handle_click)
             widget.bind("<Double-Button-1>", self._handle_dblclick)
             widget.bind("<Enter>", self._on_enter)
             widget.bind("<Leave>", self._on_leave)
+            widget.bind("<MouseWheel>", on_scroll)
+            widget.bind("<Button-4>", on_scroll)
+            widget.bind("<Button-5>", on_scroll)
+
+    def show_keybind(self, keybind: Keybind, action_label: str, selected: bool):
+        self.keybind = keybind
+
+        texts = (keybind.hotkey, keybind.name, action_label)
+        if texts != self._texts:
+            if texts[0] != self._texts[0]:
+                self.badge.configure(text=texts[0])
+            if texts[1] != self._texts[1]:
+                self.name_label.configure(text=texts[1])
+            if texts[2] != self._texts[2]:
+                self.type_label.configure(text=texts[2])
+            self._texts = texts
+
+        if selected != self._selected:
+            self.set_selected(selected)
 
     def set_selected(self, selected: bool):
         self._selected = selected
@@ -88,12 +118,176 @@ class _KeybindCard(ctk.CTkFrame):
         self._on_double_click(self)
 
 
+class _VirtualKeybindList(ctk.CTkFrame):
+
+    ROW_HEIGHT = _KeybindCard.HEIGHT + theme.PAD_SM
+    WHEEL_ROWS = 3
+
+    def __init__(self, master, label_for: Callable[[Keybind], str],
+                 on_select: Callable, on_double_click: Callable, **kwargs):
+        super().__init__(master, **kwargs)
+        self._label_for = label_for
+        self._on_select = on_select
+        self._on_double_click = on_double_click
+
+        self.items: List[Keybind] = []
+        self.reverse = False
+        self.selected_id: Optional[str] = None
+        self._keys: List[Tuple[Any, ...]] = []
+        self._key_by_id: Dict[str, Tuple[Any, ...]] = {}
+        self._offset = 0
+        self._pool: List[_KeybindCard] = []
+
+        self.scrollbar = ctk.CTkScrollbar(
+            self,
+            command=self.yview,
+            button_color=theme.SURFACE,
+            button_hover_color=theme.SURFACE_HOVER,
+        )
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.viewport = ctk.CTkFrame(self, fg_color="transparent")
+        self.viewport.pack(side="left", fill="both", expand=True)
+
+        self.viewport.bind("<Configure>", lambda event: self._render())
+        self.viewport.bind("<MouseWheel>", self._on_wheel)
+        self.viewport.bind("<Button-4>", self._on_wheel)
+        self.viewport.bind("<Button-5>", self._on_wheel)
+
+    def set_items(self, keys: List[Tuple[Any, ...]], items: List[Keybind], reverse: bool = False):
+        self._keys = keys
+        self.items = items
+        self.reverse = reverse
+        self._key_by_id = {keybind.id: key for key, keybind in zip(keys, items)}
+        self._render()
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _display_index(self, index: int, size: int) -> int:
+        return size - 1 - index if self.reverse else index
+
+    def _item_at(self, display_index: int) -> Keybind:
+        return self.items[self._display_index(display_index, len(self.items))]
+
+    def _adjust_offset(self, display_index: int, delta: int):
+        first = self._offset // self.ROW_HEIGHT
+        if display_index < first:
+            self._offset = max(0, self._offset + delta * self.ROW_HEIGHT)
+
+    def insert(self, key: Tuple[Any, ...], keybind: Keybind, render: bool = True):
+        index = bisect_left(self._keys, key)
+        self._keys.insert(index, key)
+        self.items.insert(index, keybind)
+        self._key_by_id[keybind.id] = key
+        self._adjust_offset(self._display_index(index, len(self.items)), 1)
+        if render:
+            self._render()
+
+    def remove(self, keybind_id: str, render: bool = True) -> bool:
+        key = self._key_by_id.pop(keybind_id, None)
+        if key is None:
+            return False
+        index = bisect_left(self._keys, key)
+        display_index = self._display_index(index, len(self.items))
+        del self._keys[index]
+        del self.items[index]
+        if keybind_id == self.selected_id:
+            self.selected_id = None
+        self._adjust_offset(display_index, -1)
+        if render:
+            self._render()
+        return True
+
+    def _max_offset(self) -> int:
+        height = self.viewport.winfo_height()
+        return max(0, len(self.items) * self.ROW_HEIGHT - height)
+
+    def _scroll_to(self, offset: float):
+        offset = int(min(max(offset, 0), self._max_offset()))
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+
+    def yview(self, *args):
+        if not args:
+            return
+        total = max(1, len(self.items) * self.ROW_HEIGHT)
+        if args[0] == 'moveto':
+            self._scroll_to(float(args[1]) * total)
+        elif args[0] == 'scroll':
+            step = self.ROW_HEIGHT if args[2] == 'units' else self.viewport.winfo_height()
+            self._scroll_to(self._offset + int(args[1]) * step)
+
+    def _on_wheel(self, event):
+        if getattr(event, 'num', None) == 4:
+            direction = -1
+        elif getattr(event, 'num', None) == 5:
+            direction = 1
+        else:
+            direction = -1 if event.delta > 0 else 1
+        self._scroll_to(self._offset + direction * self.WHEEL_ROWS * self.ROW_HEIGHT)
+
+    def _ensure_pool(self, size: int):
+        while len(self._pool) < size:
+            card = _KeybindCard(
+                self.viewport,
+                on_select=self._handle_select,
+                on_double_click=self._handle_double_click,
+                on_scroll=self._on_wheel,
+            )
+            self._pool.append(card)
+
+    def _render(self):
+        height = self.viewport.winfo_height()
+        if height <= 1:
+            return
+
+        self._offset = min(self._offset, self._max_offset())
+        first = self._offset // self.ROW_HEIGHT
+        shift = self._offset % self.ROW_HEIGHT
+        visible = height // self.ROW_HEIGHT + 2
+
+        self._ensure_pool(min(visible, len(self.items)))
+
+        for slot, card in enumerate(self._pool):
+            index = first + slot
+            if slot < visible and index < len(self.items):
+                keybind = self._item_at(index)
+                card.show_keybind(keybind, self._label_for(keybind), keybind.id == self.selected_id)
+                card.place(x=0, y=slot * self.ROW_HEIGHT - shift, relwidth=1.0)
+            else:
+                card.place_forget()
+                card.keybind = None
+
+        total = len(self.items) * self.ROW_HEIGHT
+        if total <= height:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self._offset / total, (self._offset + height) / total)
+
+    def _handle_select(self, card: _KeybindCard):
+        if card.keybind is None:
+            return
+        self.selected_id = card.keybind.id
+        for other in self._pool:
+            if other.keybind is not None:
+                other.set_selected(other.keybind.id == self.selected_id)
+        self._on_select(card.keybind)
+
+    def _handle_double_click(self, card: _KeybindCard):
+        if card.keybind is not None:
+            self._on_double_click(card.keybind)
+
+
 class ConfigWindow:
 
     ACTION_TYPE_DISPLAY = {
         'paste': 'Paste',
         'launch': 'Launch',
         'launch_paste': 'Launch + Paste',
+        'macro': 'Macro',
+        'workspace': 'Workspace',
     }
 
     def __init__(
@@ -101,19 +295,27 @@ class ConfigWindow:
         parent,
         store: KeybindStore,
         hotkey_manager: HotkeyManager,
-        on_keybinds_changed: Optional[Callable] = None,
+        launch_stats: Optional[LaunchStats] = None,
+        search_index: Optional[KeybindSearchIndex] = None,
+        dialogs: Optional[DialogPool] = None,
+        worker: Optional[TkWorker] = None,
     ):
         self.parent = parent
         self.store = store
         self.hotkey_manager = hotkey_manager
-        self.on_keybinds_changed = on_keybinds_changed
+        self.launch_stats = launch_stats
+        self.search_index = search_index or KeybindSearchIndex(store)
+        self.dialogs = dialogs or DialogPool(parent)
+        self.worker = worker or TkWorker(EventBus(parent))
         self.root: Optional[ctk.CTkToplevel] = None
+        self.search_entry: Optional[ctk.CTkEntry] = None
+        self._last_query = ""
 
         self._sort_column: Optional[str] = None
         self._sort_cycle: int = 0
 
-        self._cards: List[_KeybindCard] = []
-        self._selected_card: Optional[_KeybindCard] = None
+        self.keybind_list: Optional[_VirtualKeybindList] = None
+        self.worker.events.subscribe('transfer-progress', self._on_transfer_progress)
 
     def show(self):
         if self.root is not None:
@@ -140,6 +342,9 @@ class ConfigWindow:
         self._create_widgets()
         self._refresh_list()
 
+        from .keybind_editor import KeybindEditorDialog
+        self.dialogs.prebuild(KeybindEditorDialog, self._editor_factory)
+
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
 
     def _create_widgets(self):
@@ -185,17 +390,40 @@ class ConfigWindow:
         self.sort_menu.set("Created")
         self.sort_menu.pack(side="left")
 
-        self.list_frame = ctk.CTkScrollableFrame(
+        transfer_frame = ctk.CTkFrame(header_row, fg_color="transparent")
+        transfer_frame.pack(side="right", padx=(0, theme.PAD_SM))
+
+        for text, command in (("Import", self._on_import), ("Export", self._on_export)):
+            ctk.CTkButton(
+                transfer_frame, text=text,
+                command=command,
+                **theme.secondary_button_kwargs(),
+                width=70,
+                height=28,
+            ).pack(side="left", padx=(0, 4))
+
+        self.search_entry = ctk.CTkEntry(
+            main_frame,
+            placeholder_text="Search name, hotkey or program...",
+            **theme.entry_kwargs(),
+        )
+        self.search_entry.pack(fill="x", pady=(0, theme.PAD_SM))
+        self._last_query = ""
+        self.search_entry.bind("<KeyRelease>", self._on_search_key)
+        self.search_entry.bind("<Escape>", self._on_search_clear)
+
+        self.keybind_list = _VirtualKeybindList(
             main_frame,
+            label_for=lambda kb: self.ACTION_TYPE_DISPLAY.get(kb.action_type, kb.action_type),
+            on_select=lambda kb: None,
+            on_double_click=self._on_card_dblclick,
             fg_color=theme.BG_DARK,
             corner_radius=theme.CORNER_RADIUS,
-            scrollbar_button_color=theme.SURFACE,
-            scrollbar_button_hover_color=theme.SURFACE_HOVER,
         )
-        self.list_frame.pack(fill="both", expand=True)
+        self.keybind_list.pack(fill="both", expand=True)
 
         self.empty_label = ctk.CTkLabel(
-            self.list_frame,
+            self.keybind_list.viewport,
             text="No keybinds configured.\nClick Add to create one.",
             font=theme.FONT_BODY,
             text_color=theme.TEXT_MUTED,
@@ -228,6 +456,14 @@ class ConfigWindow:
         )
         remove_btn.pack(side="left", padx=(theme.PAD_SM, 0))
 
+        rotate_btn = ctk.CTkButton(
+            btn_frame, text="Rotate",
+            command=self._on_rotate_passwords,
+            **theme.secondary_button_kwargs(),
+            width=80,
+        )
+        rotate_btn.pack(side="left", padx=(theme.PAD_SM, 0))
+
         close_btn = ctk.CTkButton(
             btn_frame, text="Close",
             command=self._on_close,
@@ -236,37 +472,82 @@ class ConfigWindow:
         )
         close_btn.pack(side="right")
 
-    def _refresh_list(self):
-        for card in self._cards:
-            card.destroy()
-        self._cards.clear()
-        self._selected_card = None
+        self.busy_bar = ctk.CTkProgressBar(
+            btn_frame,
+            mode="indeterminate",
+            width=80,
+            height=6,
+            fg_color=theme.SURFACE,
+            progress_color=theme.ACCENT,
+        )
 
-        keybinds = self._get_sorted_keybinds()
+    def _update_empty_label(self):
+        if self._search_query():
+            self.empty_label.configure(text="No keybinds match your search.")
+        else:
+            self.empty_label.configure(text="No keybinds configured.\nClick Add to create one.")
 
-        if not keybinds:
-            self.empty_label.pack(pady=40)
+        if not len(self.keybind_list):
+            self.empty_label.place(relx=0.5, y=40, anchor="n")
         else:
-            self.empty_label.pack_forget()
-            for kb in keybinds:
-                action_display = self.ACTION_TYPE_DISPLAY.get(kb.action_type, kb.action_type)
-                card = _KeybindCard(
-                    self.list_frame,
-                    keybind=kb,
-                    action_label=action_display,
-                    on_select=self._on_card_select,
-                    on_double_click=self._on_card_dblclick,
-                )
-                card.pack(fill="x", pady=(0, theme.PAD_SM))
-                self._cards.append(card)
-
-    def _on_card_select(self, card: _KeybindCard):
-        if self._selected_card and self._selected_card is not card:
-            self._selected_card.set_selected(False)
-        card.set_selected(True)
-        self._selected_card = card
-
-    def _on_card_dblclick(self, card: _KeybindCard):
+            self.empty_label.place_forget()
+
+    def _search_query(self) -> str:
+        return self.search_entry.get().strip() if self.search_entry is not None else ""
+
+    def _on_search_key(self, event):
+        query = self._search_query()
+        if query != self._last_query:
+            self._last_query = query
+            self._refresh_list()
+
+    def _on_search_clear(self, event):
+        self.search_entry.delete(0, "end")
+        self._on_search_key(event)
+
+    def _refresh_list(self):
+        query = self._search_query()
+        if query:
+            matches = [self.store.get(kid) for kid in self.search_index.search(query)]
+            entries = [((rank,), kb) for rank, kb in enumerate(kb for kb in matches if kb)]
+            self.keybind_list.set_items([key for key, _ in entries], [kb for _, kb in entries])
+            self._update_empty_label()
+            return
+
+        entries = sorted((self._sort_key(kb), kb) for kb in self.store.get_all())
+
+        if self.keybind_list.selected_id not in self.store.keybinds:
+            self.keybind_list.selected_id = None
+        self.keybind_list.set_items(
+            [key for key, _ in entries],
+            [kb for _, kb in entries],
+            reverse=self._sort_column is not None and self._sort_cycle == 1,
+        )
+        self._update_empty_label()
+
+    def apply_changes(self, changes: StoreChanges):
+        if self.keybind_list is None:
+            return
+
+        if self._search_query():
+            self._refresh_list()
+            return
+
+        selected_id = self.keybind_list.selected_id
+        for keybind_id in changes.removed + changes.updated:
+            self.keybind_list.remove(keybind_id, render=False)
+
+        for keybind_id in changes.added + changes.updated:
+            keybind = self.store.get(keybind_id)
+            if keybind is not None:
+                self.keybind_list.insert(self._sort_key(keybind), keybind, render=False)
+
+        if selected_id in self.keybind_list._key_by_id:
+            self.keybind_list.selected_id = selected_id
+        self.keybind_list._render()
+        self._update_empty_label()
+
+    def _on_card_dblclick(self, keybind: Keybind):
         self._on_edit()
 
     _SORT_MAP = {
@@ -285,46 +566,42 @@ class ConfigWindow:
             self._sort_cycle = 0
         self._refresh_list()
 
-    def _get_sorted_keybinds(self):
-        keybinds = self.store.get_all()
-
-        if self._sort_column is None:
-            keybinds.sort(key=lambda kb: kb.created_at)
-            return keybinds
-
+    def _sort_key(self, kb: Keybind) -> Tuple[Any, ...]:
         col = self._sort_column
         if col == 'hotkey':
-            key_func = lambda kb: kb.hotkey.lower()
+            primary = kb.hotkey.lower()
         elif col == 'name':
-            key_func = lambda kb: kb.name.lower()
+            primary = kb.name.lower()
         elif col == 'type':
-            key_func = lambda kb: self.ACTION_TYPE_DISPLAY.get(kb.action_type, kb.action_type).lower()
+            primary = self.ACTION_TYPE_DISPLAY.get(kb.action_type, kb.action_type).lower()
         else:
-            return keybinds
-
-        reverse = (self._sort_cycle == 1)
-        keybinds.sort(key=key_func, reverse=reverse)
-        return keybinds
+            primary = kb.created_at
+        return (primary, kb.created_at, kb.id)
 
     def _get_selected_keybind(self) -> Optional[Keybind]:
-        if self._selected_card is None:
+        if self.keybind_list is None or self.keybind_list.selected_id is None:
             return None
-        return self._selected_card.keybind
+        return self.store.get(self.keybind_list.selected_id)
 
-    def _on_add(self):
+    def _editor_factory(self):
         from .keybind_editor import KeybindEditorDialog
 
-        dialog = KeybindEditorDialog(
-            self.root,
+        return KeybindEditorDialog(
+            self.dialogs.parent,
             self.store,
             self.hotkey_manager,
+            launch_stats=self.launch_stats,
+            dialogs=self.dialogs,
+            worker=self.worker,
         )
-        result = dialog.show()
 
-        if result:
-            self._refresh_list()
-            if self.on_keybinds_changed:
-                self.on_keybinds_changed()
+    def _editor(self):
+        from .keybind_editor import KeybindEditorDialog
+
+        return self.dialogs.get(KeybindEditorDialog, self._editor_factory)
+
+    def _on_add(self):
+        self._editor().show(over=self.root)
 
     def _on_edit(self):
         keybind = self._get_selected_keybind()
@@ -332,20 +609,7 @@ class ConfigWindow:
             messagebox.showinfo("Edit", "Please select a keybind to edit.")
             return
 
-        from .keybind_editor import KeybindEditorDialog
-
-        dialog = KeybindEditorDialog(
-            self.root,
-            self.store,
-            self.hotkey_manager,
-            keybind=keybind,
-        )
-        result = dialog.show()
-
-        if result:
-            self._refresh_list()
-            if self.on_keybinds_changed:
-                self.on_keybinds_changed()
+        self._editor().show(keybind, over=self.root)
 
     def _on_remove(self):
         keybind = self._get_selected_keybind()
@@ -360,13 +624,150 @@ class ConfigWindow:
         )
 
         if confirm:
-            self.hotkey_manager.unregister(keybind.hotkey)
-            self.store.remove(keybind.id)
-            self._refresh_list()
-            if self.on_keybinds_changed:
-                self.on_keybinds_changed()
+            self._run_store_task(self.store.remove, keybind.id)
+
+    def _on_rotate_passwords(self):
+        from .password_rotation import PasswordRotationDialog
+        from ..passwords import rotate_passwords
+
+        candidates = [kb for kb in self.keybind_list.items if self.store.resolve(kb).password]
+        if not candidates:
+            messagebox.showinfo("Rotate Passwords", "None of the listed keybinds has a password.")
+            return
+
+        preselected = [self.keybind_list.selected_id] if self.keybind_list.selected_id else []
+        dialog = self.dialogs.get(
+            PasswordRotationDialog,
+            lambda: PasswordRotationDialog(self.store, self.dialogs.parent)
+        )
+        result = dialog.show(candidates, preselected, over=self.root)
+        if result is not None:
+            policy, keybind_ids = result
+            self._run_store_task(rotate_passwords, self.store, keybind_ids, policy)
+
+    def _ask_passphrase(self, title: str, confirm: bool) -> Optional[str]:
+        passphrase = simpledialog.askstring(title, "Passphrase:", show="*", parent=self.root)
+        if not passphrase:
+            return None
+        if confirm:
+            again = simpledialog.askstring(title, "Confirm passphrase:", show="*", parent=self.root)
+            if again != passphrase:
+                messagebox.showerror(title, "Passphrases do not match.", parent=self.root)
+                return None
+        return passphrase
+
+    def _on_import(self):
+        from ..transfer import import_keybinds, is_encrypted
+
+        path = filedialog.askopenfilename(
+            parent=self.root,
+            title="Import Keybinds",
+            filetypes=[
+                ("Keybind exports", "*.jsonl *.csv *.qkx"),
+                ("Password manager CSV", "*.csv"),
+                ("All files", "*.*"),
+            ],
+        )
+        if not path:
+            return
+
+        passphrase = None
+        try:
+            if is_encrypted(Path(path)):
+                passphrase = self._ask_passphrase("Import Keybinds", confirm=False)
+                if passphrase is None:
+                    return
+        except OSError as e:
+            messagebox.showerror("Import Keybinds", f"Could not read file:\n{e}", parent=self.root)
+            return
+
+        self._set_busy(True)
+        self.worker.submit(
+            import_keybinds, self.store, Path(path), 'auto', passphrase, self._post_transfer_progress,
+            on_done=self._on_import_done,
+            on_error=self._on_store_task_failed,
+        )
+
+    def _on_import_done(self, result):
+        self._on_store_task_done()
+        message = f"Imported {len(result.imported)} keybind{'s' if len(result.imported) != 1 else ''}."
+        if result.skipped:
+            details = "\n".join(f"Record {number}: {reason}" for number, reason in result.skipped[:10])
+            more = f"\n...and {len(result.skipped) - 10} more" if len(result.skipped) > 10 else ""
+            message += f"\n\nSkipped {len(result.skipped)}:\n{details}{more}"
+        messagebox.showinfo("Import Keybinds", message, parent=self.root)
+
+    def _on_export(self):
+        from ..transfer import export_keybinds
+
+        path = filedialog.asksaveasfilename(
+            parent=self.root,
+            title="Export Keybinds",
+            defaultextension=".jsonl",
+            filetypes=[("JSON Lines", "*.jsonl"), ("CSV", "*.csv"), ("Encrypted export", "*.qkx")],
+        )
+        if not path:
+            return
+
+        fmt = 'csv' if path.lower().endswith('.csv') else 'jsonl'
+        passphrase = None
+        if path.lower().endswith('.qkx') or messagebox.askyesno(
+            "Export Keybinds",
+            "Encrypt the export with a passphrase?\n\n"
+            "Unencrypted exports contain your passwords in plain text.",
+            parent=self.root,
+        ):
+            passphrase = self._ask_passphrase("Export Keybinds", confirm=True)
+            if passphrase is None:
+                return
+
+        self._set_busy(True)
+        self.worker.submit(
+            export_keybinds, [self.store.resolve(kb) for kb in self.store.get_all()], Path(path), fmt, passphrase, self._post_transfer_progress,
+            on_done=lambda _: self._on_store_task_done(),
+            on_error=self._on_store_task_failed,
+        )
+
+    def _post_transfer_progress(self, done: int, total: int):
+        self.worker.events.post('transfer-progress', (done, total))
+
+    def _on_transfer_progress(self, progress: Tuple[int, int]):
+        if self.root is None or not self.worker.busy:
+            return
+        done, total = progress
+        if self.busy_bar.cget("mode") != "determinate":
+            self.busy_bar.stop()
+            self.busy_bar.configure(mode="determinate")
+        self.busy_bar.set(done / total if total else 1.0)
+
+    def _run_store_task(self, operation: Callable, *args):
+        self._set_busy(True)
+        self.worker.submit(
+            operation, *args,
+            on_done=lambda _: self._on_store_task_done(),
+            on_error=self._on_store_task_failed,
+        )
+
+    def _set_busy(self, busy: bool):
+        if self.root is None:
+            return
+        if busy and not self.busy_bar.winfo_ismapped():
+            self.busy_bar.pack(side="right", padx=(0, theme.PAD_SM))
+            self.busy_bar.start()
+        elif not busy and self.busy_bar.winfo_ismapped():
+            self.busy_bar.stop()
+            self.busy_bar.configure(mode="indeterminate")
+            self.busy_bar.pack_forget()
+
+    def _on_store_task_done(self):
+        self._set_busy(self.worker.busy)
+
+    def _on_store_task_failed(self, error: BaseException):
+        self._on_store_task_done()
+        messagebox.showerror("Error", f"Could not update keybinds:\n{error}", parent=self.root)
 
     def _on_close(self):
         if self.root:
             self.root.destroy()
             self.root = None
+            self.search_entry = None
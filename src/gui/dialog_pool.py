@@ -0,0 +1,165 @@
+import statistics
+import time
+import tkinter as tk
+from collections import deque
+from typing import Callable, Deque, Dict, Hashable, Optional
+
+import customtkinter as ctk
+
+from . import theme
+
+
+LATENCY_SAMPLES = 50
+
+
+class PooledDialog:
+
+    WIDTH = 400
+    HEIGHT = 300
+
+    def __init__(self, parent=None):
+        self.parent = parent
+        self.root: Optional[ctk.CTkToplevel] = None
+        self.open_latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._closed: Optional[tk.BooleanVar] = None
+        self._opened_at = 0.0
+        self._previous_grab = None
+
+    def is_built(self) -> bool:
+        if self.root is None:
+            return False
+        try:
+            return bool(self.root.winfo_exists())
+        except tk.TclError:
+            return False
+
+    def build(self) -> None:
+        if self.is_built():
+            return
+
+        if self.parent is not None:
+            self.root = ctk.CTkToplevel(self.parent)
+            self.root.withdraw()
+        else:
+            self.root = ctk.CTk()
+        self.root.configure(fg_color=theme.BG_DARK)
+        self.root.protocol("WM_DELETE_WINDOW", self._on_cancel)
+        theme.set_window_icon(self.root)
+
+        self._closed = tk.BooleanVar(master=self.root, value=True)
+        self._create_widgets()
+
+    def destroy(self) -> None:
+        if self.is_built():
+            self.root.destroy()
+        self.root = None
+
+    def _create_widgets(self) -> None:
+        raise NotImplementedError
+
+    def _on_cancel(self) -> None:
+        self._close()
+
+    def _place(self, over=None) -> None:
+        self.root.geometry(f"{self.WIDTH}x{self.HEIGHT}")
+        try:
+            visible = over is not None and over.winfo_viewable()
+        except tk.TclError:
+            visible = False
+
+        if visible:
+            x = over.winfo_x() + (over.winfo_width() - self.WIDTH) // 2
+            y = over.winfo_y() + (over.winfo_height() - self.HEIGHT) // 2
+        else:
+            x = (self.root.winfo_screenwidth() - self.WIDTH) // 2
+            y = (self.root.winfo_screenheight() - self.HEIGHT) // 2
+        self.root.geometry(f"+{x}+{y}")
+
+    def _begin(self) -> None:
+        self._opened_at = time.perf_counter()
+        self.build()
+
+    def _present(self, over=None, grab: bool = True) -> None:
+        self._place(over)
+        if over is not None:
+            self.root.transient(over)
+
+        self.root.deiconify()
+        self.root.lift()
+        self.root.focus_force()
+        self.root.after_idle(self._record_open_latency)
+
+        if self.parent is None:
+            self.root.mainloop()
+            return
+
+        if grab:
+            self._previous_grab = self.root.grab_current()
+            self.root.grab_set()
+
+        self._closed.set(False)
+        self.root.wait_variable(self._closed)
+
+    def _close(self) -> None:
+        if not self.is_built():
+            return
+
+        if self.parent is None:
+            self.root.destroy()
+            self.root = None
+            return
+
+        try:
+            self.root.grab_release()
+            if self._previous_grab is not None and self._previous_grab.winfo_viewable():
+                self._previous_grab.grab_set()
+        except tk.TclError:
+            pass
+        self._previous_grab = None
+
+        self.root.withdraw()
+        self._closed.set(True)
+
+    def _record_open_latency(self) -> None:
+        self.open_latencies.append(time.perf_counter() - self._opened_at)
+
+
+class DialogPool:
+
+    def __init__(self, parent):
+        self.parent = parent
+        self._dialogs: Dict[Hashable, PooledDialog] = {}
+
+    def get(self, key: Hashable, factory: Callable[[], PooledDialog]) -> PooledDialog:
+        dialog = self._dialogs.get(key)
+        if dialog is None or not dialog.is_built():
+            dialog = factory()
+            dialog.build()
+            self._dialogs[key] = dialog
+        return dialog
+
+    def prebuild(self, key: Hashable, factory: Callable[[], PooledDialog]) -> None:
+        self.parent.after_idle(lambda: self.get(key, factory))
+
+    def close_all(self) -> None:
+        for dialog in self._dialogs.values():
+            if dialog.is_built() and dialog.root.winfo_viewable():
+                dialog._on_cancel()
+
+    def destroy(self) -> None:
+        for dialog in self._dialogs.values():
+            dialog.destroy()
+        self._dialogs.clear()
+
+    def open_latency_stats(self) -> Dict[str, Dict[str, float]]:
+        stats = {}
+        for key, dialog in self._dialogs.items():
+            samples = list(dialog.open_latencies)
+            if samples:
+                name = getattr(key, '__name__', str(key))
+                stats[name] = {
+                    'count': len(samples),
+                    'median_ms': statistics.median(samples) * 1000,
+                    'max_ms': max(samples) * 1000,
+                }
+        return stats
@@ -1,31 +1,50 @@
 import tkinter as tk
-from tkinter import messagebox, filedialog
-from typing import Optional
+from dataclasses import replace
+from tkinter import messagebox, filedialog, simpledialog
+from typing import Dict, Optional
 
 import customtkinter as ctk
 
-from ..storage import Keybind, KeybindStore
+from ..storage import Credential, Keybind, KeybindStore
 from ..hotkeys import HotkeyManager, HotkeyCapture
+from ..launch_stats import LaunchStats
+from ..macro import MacroError, format_script, parse_script, validate_steps
+from ..workspace import WorkspaceError, format_members, parse_members
+from ..readiness import PROBE_MODES
 from . import theme
+from .dialog_pool import DialogPool, PooledDialog
+from ..events import EventBus
+from .worker import TkWorker
 
 
-class KeybindEditorDialog:
+class KeybindEditorDialog(PooledDialog):
+
+    WIDTH = 470
+    HEIGHT = 560
+
+    OWN_CREDENTIAL = "Own username/password"
+    NEW_CREDENTIAL = "New shared credential..."
 
     def __init__(
         self,
-        parent: ctk.CTkToplevel,
+        parent,
         store: KeybindStore,
         hotkey_manager: HotkeyManager,
-        keybind: Optional[Keybind] = None,
+        launch_stats: Optional[LaunchStats] = None,
+        dialogs: Optional[DialogPool] = None,
+        worker: Optional[TkWorker] = None,
     ):
-        self.parent = parent
+        super().__init__(parent)
         self.store = store
         self.hotkey_manager = hotkey_manager
-        self.keybind = keybind
-        self.is_edit = keybind is not None
+        self.launch_stats = launch_stats
+        self.dialogs = dialogs or DialogPool(parent)
+        self.worker = worker or TkWorker(EventBus(parent))
+        self._busy = False
+        self.keybind: Optional[Keybind] = None
+        self.is_edit = False
         self.result = False
 
-        self.root: Optional[ctk.CTkToplevel] = None
         self.hotkey_capture: Optional[HotkeyCapture] = None
         self.is_capturing = False
 
@@ -34,52 +53,74 @@ class KeybindEditorDialog:
         self.action_type_var = tk.StringVar(value='paste')
         self.username_var = tk.StringVar()
         self.password_var = tk.StringVar()
+        self.credential_var = tk.StringVar(value=self.OWN_CREDENTIAL)
+        self._credential_options: Dict[str, Optional[Credential]] = {}
+        self._credential_label = self.OWN_CREDENTIAL
+        self.restore_clipboard_var = tk.BooleanVar(value=True)
         self.program_path_var = tk.StringVar()
         self.program_args_var = tk.StringVar()
+        self.focus_existing_var = tk.BooleanVar(value=False)
         self.wait_seconds_var = tk.StringVar(value='2.0')
+        self.adaptive_wait_var = tk.BooleanVar(value=False)
+        self.ready_probe_var = tk.StringVar(value='auto')
+        self.ready_path_var = tk.StringVar()
+
+    def show(self, keybind: Optional[Keybind] = None, over=None) -> bool:
+        self._begin()
+        self.keybind = keybind
+        self.is_edit = keybind is not None
+        self.result = False
 
-        if self.keybind:
-            self.hotkey_var.set(keybind.hotkey)
-            self.name_var.set(keybind.name)
-            self.action_type_var.set(keybind.action_type)
-            self.username_var.set(keybind.username)
-            self.password_var.set(keybind.password)
-            self.program_path_var.set(keybind.program_path)
-            self.program_args_var.set(keybind.program_args)
-            self.wait_seconds_var.set(str(keybind.wait_seconds))
-
-    def show(self) -> bool:
-        self.root = ctk.CTkToplevel(self.parent)
         self.root.title("Edit Keybind" if self.is_edit else "Add Keybind")
-        self.root.geometry("470x560")
-        self.root.resizable(False, False)
-        self.root.transient(self.parent)
-        self.root.grab_set()
-        self.root.configure(fg_color=theme.BG_DARK)
+        self._reset_fields()
 
-        theme.set_window_icon(self.root)
+        self._present(over=over)
+        return self.result
 
-        self.root.update_idletasks()
-        px = self.parent.winfo_x()
-        py = self.parent.winfo_y()
-        pw = self.parent.winfo_width()
-        ph = self.parent.winfo_height()
-        x = px + (pw - 470) // 2
-        y = py + (ph - 560) // 2
-        self.root.geometry(f"+{x}+{y}")
+    def _reset_fields(self):
+        source = self.keybind or Keybind(id="", hotkey="", name="", action_type='paste')
+
+        self.hotkey_var.set(source.hotkey)
+        self.name_var.set(source.name)
+        self.action_type_var.set(source.action_type)
+        self.username_var.set(source.username)
+        self.password_var.set(source.password)
+        self._load_credentials(source.credential_id)
+        self.restore_clipboard_var.set(source.restore_clipboard)
+        self.program_path_var.set(source.program_path)
+        self.program_args_var.set(source.program_args)
+        self.focus_existing_var.set(source.focus_existing)
+        self.wait_seconds_var.set(str(source.wait_seconds))
+        self.adaptive_wait_var.set(source.adaptive_wait)
+        self.ready_probe_var.set(source.ready_probe)
+        self.ready_path_var.set(source.ready_path)
 
-        self._create_widgets()
-        self._on_action_type_changed(self.action_type_var.get())
+        self._pw_visible = False
+        self.password_entry.configure(show="*")
 
-        if self.keybind and self.keybind.custom_text:
-            self.custom_text_box.insert("1.0", self.keybind.custom_text)
+        self._custom_text_actual = ""
+        self._custom_text_visible = True
+        self.custom_text_box.delete("1.0", "end")
+        self.custom_text_box.insert("1.0", source.custom_text)
 
-        self.root.protocol("WM_DELETE_WINDOW", self._on_cancel)
-        self.root.wait_window()
+        self.macro_text_box.delete("1.0", "end")
+        self.macro_text_box.insert("1.0", format_script(source.macro_steps) if source.macro_steps else "")
 
-        return self.result
+        self.workspace_text_box.delete("1.0", "end")
+        if source.workspace_members:
+            self.workspace_text_box.insert(
+                "1.0",
+                format_members(source.workspace_members, self.store.get_all())
+            )
+
+        self._on_action_type_changed(source.action_type)
+        self._on_ready_probe_changed()
+        self.main_frame._parent_canvas.yview_moveto(0)
+        self.name_entry.focus_set()
 
     def _create_widgets(self):
+        self.root.resizable(False, False)
+
         self.main_frame = ctk.CTkScrollableFrame(
             self.root,
             fg_color=theme.BG_DARK,
@@ -133,7 +174,7 @@ class KeybindEditorDialog:
         self.action_combo = ctk.CTkOptionMenu(
             self.main_frame,
             variable=self.action_type_var,
-            values=['paste', 'launch', 'launch_paste'],
+            values=['paste', 'launch', 'launch_paste', 'macro', 'workspace'],
             command=self._on_action_type_changed,
             width=180,
             height=theme.ENTRY_HEIGHT,
@@ -158,6 +199,29 @@ class KeybindEditorDialog:
         paste_inner = ctk.CTkFrame(paste_card, fg_color="transparent")
         paste_inner.pack(fill="x", padx=theme.PAD_SM, pady=theme.PAD_SM)
 
+        ctk.CTkLabel(paste_inner, text="Credential", font=theme.FONT_SMALL, text_color=theme.TEXT_SECONDARY).pack(anchor="w")
+        self.credential_menu = ctk.CTkOptionMenu(
+            paste_inner,
+            variable=self.credential_var,
+            values=[self.OWN_CREDENTIAL, self.NEW_CREDENTIAL],
+            command=self._on_credential_changed,
+            height=theme.ENTRY_HEIGHT,
+            font=theme.FONT_BODY,
+            fg_color=theme.SURFACE_HOVER,
+            button_color=theme.ACCENT,
+            button_hover_color=theme.ACCENT_HOVER,
+            dropdown_fg_color=theme.SURFACE,
+            dropdown_hover_color=theme.SURFACE_HOVER,
+            dropdown_text_color=theme.TEXT_PRIMARY,
+            text_color=theme.TEXT_PRIMARY,
+            corner_radius=theme.BUTTON_RADIUS,
+        )
+        self.credential_menu.pack(fill="x", pady=(2, 0))
+        self.credential_usage_label = ctk.CTkLabel(
+            paste_inner, text="", font=theme.FONT_SMALL, text_color=theme.TEXT_MUTED, anchor="w",
+        )
+        self.credential_usage_label.pack(anchor="w", pady=(0, theme.PAD_SM))
+
         ctk.CTkLabel(paste_inner, text="Username", font=theme.FONT_SMALL, text_color=theme.TEXT_SECONDARY).pack(anchor="w")
         ctk.CTkEntry(
             paste_inner, textvariable=self.username_var, **theme.entry_kwargs(),
@@ -240,6 +304,18 @@ class KeybindEditorDialog:
         )
         self.custom_eye_btn.pack(side="right")
 
+        ctk.CTkCheckBox(
+            paste_inner,
+            text="Restore clipboard after paste",
+            variable=self.restore_clipboard_var,
+            font=theme.FONT_SMALL,
+            text_color=theme.TEXT_SECONDARY,
+            fg_color=theme.ACCENT,
+            hover_color=theme.ACCENT_HOVER,
+            border_color=theme.BORDER,
+            checkmark_color=theme.TEXT_PRIMARY,
+        ).pack(anchor="w", pady=(theme.PAD_SM, 0))
+
         self.launch_section = ctk.CTkFrame(self.main_frame, fg_color="transparent")
 
         self._section_label(self.launch_section, "Launch Settings")
@@ -270,35 +346,168 @@ class KeybindEditorDialog:
             launch_inner, textvariable=self.program_args_var, **theme.entry_kwargs(),
         ).pack(fill="x", pady=(2, 0))
 
+        self.focus_existing_check = ctk.CTkCheckBox(
+            launch_inner,
+            text="Focus running instance instead of launching again",
+            variable=self.focus_existing_var,
+            font=theme.FONT_SMALL,
+            text_color=theme.TEXT_SECONDARY,
+            fg_color=theme.ACCENT,
+            hover_color=theme.ACCENT_HOVER,
+            border_color=theme.BORDER,
+            checkmark_color=theme.TEXT_PRIMARY,
+        )
+
         self.wait_section = ctk.CTkFrame(self.main_frame, fg_color="transparent")
 
         wait_inner = ctk.CTkFrame(self.wait_section, fg_color="transparent")
         wait_inner.pack(fill="x")
 
-        ctk.CTkLabel(wait_inner, text="Wait before paste (seconds):", font=theme.FONT_SMALL, text_color=theme.TEXT_SECONDARY).pack(side="left")
+        ctk.CTkLabel(wait_inner, text="Paste when ready, wait up to (seconds):", font=theme.FONT_SMALL, text_color=theme.TEXT_SECONDARY).pack(side="left")
         ctk.CTkEntry(
             wait_inner, textvariable=self.wait_seconds_var, width=80,
             **theme.entry_kwargs(),
         ).pack(side="left", padx=(theme.PAD_SM, 0))
 
+        ready_row = ctk.CTkFrame(self.wait_section, fg_color="transparent")
+        ready_row.pack(fill="x", pady=(theme.PAD_SM, 0))
+
+        ctk.CTkLabel(ready_row, text="Ready when:", font=theme.FONT_SMALL, text_color=theme.TEXT_SECONDARY).pack(side="left")
+        ctk.CTkOptionMenu(
+            ready_row,
+            variable=self.ready_probe_var,
+            values=list(PROBE_MODES),
+            command=self._on_ready_probe_changed,
+            width=100,
+            height=theme.ENTRY_HEIGHT,
+            font=theme.FONT_BODY,
+            fg_color=theme.SURFACE,
+            button_color=theme.ACCENT,
+            button_hover_color=theme.ACCENT_HOVER,
+            dropdown_fg_color=theme.SURFACE,
+            dropdown_hover_color=theme.SURFACE_HOVER,
+            dropdown_text_color=theme.TEXT_PRIMARY,
+            text_color=theme.TEXT_PRIMARY,
+            corner_radius=theme.BUTTON_RADIUS,
+        ).pack(side="left", padx=(theme.PAD_SM, 0))
+
+        self.ready_path_entry = ctk.CTkEntry(
+            ready_row, textvariable=self.ready_path_var,
+            **theme.entry_kwargs(),
+        )
+
+        adaptive_row = ctk.CTkFrame(self.wait_section, fg_color="transparent")
+        adaptive_row.pack(fill="x", pady=(theme.PAD_SM, 0))
+
+        ctk.CTkCheckBox(
+            adaptive_row,
+            text="Use learned wait",
+            variable=self.adaptive_wait_var,
+            font=theme.FONT_SMALL,
+            text_color=theme.TEXT_SECONDARY,
+            fg_color=theme.ACCENT,
+            hover_color=theme.ACCENT_HOVER,
+            border_color=theme.BORDER,
+            checkmark_color=theme.TEXT_PRIMARY,
+        ).pack(side="left")
+
+        self.learned_wait_label = ctk.CTkLabel(
+            adaptive_row,
+            text=self._learned_wait_text(),
+            font=theme.FONT_TINY,
+            text_color=theme.TEXT_MUTED,
+        )
+        self.learned_wait_label.pack(side="left", padx=(theme.PAD_SM, 0))
+
+        self.program_path_var.trace_add(
+            'write',
+            lambda *args: self.learned_wait_label.configure(text=self._learned_wait_text()),
+        )
+
+        self.macro_section = ctk.CTkFrame(self.main_frame, fg_color="transparent")
+
+        self._section_label(self.macro_section, "Macro Steps")
+
+        macro_card = ctk.CTkFrame(self.macro_section, fg_color=theme.SURFACE, corner_radius=theme.CORNER_RADIUS)
+        macro_card.pack(fill="x", pady=(0, theme.PAD_SM))
+        macro_inner = ctk.CTkFrame(macro_card, fg_color="transparent")
+        macro_inner.pack(fill="x", padx=theme.PAD_SM, pady=theme.PAD_SM)
+
+        self.macro_text_box = ctk.CTkTextbox(
+            macro_inner,
+            height=120,
+            fg_color=theme.INPUT_BG,
+            border_color=theme.BORDER,
+            text_color=theme.TEXT_PRIMARY,
+            corner_radius=theme.BUTTON_RADIUS,
+            font=("Consolas", 12),
+            wrap="none",
+        )
+        self.macro_text_box.pack(fill="x", pady=(0, theme.PAD_SM))
+
+        ctk.CTkLabel(
+            macro_inner,
+            text=(
+                "One step per line: type, paste, key, wait, wait_window, launch,\n"
+                "clipboard_restore. Use {username} and {password} in type/paste,\n"
+                "e.g. 'key ctrl+l', 'wait 0.5', 'wait_window Sign in @15'."
+            ),
+            font=theme.FONT_TINY,
+            text_color=theme.TEXT_MUTED,
+            justify="left",
+        ).pack(anchor="w")
+
+        self.workspace_section = ctk.CTkFrame(self.main_frame, fg_color="transparent")
+
+        self._section_label(self.workspace_section, "Workspace Programs")
+
+        workspace_card = ctk.CTkFrame(self.workspace_section, fg_color=theme.SURFACE, corner_radius=theme.CORNER_RADIUS)
+        workspace_card.pack(fill="x", pady=(0, theme.PAD_SM))
+        workspace_inner = ctk.CTkFrame(workspace_card, fg_color="transparent")
+        workspace_inner.pack(fill="x", padx=theme.PAD_SM, pady=theme.PAD_SM)
+
+        self.workspace_text_box = ctk.CTkTextbox(
+            workspace_inner,
+            height=120,
+            fg_color=theme.INPUT_BG,
+            border_color=theme.BORDER,
+            text_color=theme.TEXT_PRIMARY,
+            corner_radius=theme.BUTTON_RADIUS,
+            font=("Consolas", 12),
+            wrap="none",
+        )
+        self.workspace_text_box.pack(fill="x", pady=(0, theme.PAD_SM))
+
+        ctk.CTkLabel(
+            workspace_inner,
+            text=(
+                "One launch keybind name per line; all start at once.\n"
+                "Add '<- Name' to start a program after another is ready,\n"
+                "e.g. 'Mail Client <- VPN'."
+            ),
+            font=theme.FONT_TINY,
+            text_color=theme.TEXT_MUTED,
+            justify="left",
+        ).pack(anchor="w")
+
         btn_frame = ctk.CTkFrame(self.root, fg_color=theme.BG_DARK)
         btn_frame.pack(fill="x", padx=theme.PAD, pady=theme.PAD)
 
-        save_btn = ctk.CTkButton(
+        self.save_btn = ctk.CTkButton(
             btn_frame, text="Save",
             command=self._on_save,
             **theme.accent_button_kwargs(),
             width=90,
         )
-        save_btn.pack(side="right")
+        self.save_btn.pack(side="right")
 
-        cancel_btn = ctk.CTkButton(
+        self.cancel_btn = ctk.CTkButton(
             btn_frame, text="Cancel",
             command=self._on_cancel,
             **theme.secondary_button_kwargs(),
             width=90,
         )
-        cancel_btn.pack(side="right", padx=(0, theme.PAD_SM))
+        self.cancel_btn.pack(side="right", padx=(0, theme.PAD_SM))
 
     @staticmethod
     def _section_label(parent, text: str):
@@ -309,15 +518,73 @@ class KeybindEditorDialog:
             text_color=theme.TEXT_SECONDARY,
         ).pack(anchor="w", pady=(theme.PAD_SM, 4))
 
+    def _credential_label_for(self, credential: Credential) -> str:
+        label = credential.name
+        suffix = 2
+        while label in self._credential_options or label in (self.OWN_CREDENTIAL, self.NEW_CREDENTIAL):
+            label = f"{credential.name} ({suffix})"
+            suffix += 1
+        return label
+
+    def _load_credentials(self, credential_id: str):
+        self._credential_options = {self.OWN_CREDENTIAL: None}
+        selected = self.OWN_CREDENTIAL
+        for credential in self.store.get_credentials():
+            label = self._credential_label_for(credential)
+            self._credential_options[label] = credential
+            if credential.id == credential_id:
+                selected = label
+
+        self.credential_menu.configure(values=[*self._credential_options, self.NEW_CREDENTIAL])
+        self._select_credential(selected)
+
+    def _select_credential(self, label: str):
+        self._credential_label = label
+        self.credential_var.set(label)
+        credential = self._credential_options.get(label)
+        if credential is not None:
+            self.username_var.set(credential.username)
+            self.password_var.set(credential.password)
+
+        users = len(self.store.credential_users(credential.id)) if credential is not None else 0
+        if credential is None:
+            text = ""
+        elif users:
+            text = f"Shared by {users} keybind{'s' if users != 1 else ''}; edits apply to all of them."
+        else:
+            text = "New shared credential; saved with this keybind."
+        self.credential_usage_label.configure(text=text)
+
+    def _on_credential_changed(self, label: str):
+        if label != self.NEW_CREDENTIAL:
+            self._select_credential(label)
+            return
+
+        name = simpledialog.askstring("Shared Credential", "Credential name:", parent=self.root)
+        if not name or not name.strip():
+            self.credential_var.set(self._credential_label)
+            return
+
+        credential = Credential.create_new(name.strip(), self.username_var.get(), self.password_var.get())
+        label = self._credential_label_for(credential)
+        self._credential_options[label] = credential
+        self.credential_menu.configure(values=[*self._credential_options, self.NEW_CREDENTIAL])
+        self._select_credential(label)
+
     def _toggle_password_visibility(self):
         self._pw_visible = not self._pw_visible
         self.password_entry.configure(show="" if self._pw_visible else "*")
 
-    def _open_password_generator(self):
+    def _password_generator(self):
         from .password_generator import PasswordGeneratorDialog
 
-        dialog = PasswordGeneratorDialog(parent=self.root)
-        password = dialog.show()
+        return self.dialogs.get(
+            PasswordGeneratorDialog,
+            lambda: PasswordGeneratorDialog(parent=self.dialogs.parent)
+        )
+
+    def _open_password_generator(self):
+        password = self._password_generator().show(over=self.root)
 
         if password:
             self.password_var.set(password)
@@ -337,10 +604,7 @@ class KeybindEditorDialog:
             self._custom_text_visible = True
 
     def _open_custom_text_generator(self):
-        from .password_generator import PasswordGeneratorDialog
-
-        dialog = PasswordGeneratorDialog(parent=self.root)
-        password = dialog.show()
+        password = self._password_generator().show(over=self.root)
 
         if password:
             if not self._custom_text_visible:
@@ -358,24 +622,72 @@ class KeybindEditorDialog:
         else:
             return self._custom_text_actual
 
+    def _learned_wait_text(self) -> str:
+        program_path = self.program_path_var.get()
+        if self.launch_stats is None or not program_path:
+            return "No launches recorded yet"
+
+        summary = self.launch_stats.summary(program_path)
+        if summary is None:
+            return "No launches recorded yet"
+
+        learned = self.launch_stats.learned_wait(program_path)
+        if learned is None:
+            return f"Learning ({summary.count}/{LaunchStats.MIN_SAMPLES} launches)"
+
+        return (
+            f"Learned {learned:.1f}s "
+            f"(avg {summary.ewma:.1f}s, p95 {summary.p95:.1f}s, {summary.count} launches)"
+        )
+
+    def _on_ready_probe_changed(self, value: str = None):
+        if self.ready_probe_var.get() == 'path':
+            self.ready_path_entry.pack(side="left", fill="x", expand=True, padx=(theme.PAD_SM, 0))
+        else:
+            self.ready_path_entry.pack_forget()
+
+    def _get_macro_steps(self):
+        return parse_script(self.macro_text_box.get("1.0", "end-1c"))
+
+    def _get_workspace_members(self):
+        return parse_members(
+            self.workspace_text_box.get("1.0", "end-1c"),
+            self.store.get_all()
+        )
+
     def _on_action_type_changed(self, value: str = None):
         action = self.action_type_var.get()
 
-        if action in ('paste', 'launch_paste'):
+        if action in ('paste', 'launch_paste', 'macro'):
             self.paste_section.pack(fill="x", after=self.action_combo)
         else:
             self.paste_section.pack_forget()
 
-        if action in ('launch', 'launch_paste'):
+        if action in ('launch', 'launch_paste', 'macro'):
             self.launch_section.pack(fill="x", after=self.paste_section if self.paste_section.winfo_ismapped() else self.action_combo)
         else:
             self.launch_section.pack_forget()
 
+        if action == 'launch':
+            self.focus_existing_check.pack(anchor="w", pady=(theme.PAD_SM, 0))
+        else:
+            self.focus_existing_check.pack_forget()
+
         if action == 'launch_paste':
             self.wait_section.pack(fill="x", after=self.launch_section, pady=(0, theme.PAD_SM))
         else:
             self.wait_section.pack_forget()
 
+        if action == 'macro':
+            self.macro_section.pack(fill="x", after=self.launch_section)
+        else:
+            self.macro_section.pack_forget()
+
+        if action == 'workspace':
+            self.workspace_section.pack(fill="x", after=self.action_combo)
+        else:
+            self.workspace_section.pack_forget()
+
     def _toggle_capture(self):
         if self.is_capturing:
             self._stop_capture()
@@ -447,6 +759,20 @@ class KeybindEditorDialog:
 
         action = self.action_type_var.get()
 
+        if action == 'macro':
+            try:
+                validate_steps(self._get_macro_steps())
+            except MacroError as e:
+                messagebox.showerror("Validation Error", f"Invalid macro: {e}")
+                return False
+
+        if action == 'workspace':
+            try:
+                self._get_workspace_members()
+            except WorkspaceError as e:
+                messagebox.showerror("Validation Error", f"Invalid workspace: {e}")
+                return False
+
         if action in ('paste', 'launch_paste'):
             has_credentials = (
                 self.username_var.get().strip() or
@@ -481,9 +807,19 @@ class KeybindEditorDialog:
                     )
                     return False
 
+                if self.ready_probe_var.get() == 'path' and not self.ready_path_var.get().strip():
+                    messagebox.showerror(
+                        "Validation Error",
+                        "Please enter the file or socket path to wait for.",
+                    )
+                    return False
+
         return True
 
     def _on_save(self):
+        if self._busy:
+            return
+
         if self.is_capturing:
             self._stop_capture()
 
@@ -495,44 +831,73 @@ class KeybindEditorDialog:
         except ValueError:
             wait_seconds = 2.0
 
+        macro_steps = self._get_macro_steps() if self.action_type_var.get() == 'macro' else []
+        workspace_members = (
+            self._get_workspace_members() if self.action_type_var.get() == 'workspace' else []
+        )
+
+        fields = dict(
+            hotkey=self.hotkey_var.get(),
+            name=self.name_var.get().strip(),
+            action_type=self.action_type_var.get(),
+            username=self.username_var.get(),
+            password=self.password_var.get(),
+            custom_text=self._get_custom_text(),
+            restore_clipboard=self.restore_clipboard_var.get(),
+            program_path=self.program_path_var.get(),
+            program_args=self.program_args_var.get(),
+            focus_existing=self.focus_existing_var.get(),
+            wait_seconds=wait_seconds,
+            adaptive_wait=self.adaptive_wait_var.get(),
+            ready_probe=self.ready_probe_var.get(),
+            ready_path=self.ready_path_var.get().strip(),
+            macro_steps=macro_steps,
+            workspace_members=workspace_members,
+        )
+
+        credential = None
+        selected = self._credential_options.get(self.credential_var.get())
+        if fields['action_type'] in ('paste', 'launch_paste', 'macro') and selected is not None:
+            fields.update(credential_id=selected.id, username="", password="")
+            edited = replace(selected, username=self.username_var.get(), password=self.password_var.get())
+            if edited != self.store.get_credential(selected.id):
+                credential = edited
+        else:
+            fields['credential_id'] = ""
+
         if self.keybind:
-            old_hotkey = self.keybind.hotkey
-            new_hotkey = self.hotkey_var.get()
-
-            self.keybind.hotkey = new_hotkey
-            self.keybind.name = self.name_var.get().strip()
-            self.keybind.action_type = self.action_type_var.get()
-            self.keybind.username = self.username_var.get()
-            self.keybind.password = self.password_var.get()
-            self.keybind.custom_text = self._get_custom_text()
-            self.keybind.program_path = self.program_path_var.get()
-            self.keybind.program_args = self.program_args_var.get()
-            self.keybind.wait_seconds = wait_seconds
-
-            if old_hotkey != new_hotkey:
-                self.hotkey_manager.unregister(old_hotkey)
-
-            self.store.update(self.keybind)
+            keybind = replace(self.keybind, **fields)
         else:
-            keybind = Keybind.create_new(
-                hotkey=self.hotkey_var.get(),
-                name=self.name_var.get().strip(),
-                action_type=self.action_type_var.get(),
-                username=self.username_var.get(),
-                password=self.password_var.get(),
-                custom_text=self._get_custom_text(),
-                program_path=self.program_path_var.get(),
-                program_args=self.program_args_var.get(),
-                wait_seconds=wait_seconds,
-            )
-            self.store.add(keybind)
+            keybind = Keybind.create_new(**fields)
+
+        self._set_busy(True)
+        self.worker.submit(
+            self.store.save_keybind, keybind, credential,
+            on_done=self._on_saved,
+            on_error=self._on_save_failed,
+        )
 
+    def _set_busy(self, busy: bool):
+        self._busy = busy
+        state = "disabled" if busy else "normal"
+        self.save_btn.configure(state=state, text="Saving..." if busy else "Save")
+        self.cancel_btn.configure(state=state)
+
+    def _on_saved(self, _):
+        self._set_busy(False)
         self.result = True
-        self.root.destroy()
+        self._close()
+
+    def _on_save_failed(self, error: BaseException):
+        self._set_busy(False)
+        messagebox.showerror("Save Failed", f"Could not save the keybind:\n{error}", parent=self.root)
 
     def _on_cancel(self):
+        if self._busy:
+            return
+
         if self.is_capturing:
             self._stop_capture()
 
         self.result = False
-        self.root.destroy()
+        self._close()
@@ -1,64 +1,57 @@
 import tkinter as tk
 from tkinter import messagebox
-from typing import Optional
+from typing import Callable, Optional
 
 import customtkinter as ctk
 
 from . import theme
+from .dialog_pool import PooledDialog
+from ..events import EventBus
+from .worker import TkWorker
 
 
-class MasterPasswordDialog:
+class MasterPasswordDialog(PooledDialog):
 
     MIN_PASSWORD_LENGTH = 8
+    WIDTH = 420
 
-    def __init__(self, is_new_setup: bool = False, parent=None):
+    def __init__(self, is_new_setup: bool = False, parent=None, worker: Optional[TkWorker] = None):
+        super().__init__(parent)
+        self.worker = worker
+        self._owns_worker = worker is None
         self.is_new_setup = is_new_setup
-        self.parent = parent
         self.is_relock = parent is not None and not is_new_setup
         self.result: Optional[str] = None
-        self.root = None
-
-    def show(self) -> Optional[str]:
-        if self.parent:
-            self.root = ctk.CTkToplevel(self.parent)
-            self.root.focus_force()
-            if self.is_relock:
-                self.root.wm_attributes('-toolwindow', False)
-            else:
-                self.root.grab_set()
-        else:
-            self.root = ctk.CTk()
-
-        self.root.title("QuickKeys")
-        self.root.resizable(False, False)
-        self.root.configure(fg_color=theme.BG_DARK)
-
-        theme.set_window_icon(self.root)
-
-        height = 320 if self.is_new_setup else 300
-        width = 420
-        self.root.geometry(f"{width}x{height}")
-
-        self.root.update_idletasks()
-        x = (self.root.winfo_screenwidth() - width) // 2
-        y = (self.root.winfo_screenheight() - height) // 2
-        self.root.geometry(f"+{x}+{y}")
+        self.HEIGHT = 320 if is_new_setup else 300
+        self.on_submit: Optional[Callable[[str], bool]] = None
+        self._busy = False
 
-        self.root.protocol("WM_DELETE_WINDOW", self._on_cancel)
-        self.root.attributes('-topmost', True)
+    def show(self, on_submit: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+        self._begin()
+        self.result = None
+        self.on_submit = on_submit
+        self._set_busy(False)
+        self.status_label.configure(text="")
 
-        self._create_widgets()
+        self.password_entry.delete(0, "end")
+        self._pw_visible = False
+        self.password_entry.configure(show="*")
+        if self.is_new_setup:
+            self.confirm_entry.delete(0, "end")
+            self._cf_visible = False
+            self.confirm_entry.configure(show="*")
 
         self.password_entry.focus_set()
-
-        if self.parent:
-            self.root.wait_window()
-        else:
-            self.root.mainloop()
-
+        self._present(grab=not self.is_relock)
         return self.result
 
     def _create_widgets(self):
+        self.root.title("QuickKeys")
+        self.root.resizable(False, False)
+        self.root.attributes('-topmost', True)
+        if self.is_relock:
+            self.root.wm_attributes('-toolwindow', False)
+
         frame = ctk.CTkFrame(self.root, fg_color=theme.BG_DARK)
         frame.pack(fill="both", expand=True, padx=theme.PAD * 2, pady=(theme.PAD, theme.PAD * 2))
 
@@ -150,20 +143,32 @@ class MasterPasswordDialog:
         btn_frame.pack(fill="x", pady=(theme.PAD, 0))
 
         submit_text = "Create" if self.is_new_setup else "Unlock"
-        submit_btn = ctk.CTkButton(
+        self.submit_btn = ctk.CTkButton(
             btn_frame, text=submit_text,
             command=self._on_submit,
             **theme.accent_button_kwargs(),
         )
-        submit_btn.pack(side="right")
+        self.submit_btn.pack(side="right")
 
+        self.cancel_btn = None
         if not self.is_relock:
-            cancel_btn = ctk.CTkButton(
+            self.cancel_btn = ctk.CTkButton(
                 btn_frame, text="Cancel",
                 command=self._on_cancel,
                 **theme.secondary_button_kwargs(),
             )
-            cancel_btn.pack(side="right", padx=(0, theme.PAD_SM))
+            self.cancel_btn.pack(side="right", padx=(0, theme.PAD_SM))
+
+        self.status_label = ctk.CTkLabel(
+            btn_frame, text="",
+            font=theme.FONT_SMALL,
+            text_color=theme.TEXT_SECONDARY,
+            anchor="w",
+        )
+        self.status_label.pack(side="left", fill="x", expand=True)
+
+        if self._owns_worker:
+            self.worker = TkWorker(EventBus(self.root))
 
         if not self.is_new_setup and not self.is_relock:
             forgot_link = ctk.CTkLabel(
@@ -189,6 +194,9 @@ class MasterPasswordDialog:
         self.confirm_entry.configure(show="" if self._cf_visible else "*")
 
     def _on_submit(self):
+        if self._busy:
+            return
+
         password = self.password_entry.get()
 
         if not password:
@@ -212,12 +220,62 @@ class MasterPasswordDialog:
                 self.confirm_entry.focus_set()
                 return
 
-        self.result = password
-        self.root.destroy()
+        if self.on_submit is None:
+            self.result = password
+            self._close()
+            return
+
+        self._set_busy(True)
+        self.worker.submit(
+            self.on_submit, password,
+            on_done=lambda accepted: self._on_checked(password, accepted),
+            on_error=self._on_check_failed,
+        )
+
+    def _set_busy(self, busy: bool):
+        self._busy = busy
+        state = "disabled" if busy else "normal"
+
+        if busy:
+            text = "Creating..." if self.is_new_setup else "Unlocking..."
+            self.status_label.configure(text="Deriving key...", text_color=theme.TEXT_SECONDARY)
+        else:
+            text = "Create" if self.is_new_setup else "Unlock"
+        self.submit_btn.configure(state=state, text=text)
+
+        if self.cancel_btn is not None:
+            self.cancel_btn.configure(state=state)
+        self.password_entry.configure(state=state)
+        if self.is_new_setup:
+            self.confirm_entry.configure(state=state)
+
+    def _on_checked(self, password: str, accepted: bool):
+        self._set_busy(False)
+        if accepted:
+            self.result = password
+            self._close()
+            return
+
+        self.status_label.configure(text="Incorrect password.", text_color=theme.DANGER)
+        self.password_entry.select_range(0, "end")
+        self.password_entry.focus_set()
+
+    def _on_check_failed(self, error: BaseException):
+        print(f"Error reading store: {error}")
+        self._set_busy(False)
+        self.status_label.configure(text="Could not read the encrypted store.", text_color=theme.DANGER)
 
     def _on_cancel(self):
+        if self._busy:
+            return
         self.result = None
-        self.root.destroy()
+        self._close()
+
+    def _close(self):
+        if self.parent is None and self._owns_worker:
+            self.worker.shutdown()
+            self.worker.events.detach()
+        super()._close()
 
     def _on_forgot_password(self):
         from .reset_password import ResetPasswordDialog
@@ -225,29 +283,5 @@ class MasterPasswordDialog:
         dialog = ResetPasswordDialog(parent=self.root)
         if dialog.show():
             self.result = "__RESET_DATA__"
-            self.root.destroy()
-
-
-class WrongPasswordDialog:
-
-    def __init__(self, parent=None):
-        self.parent = parent
-        self.result: bool = False
-
-    def show(self) -> bool:
-        if self.parent:
-            result = messagebox.askretrycancel(
-                "Invalid Password",
-                "The password you entered is incorrect.\n\nWould you like to try again?",
-                parent=self.parent,
-            )
-        else:
-            root = ctk.CTk()
-            root.withdraw()
-            result = messagebox.askretrycancel(
-                "Invalid Password",
-                "The password you entered is incorrect.\n\nWould you like to try again?",
-            )
-            root.destroy()
+            self._close()
 
-        return result
@@ -0,0 +1,195 @@
+import tkinter as tk
+from typing import Callable, List, Optional
+
+import customtkinter as ctk
+
+from ..search import KeybindSearchIndex
+from ..storage import Keybind, KeybindStore
+from . import theme
+
+
+class _PaletteRow(ctk.CTkFrame):
+
+    HEIGHT = 32
+
+    def __init__(self, master, on_click: Callable, **kwargs):
+        super().__init__(
+            master,
+            fg_color="transparent",
+            corner_radius=6,
+            height=self.HEIGHT,
+            **kwargs,
+        )
+        self.keybind: Optional[Keybind] = None
+        self._selected = False
+
+        self.pack_propagate(False)
+
+        self.name_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=theme.FONT_BODY,
+            text_color=theme.TEXT_PRIMARY,
+            anchor="w",
+        )
+        self.name_label.pack(side="left", fill="x", expand=True, padx=(theme.PAD_SM, 0))
+
+        self.hotkey_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=theme.FONT_SMALL,
+            text_color=theme.TEXT_MUTED,
+            anchor="e",
+        )
+        self.hotkey_label.pack(side="right", padx=(0, theme.PAD_SM))
+
+        for widget in (self, self.name_label, self.hotkey_label):
+            widget.bind("<Button-1>", lambda event: on_click(self))
+
+    def show_keybind(self, keybind: Optional[Keybind], selected: bool):
+        if keybind is not self.keybind:
+            self.keybind = keybind
+            self.name_label.configure(text=keybind.name if keybind else "")
+            self.hotkey_label.configure(text=keybind.hotkey if keybind else "")
+
+        selected = selected and keybind is not None
+        if selected != self._selected:
+            self._selected = selected
+            self.configure(fg_color=theme.SURFACE_SELECT if selected else "transparent")
+
+
+class CommandPalette:
+
+    WIDTH = 520
+    MAX_RESULTS = 8
+    EXECUTE_DELAY_MS = 80
+
+    def __init__(
+        self,
+        parent,
+        store: KeybindStore,
+        search_index: KeybindSearchIndex,
+        on_execute: Callable[[Keybind], None],
+    ):
+        self.store = store
+        self.search_index = search_index
+        self.on_execute = on_execute
+
+        self._results: List[Keybind] = []
+        self._selected = 0
+        self._last_query: Optional[str] = None
+        self._visible = False
+
+        self.root = ctk.CTkToplevel(parent)
+        self.root.withdraw()
+        self.root.overrideredirect(True)
+        self.root.attributes("-topmost", True)
+        self.root.configure(fg_color=theme.BORDER)
+
+        self._create_widgets()
+
+        self.root.update_idletasks()
+        height = self.root.winfo_reqheight()
+        x = (self.root.winfo_screenwidth() - self.WIDTH) // 2
+        y = self.root.winfo_screenheight() // 4
+        self.root.geometry(f"{self.WIDTH}x{height}+{x}+{y}")
+
+    def _create_widgets(self):
+        frame = ctk.CTkFrame(self.root, fg_color=theme.BG_DARK, corner_radius=0)
+        frame.pack(fill="both", expand=True, padx=1, pady=1)
+
+        self.entry = ctk.CTkEntry(
+            frame,
+            placeholder_text="Run a keybind by name...",
+            **theme.entry_kwargs(),
+        )
+        self.entry.pack(fill="x", padx=theme.PAD_SM, pady=theme.PAD_SM)
+
+        results_frame = ctk.CTkFrame(frame, fg_color="transparent")
+        results_frame.pack(fill="x", padx=theme.PAD_SM, pady=(0, theme.PAD_SM))
+
+        self._rows = []
+        for _ in range(self.MAX_RESULTS):
+            row = _PaletteRow(results_frame, on_click=self._on_row_click)
+            row.pack(fill="x")
+            self._rows.append(row)
+
+        self.entry.bind("<KeyRelease>", self._on_key)
+        self.entry.bind("<Return>", lambda event: self._execute_selected())
+        self.entry.bind("<KP_Enter>", lambda event: self._execute_selected())
+        self.entry.bind("<Escape>", lambda event: self.hide())
+        self.entry.bind("<Up>", lambda event: self._move_selection(-1))
+        self.entry.bind("<Down>", lambda event: self._move_selection(1))
+        self.root.bind("<FocusOut>", self._on_focus_out)
+
+    def show(self):
+        self.entry.delete(0, "end")
+        self._last_query = None
+        self._refresh()
+
+        self._visible = True
+        self.root.deiconify()
+        self.root.lift()
+        self.root.focus_force()
+        self.entry.focus_set()
+
+    def hide(self):
+        if self._visible:
+            self._visible = False
+            self.root.withdraw()
+
+    def toggle(self):
+        if self._visible:
+            self.hide()
+        else:
+            self.show()
+
+    def _on_key(self, event):
+        self._refresh()
+
+    def _refresh(self):
+        query = self.entry.get().strip()
+        if query == self._last_query:
+            return
+        self._last_query = query
+
+        ids = self.search_index.search(query, limit=self.MAX_RESULTS) if query else []
+        self._results = [kb for kb in (self.store.get(kid) for kid in ids) if kb is not None]
+        self._selected = 0
+        self._render()
+
+    def _render(self):
+        for index, row in enumerate(self._rows):
+            keybind = self._results[index] if index < len(self._results) else None
+            row.show_keybind(keybind, index == self._selected)
+
+    def _move_selection(self, delta: int):
+        if self._results:
+            self._selected = (self._selected + delta) % len(self._results)
+            self._render()
+        return "break"
+
+    def _on_row_click(self, row: _PaletteRow):
+        if row.keybind is not None:
+            self._selected = self._results.index(row.keybind)
+            self._execute_selected()
+
+    def _execute_selected(self):
+        if not self._results:
+            return "break"
+
+        keybind = self._results[self._selected]
+        self.hide()
+        self.root.after(self.EXECUTE_DELAY_MS, lambda: self.on_execute(keybind))
+        return "break"
+
+    def _on_focus_out(self, event):
+        self.root.after(10, self._hide_if_unfocused)
+
+    def _hide_if_unfocused(self):
+        try:
+            focused = self.root.focus_get()
+        except (KeyError, tk.TclError):
+            focused = None
+        if focused is None or focused.winfo_toplevel() is not self.root:
+            self.hide()
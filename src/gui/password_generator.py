@@ -1,72 +1,51 @@
-import secrets
-import string
 import tkinter as tk
 from typing import Optional
 
 import customtkinter as ctk
 
+from .. import passwords
+from ..passwords import PasswordPolicy, generate_password
 from . import theme
+from .dialog_pool import PooledDialog
 
 
-class PasswordGeneratorDialog:
+class PasswordGeneratorDialog(PooledDialog):
 
-    DEFAULT_LENGTH = 20
-    MIN_LENGTH = 8
-    MAX_LENGTH = 64
+    WIDTH = 380
+    HEIGHT = 400
 
-    LOWERCASE = string.ascii_lowercase
-    UPPERCASE = string.ascii_uppercase
-    DIGITS = string.digits
-    SPECIAL = "!@#$%^&*()_+-=[]{}|;:,.<>?"
+    DEFAULT_LENGTH = passwords.DEFAULT_LENGTH
+    MIN_LENGTH = passwords.MIN_LENGTH
+    MAX_LENGTH = passwords.MAX_LENGTH
 
     def __init__(self, parent=None):
-        self.parent = parent
+        super().__init__(parent)
         self.result: Optional[str] = None
-        self.root: Optional[ctk.CTkToplevel] = None
 
         self.length_var = tk.IntVar(value=self.DEFAULT_LENGTH)
         self.include_numbers_var = tk.BooleanVar(value=True)
         self.include_special_var = tk.BooleanVar(value=True)
         self.preview_var = tk.StringVar()
 
-    def show(self) -> Optional[str]:
-        self.root = ctk.CTkToplevel(self.parent)
-        self.root.title("Generate Password")
-        self.root.resizable(False, False)
-        self.root.configure(fg_color=theme.BG_DARK)
-        self.root.transient(self.parent)
-        self.root.grab_set()
-
-        theme.set_window_icon(self.root)
-
-        width, height = 380, 380
-        self.root.geometry(f"{width}x{height}")
-        self.root.minsize(width, height)
-
-        self.root.update_idletasks()
-        if self.parent:
-            px = self.parent.winfo_x()
-            py = self.parent.winfo_y()
-            pw = self.parent.winfo_width()
-            ph = self.parent.winfo_height()
-            x = px + (pw - width) // 2
-            y = py + (ph - height) // 2
-        else:
-            x = (self.root.winfo_screenwidth() - width) // 2
-            y = (self.root.winfo_screenheight() - height) // 2
-        self.root.geometry(f"+{x}+{y}")
-
-        self._create_widgets()
+    def show(self, over=None) -> Optional[str]:
+        self._begin()
+        self.result = None
+        self.length_var.set(self.DEFAULT_LENGTH)
+        self.length_label.configure(text=str(self.DEFAULT_LENGTH))
+        self.include_numbers_var.set(True)
+        self.include_special_var.set(True)
         self._generate_password()
 
-        self.root.protocol("WM_DELETE_WINDOW", self._on_cancel)
-        self.root.bind('<Escape>', lambda e: self._on_cancel())
-        self.root.bind('<Return>', lambda e: self._on_use())
-
-        self.root.wait_window()
+        self._present(over=over)
         return self.result
 
     def _create_widgets(self):
+        self.root.title("Generate Password")
+        self.root.resizable(False, False)
+        self.root.minsize(self.WIDTH, self.HEIGHT)
+        self.root.bind('<Escape>', lambda e: self._on_cancel())
+        self.root.bind('<Return>', lambda e: self._on_use())
+
         frame = ctk.CTkFrame(self.root, fg_color=theme.BG_DARK)
         frame.pack(fill="both", expand=True, padx=theme.PAD, pady=(theme.PAD, 0))
 
@@ -196,6 +175,15 @@ class PasswordGeneratorDialog:
         )
         regenerate_btn.pack(side="left", padx=(theme.PAD_SM, 0))
 
+        self.entropy_label = ctk.CTkLabel(
+            frame,
+            text="",
+            font=theme.FONT_SMALL,
+            text_color=theme.TEXT_MUTED,
+            anchor="w",
+        )
+        self.entropy_label.pack(anchor="w", pady=(4, 0))
+
         btn_frame = ctk.CTkFrame(self.root, fg_color=theme.BG_DARK)
         btn_frame.pack(fill="x", padx=theme.PAD, pady=theme.PAD)
 
@@ -217,39 +205,17 @@ class PasswordGeneratorDialog:
         )
         cancel_btn.pack(side="right", padx=(0, theme.PAD_SM))
 
-    def _generate_password(self):
-        length = self.length_var.get()
-
-        charset = self.LOWERCASE + self.UPPERCASE
-
-        if self.include_numbers_var.get():
-            charset += self.DIGITS
-
-        if self.include_special_var.get():
-            charset += self.SPECIAL
-
-        password = ''.join(secrets.choice(charset) for _ in range(length))
-
-        required_chars = []
-        required_chars.append(secrets.choice(self.LOWERCASE))
-        required_chars.append(secrets.choice(self.UPPERCASE))
-
-        if self.include_numbers_var.get():
-            required_chars.append(secrets.choice(self.DIGITS))
-
-        if self.include_special_var.get():
-            required_chars.append(secrets.choice(self.SPECIAL))
-
-        password_list = list(password)
-        positions = secrets.SystemRandom().sample(range(length), min(len(required_chars), length))
-
-        for i, char in enumerate(required_chars[:len(positions)]):
-            password_list[positions[i]] = char
-
-        secrets.SystemRandom().shuffle(password_list)
-        password = ''.join(password_list)
+    def _policy(self) -> PasswordPolicy:
+        return PasswordPolicy(
+            length=self.length_var.get(),
+            include_numbers=self.include_numbers_var.get(),
+            include_special=self.include_special_var.get(),
+        )
 
-        self.preview_var.set(password)
+    def _generate_password(self):
+        policy = self._policy()
+        self.preview_var.set(generate_password(policy))
+        self.entropy_label.configure(text=f"{policy.entropy_bits():.0f} bits of entropy")
 
     def _on_length_changed(self, value):
         length = int(value)
@@ -261,8 +227,8 @@ class PasswordGeneratorDialog:
 
     def _on_use(self):
         self.result = self.preview_var.get()
-        self.root.destroy()
+        self._close()
 
     def _on_cancel(self):
         self.result = None
-        self.root.destroy()
+        self._close()
@@ -0,0 +1,267 @@
+import tkinter as tk
+from tkinter import messagebox
+from typing import Collection, List, Optional, Tuple
+
+import customtkinter as ctk
+
+from .. import passwords
+from ..passwords import PasswordPolicy
+from ..storage import Keybind, KeybindStore
+from . import theme
+from .dialog_pool import PooledDialog
+
+
+class PasswordRotationDialog(PooledDialog):
+
+    WIDTH = 420
+    HEIGHT = 560
+    CONFIRM_LIST_LIMIT = 15
+
+    def __init__(self, store: KeybindStore, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.result: Optional[Tuple[PasswordPolicy, List[str]]] = None
+        self.candidates: List[Keybind] = []
+
+        self.length_var = tk.IntVar(value=passwords.DEFAULT_LENGTH)
+        self.include_numbers_var = tk.BooleanVar(value=True)
+        self.include_special_var = tk.BooleanVar(value=True)
+
+    def show(
+        self,
+        candidates: List[Keybind],
+        preselected: Collection[str] = (),
+        over=None,
+    ) -> Optional[Tuple[PasswordPolicy, List[str]]]:
+        self._begin()
+        self.result = None
+        self.candidates = list(candidates)
+
+        self.keybind_listbox.delete(0, "end")
+        for index, keybind in enumerate(self.candidates):
+            label = keybind.name
+            if keybind.hotkey:
+                label += f"  ({keybind.hotkey})"
+            self.keybind_listbox.insert("end", label)
+            if keybind.id in preselected:
+                self.keybind_listbox.selection_set(index)
+        self._on_selection_changed()
+        self._update_entropy()
+
+        self._present(over=over)
+        return self.result
+
+    def _create_widgets(self):
+        self.root.title("Rotate Passwords")
+        self.root.resizable(False, False)
+        self.root.minsize(self.WIDTH, self.HEIGHT)
+        self.root.bind('<Escape>', lambda e: self._on_cancel())
+        self.root.bind('<Return>', lambda e: self._on_rotate())
+
+        frame = ctk.CTkFrame(self.root, fg_color=theme.BG_DARK)
+        frame.pack(fill="both", expand=True, padx=theme.PAD, pady=(theme.PAD, 0))
+
+        ctk.CTkLabel(
+            frame,
+            text="Rotate Passwords",
+            font=theme.FONT_HEADING,
+            text_color=theme.TEXT_PRIMARY,
+            anchor="w",
+        ).pack(anchor="w")
+
+        self.subtitle_label = ctk.CTkLabel(
+            frame,
+            text="",
+            font=theme.FONT_SMALL,
+            text_color=theme.TEXT_SECONDARY,
+            anchor="w",
+        )
+        self.subtitle_label.pack(anchor="w")
+
+        list_card = ctk.CTkFrame(frame, fg_color=theme.SURFACE, corner_radius=theme.CORNER_RADIUS)
+        list_card.pack(fill="both", expand=True, pady=(4, theme.PAD_SM))
+
+        self.keybind_listbox = tk.Listbox(
+            list_card,
+            selectmode="extended",
+            exportselection=False,
+            activestyle="none",
+            height=10,
+            bg=theme.SURFACE,
+            fg=theme.TEXT_PRIMARY,
+            selectbackground=theme.SURFACE_SELECT,
+            selectforeground=theme.TEXT_PRIMARY,
+            highlightthickness=0,
+            borderwidth=0,
+            font=theme.FONT_BODY,
+        )
+        list_scrollbar = ctk.CTkScrollbar(list_card, command=self.keybind_listbox.yview)
+        self.keybind_listbox.configure(yscrollcommand=list_scrollbar.set)
+        list_scrollbar.pack(side="right", fill="y", pady=4)
+        self.keybind_listbox.pack(side="left", fill="both", expand=True, padx=theme.PAD_SM, pady=theme.PAD_SM)
+        self.keybind_listbox.bind("<<ListboxSelect>>", lambda e: self._on_selection_changed())
+
+        select_row = ctk.CTkFrame(frame, fg_color="transparent")
+        select_row.pack(fill="x", pady=(0, theme.PAD_SM))
+
+        for text, command in (("Select All", self._select_all), ("Select None", self._select_none)):
+            ctk.CTkButton(
+                select_row, text=text,
+                command=command,
+                **theme.secondary_button_kwargs(),
+                width=90,
+                height=26,
+            ).pack(side="left", padx=(0, 4))
+
+        options_card = ctk.CTkFrame(
+            frame,
+            fg_color=theme.SURFACE,
+            corner_radius=theme.CORNER_RADIUS,
+        )
+        options_card.pack(fill="x", pady=(0, theme.PAD_SM))
+
+        options_inner = ctk.CTkFrame(options_card, fg_color="transparent")
+        options_inner.pack(fill="x", padx=theme.PAD_SM, pady=theme.PAD_SM)
+
+        length_row = ctk.CTkFrame(options_inner, fg_color="transparent")
+        length_row.pack(fill="x", pady=(0, theme.PAD_SM))
+
+        ctk.CTkLabel(
+            length_row,
+            text="Length:",
+            font=theme.FONT_SMALL,
+            text_color=theme.TEXT_SECONDARY,
+        ).pack(side="left")
+
+        self.length_label = ctk.CTkLabel(
+            length_row,
+            text=str(self.length_var.get()),
+            font=theme.FONT_BODY,
+            text_color=theme.TEXT_PRIMARY,
+            width=30,
+        )
+        self.length_label.pack(side="right")
+
+        ctk.CTkSlider(
+            length_row,
+            from_=passwords.MIN_LENGTH,
+            to=passwords.MAX_LENGTH,
+            number_of_steps=passwords.MAX_LENGTH - passwords.MIN_LENGTH,
+            variable=self.length_var,
+            command=self._on_length_changed,
+            fg_color=theme.SURFACE_HOVER,
+            progress_color=theme.ACCENT,
+            button_color=theme.ACCENT,
+            button_hover_color=theme.ACCENT_HOVER,
+        ).pack(side="right", fill="x", expand=True, padx=(theme.PAD_SM, theme.PAD_SM))
+
+        for text, variable in (
+            ("Include numbers (0-9)", self.include_numbers_var),
+            ("Include special characters (!@#$...)", self.include_special_var),
+        ):
+            ctk.CTkCheckBox(
+                options_inner,
+                text=text,
+                variable=variable,
+                command=self._update_entropy,
+                font=theme.FONT_BODY,
+                text_color=theme.TEXT_PRIMARY,
+                fg_color=theme.ACCENT,
+                hover_color=theme.ACCENT_HOVER,
+                border_color=theme.BORDER,
+                checkmark_color=theme.TEXT_PRIMARY,
+            ).pack(anchor="w", pady=(0, theme.PAD_SM))
+
+        self.entropy_label = ctk.CTkLabel(
+            frame,
+            text="",
+            font=theme.FONT_SMALL,
+            text_color=theme.TEXT_MUTED,
+            anchor="w",
+        )
+        self.entropy_label.pack(anchor="w")
+
+        btn_frame = ctk.CTkFrame(self.root, fg_color=theme.BG_DARK)
+        btn_frame.pack(fill="x", padx=theme.PAD, pady=theme.PAD)
+
+        self.rotate_btn = ctk.CTkButton(
+            btn_frame,
+            text="Rotate",
+            command=self._on_rotate,
+            **theme.danger_button_kwargs(),
+            width=100,
+        )
+        self.rotate_btn.pack(side="right")
+
+        ctk.CTkButton(
+            btn_frame,
+            text="Cancel",
+            command=self._on_cancel,
+            **theme.secondary_button_kwargs(),
+            width=80,
+        ).pack(side="right", padx=(0, theme.PAD_SM))
+
+    def _policy(self) -> PasswordPolicy:
+        return PasswordPolicy(
+            length=self.length_var.get(),
+            include_numbers=self.include_numbers_var.get(),
+            include_special=self.include_special_var.get(),
+        )
+
+    def _update_entropy(self):
+        self.entropy_label.configure(text=f"{self._policy().entropy_bits():.0f} bits of entropy per password")
+
+    def _on_length_changed(self, value):
+        self.length_label.configure(text=str(int(value)))
+        self._update_entropy()
+
+    def _selected_ids(self) -> List[str]:
+        return [self.candidates[index].id for index in self.keybind_listbox.curselection()]
+
+    def _select_all(self):
+        self.keybind_listbox.selection_set(0, "end")
+        self._on_selection_changed()
+
+    def _select_none(self):
+        self.keybind_listbox.selection_clear(0, "end")
+        self._on_selection_changed()
+
+    def _on_selection_changed(self):
+        count = len(self.keybind_listbox.curselection())
+        self.subtitle_label.configure(
+            text=f"{count} of {len(self.candidates)} keybind{'s' if len(self.candidates) != 1 else ''} selected"
+        )
+        self.rotate_btn.configure(state="normal" if count else "disabled")
+
+    def _affected_keybinds(self, keybind_ids: List[str]) -> List[Keybind]:
+        affected = dict.fromkeys(keybind_ids)
+        credential_ids = {
+            keybind.credential_id for keybind in map(self.store.get, keybind_ids)
+            if keybind is not None and keybind.credential_id
+        }
+        affected.update(dict.fromkeys(self.store.credential_users(*credential_ids)))
+        return [kb for kb in map(self.store.get, affected) if kb is not None]
+
+    def _confirm(self, keybind_ids: List[str]) -> bool:
+        affected = self._affected_keybinds(keybind_ids)
+        names = "\n".join(f"  {kb.name}" for kb in affected[:self.CONFIRM_LIST_LIMIT])
+        if len(affected) > self.CONFIRM_LIST_LIMIT:
+            names += f"\n  ...and {len(affected) - self.CONFIRM_LIST_LIMIT} more"
+        return messagebox.askyesno(
+            "Rotate Passwords",
+            f"Replace the password of {len(affected)} keybind{'s' if len(affected) != 1 else ''}?\n\n"
+            f"{names}\n\nThe current passwords cannot be recovered.",
+            icon="warning",
+            parent=self.root,
+        )
+
+    def _on_rotate(self):
+        keybind_ids = self._selected_ids()
+        if not keybind_ids or not self._confirm(keybind_ids):
+            return
+        self.result = (self._policy(), keybind_ids)
+        self._close()
+
+    def _on_cancel(self):
+        self.result = None
+        self._close()
@@ -34,6 +34,8 @@ BUTTON_HEIGHT  = 34
 PAD            = 16
 PAD_SM         = 8
 
+_icon_image = None
+
 
 def configure_appearance():
     ctk.set_appearance_mode("dark")
@@ -86,8 +88,31 @@ def entry_kwargs() -> dict:
     )
 
 
+def _shared_icon_photo(window):
+    from ..config import get_png_icon_path
+
+    root = window._root()
+    photo = getattr(root, '_quickkeys_icon_photo', None)
+    if photo is not None:
+        return photo
+
+    global _icon_image
+    if _icon_image is None:
+        png_path = get_png_icon_path()
+        if not png_path:
+            return None
+        from PIL import Image
+        with Image.open(png_path) as img:
+            _icon_image = img.copy()
+
+    from PIL import ImageTk
+    photo = ImageTk.PhotoImage(_icon_image, master=root)
+    root._quickkeys_icon_photo = photo
+    return photo
+
+
 def set_window_icon(window) -> None:
-    from ..config import get_icon_path, get_png_icon_path
+    from ..config import get_icon_path
 
     def _apply():
         ico_path = get_icon_path()
@@ -98,15 +123,11 @@ def set_window_icon(window) -> None:
             except Exception:
                 pass
 
-        png_path = get_png_icon_path()
-        if png_path:
-            try:
-                from PIL import Image, ImageTk
-                img = Image.open(png_path)
-                photo = ImageTk.PhotoImage(img)
+        try:
+            photo = _shared_icon_photo(window)
+            if photo is not None:
                 window.iconphoto(True, photo)
-                window._icon_photo = photo
-            except Exception:
-                pass
+        except Exception:
+            pass
 
     window.after(150, _apply)
@@ -0,0 +1,54 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from ..events import EventBus, append_items
+
+
+class TkWorker:
+
+    def __init__(self, events: EventBus, max_workers: int = 1):
+        self.events = events
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="quickkeys-worker"
+        )
+        self._topic = f"worker-{id(self)}"
+        self._pending = 0
+        events.subscribe(self._topic, self._on_completions, merge=append_items)
+
+    @property
+    def busy(self) -> bool:
+        return self._pending > 0
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        on_done: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+    ) -> Future:
+        self._pending += 1
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(
+            lambda done: self.events.post(self._topic, [(done, on_done, on_error)])
+        )
+        return future
+
+    def _on_completions(self, completions) -> None:
+        for future, on_done, on_error in completions:
+            self._pending -= 1
+            error = future.exception()
+            try:
+                if error is None:
+                    if on_done:
+                        on_done(future.result())
+                elif on_error:
+                    on_error(error)
+                else:
+                    print(f"Background task failed: {error}")
+            except Exception as e:
+                print(f"Background task callback failed: {e}")
+
+    def shutdown(self) -> None:
+        self.events.unsubscribe(self._topic)
+        self._executor.shutdown(wait=False)
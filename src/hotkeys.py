@@ -72,17 +72,18 @@ class HotkeyManager:
 
         return '+'.join(normalized)
 
-    def register(self, hotkey: str, callback: Callable) -> bool:
+    def register(self, hotkey: str, callback: Callable, restart: bool = True) -> bool:
         with self._lock:
             pynput_hotkey = self.parse_hotkey(hotkey)
 
             self.hotkeys[pynput_hotkey] = callback
             self.original_hotkeys[pynput_hotkey] = hotkey
 
-            self._restart_listener()
+            if restart:
+                self._restart_listener()
             return True
 
-    def unregister(self, hotkey: str) -> bool:
+    def unregister(self, hotkey: str, restart: bool = True) -> bool:
         with self._lock:
             pynput_hotkey = self.parse_hotkey(hotkey)
 
@@ -91,7 +92,8 @@ class HotkeyManager:
                 if pynput_hotkey in self.original_hotkeys:
                     del self.original_hotkeys[pynput_hotkey]
 
-                self._restart_listener()
+                if restart:
+                    self._restart_listener()
                 return True
 
             return False
@@ -118,8 +120,7 @@ class HotkeyManager:
 
     def start(self) -> None:
         with self._lock:
-            if self.hotkeys:
-                self._restart_listener()
+            self._restart_listener()
 
     def stop(self) -> None:
         with self._lock:
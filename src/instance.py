@@ -0,0 +1,161 @@
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from .ipc import IpcError, recv_message, send_message
+
+
+LOCK_FILE_NAME = "instance.lock"
+SOCKET_FILE_NAME = "instance.sock"
+CONNECT_TIMEOUT = 0.5
+HANDOFF_RETRY_SECONDS = 1.0
+HANDOFF_RETRY_INTERVAL = 0.05
+
+
+def _use_abstract_socket() -> bool:
+    return sys.platform.startswith('linux')
+
+
+def _socket_address(data_dir: Path) -> str:
+    if _use_abstract_socket():
+        return f"\0quickkeys-{os.getuid()}"
+    return str(data_dir / SOCKET_FILE_NAME)
+
+
+class InstanceLock:
+
+    def __init__(self, data_dir: Path):
+        self.data_dir = data_dir
+        self.lock_path = data_dir / LOCK_FILE_NAME
+        self._file = None
+
+    def acquire(self) -> bool:
+        lock_file = open(self.lock_path, 'a+b')
+        try:
+            if os.name == 'nt':
+                import msvcrt
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(os.getpid()).encode('ascii'))
+        lock_file.flush()
+        self._file = lock_file
+        return True
+
+    def release(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class InstanceServer:
+
+    def __init__(self, data_dir: Path, handler: Callable[[Dict[str, Any]], Any]):
+        self.data_dir = data_dir
+        self.handler = handler
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> bool:
+        if not hasattr(socket, 'AF_UNIX'):
+            return False
+
+        address = _socket_address(self.data_dir)
+        if not _use_abstract_socket():
+            try:
+                os.unlink(address)
+            except OSError:
+                pass
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            old_umask = os.umask(0o177)
+            try:
+                sock.bind(address)
+            finally:
+                os.umask(old_umask)
+            sock.listen(4)
+        except OSError as e:
+            sock.close()
+            print(f"Failed to listen for other instances: {e}")
+            return False
+
+        self._sock = sock
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._sock.close()
+            self._sock = None
+
+    @staticmethod
+    def _is_same_user(conn: socket.socket) -> bool:
+        if not hasattr(socket, 'SO_PEERCRED'):
+            return True
+        creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+        _, uid, _ = struct.unpack('3i', creds)
+        return uid == os.getuid()
+
+    def _serve(self) -> None:
+        while self._sock is not None:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+
+            with conn:
+                conn.settimeout(CONNECT_TIMEOUT)
+                try:
+                    if not self._is_same_user(conn):
+                        continue
+                    message = recv_message(conn)
+                    if message is None:
+                        continue
+                    try:
+                        response = {'ok': True, 'result': self.handler(message)}
+                    except Exception as e:
+                        response = {'ok': False, 'error': str(e)}
+                    send_message(conn, response)
+                except (IpcError, OSError):
+                    continue
+
+
+def hand_off(data_dir: Path, command: str, **params) -> Optional[Dict[str, Any]]:
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+
+    address = _socket_address(data_dir)
+    deadline = time.monotonic() + HANDOFF_RETRY_SECONDS
+
+    while True:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(address)
+            send_message(sock, {'command': command, **params})
+            return recv_message(sock)
+        except (IpcError, OSError):
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(HANDOFF_RETRY_INTERVAL)
+        finally:
+            sock.close()
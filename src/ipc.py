@@ -0,0 +1,110 @@
+import json
+import os
+import socket
+import struct
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+# Each frame is a 4-byte big-endian payload length followed by a UTF-8 JSON object.
+HEADER = struct.Struct('>I')
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+SOCKET_NAME = "quickkeys.sock"
+
+
+class IpcError(Exception):
+    pass
+
+
+def default_socket_path(data_dir: Path) -> Path:
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return Path(runtime_dir) / SOCKET_NAME
+    return data_dir / SOCKET_NAME
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if count == 0:
+            if received == 0:
+                return None
+            raise IpcError("Connection closed mid-frame")
+        received += count
+    return bytes(buffer)
+
+
+def send_message(sock: socket.socket, message: Dict[str, Any]) -> None:
+    payload = json.dumps(message, separators=(',', ':')).encode('utf-8')
+    if len(payload) > MAX_FRAME_BYTES:
+        raise IpcError("Message too large")
+    sock.sendall(HEADER.pack(len(payload)) + payload)
+
+
+def recv_message(sock: socket.socket) -> Optional[Dict[str, Any]]:
+    header = _recv_exact(sock, HEADER.size)
+    if header is None:
+        return None
+
+    (length,) = HEADER.unpack(header)
+    if length > MAX_FRAME_BYTES:
+        raise IpcError("Message too large")
+
+    payload = _recv_exact(sock, length) if length else b''
+    if payload is None:
+        raise IpcError("Connection closed mid-frame")
+
+    try:
+        message = json.loads(payload.decode('utf-8'))
+    except ValueError as e:
+        raise IpcError(f"Invalid message: {e}")
+
+    if not isinstance(message, dict):
+        raise IpcError("Message must be an object")
+    return message
+
+
+class IpcClient:
+
+    def __init__(self, socket_path: Path, timeout: Optional[float] = 10.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+
+    def connect(self) -> None:
+        if self._sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(str(self.socket_path))
+            except OSError:
+                sock.close()
+                raise
+            self._sock = sock
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def request(self, command: str, **params) -> Any:
+        self.connect()
+        send_message(self._sock, {'command': command, **params})
+
+        response = recv_message(self._sock)
+        if response is None:
+            self.close()
+            raise IpcError("Daemon closed the connection")
+        if not response.get('ok'):
+            raise IpcError(response.get('error', "Request failed"))
+        return response.get('result')
+
+    def __enter__(self) -> "IpcClient":
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
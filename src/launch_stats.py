@@ -0,0 +1,122 @@
+import hashlib
+import json
+import math
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+
+@dataclass
+class LaunchSummary:
+
+    ewma: float
+    p95: float
+    count: int
+
+
+class LaunchStats:
+
+    FILE_NAME = "launch_stats.json"
+
+    MAX_SAMPLES = 32
+    MIN_SAMPLES = 3
+    EWMA_ALPHA = 0.3
+    HEADROOM = 1.25
+    MIN_LEARNED_WAIT = 0.25
+    MAX_LEARNED_WAIT = 30.0
+    SAVE_DELAY = 5.0
+
+    def __init__(self, data_dir: Path):
+        self.data_path = data_dir / self.FILE_NAME
+        self._entries: Optional[Dict[str, dict]] = None
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+
+    @staticmethod
+    def _key(program_path: str) -> str:
+        return hashlib.sha256(program_path.encode('utf-8')).hexdigest()
+
+    def _load(self) -> Dict[str, dict]:
+        if self._entries is None:
+            try:
+                data = json.loads(self.data_path.read_text(encoding='utf-8'))
+                self._entries = data.get('programs', {})
+            except (OSError, ValueError, AttributeError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self) -> None:
+        tmp_path = self.data_path.with_suffix('.tmp')
+        try:
+            tmp_path.write_text(
+                json.dumps({'programs': self._entries}),
+                encoding='utf-8'
+            )
+            os.replace(tmp_path, self.data_path)
+        except OSError as e:
+            print(f"Failed to save launch stats: {e}")
+
+    def _schedule_save(self) -> None:
+        self._dirty = True
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(self.SAVE_DELAY, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if self._dirty:
+                self._dirty = False
+                self._save()
+
+    def record(self, program_path: str, seconds: float) -> None:
+        with self._lock:
+            entries = self._load()
+            entry = entries.setdefault(self._key(program_path), {})
+
+            entry['ewma'] = (
+                self.EWMA_ALPHA * seconds +
+                (1 - self.EWMA_ALPHA) * entry.get('ewma', seconds)
+            )
+            entry['samples'] = (entry.get('samples', []) + [round(seconds, 3)])[-self.MAX_SAMPLES:]
+
+            self._schedule_save()
+
+    def record_fire(self, program_path: str) -> None:
+        with self._lock:
+            entry = self._load().setdefault(self._key(program_path), {})
+            entry['fires'] = entry.get('fires', 0) + 1
+            self._schedule_save()
+
+    def fire_count(self, program_path: str) -> int:
+        with self._lock:
+            entry = self._load().get(self._key(program_path))
+        return entry.get('fires', 0) if entry else 0
+
+    def summary(self, program_path: str) -> Optional[LaunchSummary]:
+        with self._lock:
+            entry = self._load().get(self._key(program_path))
+
+        if not entry or not entry.get('samples'):
+            return None
+
+        samples = sorted(entry['samples'])
+        index = max(0, math.ceil(0.95 * len(samples)) - 1)
+        return LaunchSummary(
+            ewma=entry['ewma'],
+            p95=samples[index],
+            count=len(samples),
+        )
+
+    def learned_wait(self, program_path: str) -> Optional[float]:
+        summary = self.summary(program_path)
+        if summary is None or summary.count < self.MIN_SAMPLES:
+            return None
+        wait = max(summary.ewma, summary.p95) * self.HEADROOM
+        return min(max(wait, self.MIN_LEARNED_WAIT), self.MAX_LEARNED_WAIT)
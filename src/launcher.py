@@ -1,16 +1,97 @@
 import os
 import platform
 import shlex
+import shutil
 import subprocess
+import threading
 import time
+from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Deque, List, Optional
+
+from .readiness import ReadinessProbe, wait_until_ready
+from .supervisor import ProcessSupervisor
+
+
+@dataclass
+class PreparedLaunch:
+
+    program_path: str
+    executable: str
+    argv: List[str]
+    cwd: Optional[str]
+    mtime_ns: Optional[int]
+
+    def is_stale(self) -> bool:
+        try:
+            mtime_ns = os.stat(self.executable).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        return mtime_ns != self.mtime_ns
+
+
+class SpawnedProcess:
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.returncode: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def poll(self) -> Optional[int]:
+        with self._lock:
+            if self.returncode is None:
+                try:
+                    pid, status = os.waitpid(self.pid, os.WNOHANG)
+                except ChildProcessError:
+                    self.returncode = -1
+                else:
+                    if pid == self.pid:
+                        self.returncode = os.waitstatus_to_exitcode(status)
+            return self.returncode
+
+
+@dataclass
+class LaunchResult:
+
+    program_path: str
+    backend: str = ""
+    process: Optional[object] = None
+    spawn_seconds: float = 0.0
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.process is not None
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid if self.process is not None else None
 
 
 class Launcher:
 
-    def __init__(self):
+    BACKENDS = ('auto', 'popen', 'posix_spawn')
+    MAX_RESULTS = 64
+
+    def __init__(
+        self,
+        supervisor: Optional[ProcessSupervisor] = None,
+        backend: str = 'auto'
+    ):
         self.system = platform.system()
+        self.supervisor = supervisor or ProcessSupervisor()
+        self.backend = backend if backend in self.BACKENDS else 'auto'
+        self.results: Deque[LaunchResult] = deque(maxlen=self.MAX_RESULTS)
+
+        self._spawn_env = dict(os.environ)
+        self._spawn_file_actions = []
+        if hasattr(os, 'posix_spawn'):
+            self._spawn_file_actions = [
+                (os.POSIX_SPAWN_OPEN, 0, os.devnull, os.O_RDONLY, 0),
+                (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+                (os.POSIX_SPAWN_OPEN, 2, os.devnull, os.O_WRONLY, 0),
+            ]
 
     def _parse_args(self, args_string: str) -> List[str]:
         if not args_string:
@@ -28,59 +109,169 @@ class Launcher:
         path = os.path.expandvars(path)
         return path
 
+    def _find_executable(self, resolved_path: str) -> str:
+        if os.sep not in resolved_path and (os.altsep is None or os.altsep not in resolved_path):
+            found = shutil.which(resolved_path)
+            if found:
+                return os.path.abspath(found)
+        return os.path.abspath(resolved_path)
+
+    def prepare(
+        self,
+        program_path: str,
+        args: List[str],
+        working_dir: Optional[str] = None
+    ) -> PreparedLaunch:
+        executable = self._find_executable(self._resolve_path(program_path))
+
+        try:
+            mtime_ns = os.stat(executable).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+
+        cwd = None
+        if working_dir:
+            cwd = self._resolve_path(working_dir)
+        elif mtime_ns is not None and os.path.dirname(program_path):
+            cwd = os.path.dirname(executable)
+
+        return PreparedLaunch(
+            program_path=program_path,
+            executable=executable,
+            argv=[executable] + list(args),
+            cwd=cwd,
+            mtime_ns=mtime_ns,
+        )
+
     def launch(
         self,
         program_path: str,
         args: str = "",
         working_dir: Optional[str] = None
-    ) -> Optional[subprocess.Popen]:
+    ) -> LaunchResult:
+        return self.launch_argv(program_path, self._parse_args(args), working_dir)
+
+    def launch_argv(
+        self,
+        program_path: str,
+        args: List[str],
+        working_dir: Optional[str] = None
+    ) -> LaunchResult:
         try:
-            resolved_path = self._resolve_path(program_path)
-            parsed_args = self._parse_args(args)
+            prepared = self.prepare(program_path, args, working_dir)
+        except Exception as e:
+            result = LaunchResult(program_path=program_path, error=str(e))
+            self.results.append(result)
+            return result
 
-            command = [resolved_path] + parsed_args
+        return self.launch_prepared(prepared)
 
-            cwd = None
-            if working_dir:
-                cwd = self._resolve_path(working_dir)
-            elif Path(resolved_path).exists():
-                cwd = str(Path(resolved_path).parent)
+    def _can_posix_spawn(self, prepared: PreparedLaunch) -> bool:
+        if self.backend == 'popen' or not self._spawn_file_actions:
+            return False
+        return prepared.cwd is None or prepared.cwd == os.getcwd()
 
-            kwargs = {
-                'cwd': cwd,
-                'stdout': subprocess.DEVNULL,
-                'stderr': subprocess.DEVNULL,
-            }
+    def _posix_spawn(self, prepared: PreparedLaunch) -> SpawnedProcess:
+        pid = os.posix_spawn(
+            prepared.executable,
+            prepared.argv,
+            self._spawn_env,
+            file_actions=self._spawn_file_actions,
+            setsid=True,
+        )
+        return SpawnedProcess(pid)
 
-            if self.system == "Windows":
-                kwargs['creationflags'] = (
-                    subprocess.CREATE_NO_WINDOW |
-                    subprocess.DETACHED_PROCESS
-                )
-            else:
-                kwargs['start_new_session'] = True
+    def _popen(self, prepared: PreparedLaunch) -> subprocess.Popen:
+        kwargs = {
+            'cwd': prepared.cwd,
+            'stdout': subprocess.DEVNULL,
+            'stderr': subprocess.DEVNULL,
+        }
+
+        if self.system == "Windows":
+            kwargs['creationflags'] = (
+                subprocess.CREATE_NO_WINDOW |
+                subprocess.DETACHED_PROCESS
+            )
+        else:
+            kwargs['start_new_session'] = True
+
+        return subprocess.Popen(prepared.argv, **kwargs)
+
+    def launch_prepared(self, prepared: PreparedLaunch) -> LaunchResult:
+        result = LaunchResult(program_path=prepared.program_path)
+        start = time.perf_counter()
 
-            process = subprocess.Popen(command, **kwargs)
-            return process
+        try:
+            if self._can_posix_spawn(prepared):
+                try:
+                    result.backend = 'posix_spawn'
+                    result.process = self._posix_spawn(prepared)
+                except NotImplementedError:
+                    self._spawn_file_actions = []
+
+            if result.process is None:
+                result.backend = 'popen'
+                result.process = self._popen(prepared)
+
+            result.spawn_seconds = time.perf_counter() - start
+            self.supervisor.track(result.process, prepared.program_path, prepared.executable)
 
         except Exception as e:
-            print(f"Failed to launch {program_path}: {e}")
-            return None
+            result.spawn_seconds = time.perf_counter() - start
+            result.error = f"{type(e).__name__}: {e}"
+
+        self.results.append(result)
+        return result
 
     def launch_and_wait(
         self,
         program_path: str,
         args: str = "",
         wait_seconds: float = 2.0,
-        working_dir: Optional[str] = None
+        working_dir: Optional[str] = None,
+        probes: Optional[List[ReadinessProbe]] = None
     ) -> bool:
-        process = self.launch(program_path, args, working_dir)
+        result = self.launch(program_path, args, working_dir)
+        return self.wait_ready(result, wait_seconds, probes)
 
-        if process is None:
+    def launch_prepared_and_wait(
+        self,
+        prepared: PreparedLaunch,
+        wait_seconds: float = 2.0,
+        probes: Optional[List[ReadinessProbe]] = None,
+        on_ready: Optional[Callable[[float], None]] = None
+    ) -> bool:
+        result = self.launch_prepared(prepared)
+        return self.wait_ready(result, wait_seconds, probes, on_ready)
+
+    def wait_ready(
+        self,
+        result: LaunchResult,
+        wait_seconds: float,
+        probes: Optional[List[ReadinessProbe]] = None,
+        on_ready: Optional[Callable[[float], None]] = None,
+        on_timeout: Optional[Callable[[float], None]] = None,
+        measure: Optional[List[ReadinessProbe]] = None
+    ) -> bool:
+        if not result.ok:
             return False
 
-        if wait_seconds > 0:
-            time.sleep(wait_seconds)
+        process = result.process
+        start = time.perf_counter()
+
+        if probes or measure:
+            ready_after = wait_until_ready(process, probes or measure, wait_seconds)
+            if ready_after is not None:
+                if on_ready is not None:
+                    on_ready(ready_after)
+            elif on_timeout is not None and process.poll() is None:
+                on_timeout(wait_seconds)
+
+        if not probes:
+            remaining = wait_seconds - (time.perf_counter() - start)
+            if remaining > 0:
+                time.sleep(remaining)
 
         if process.poll() is not None:
             return False
@@ -0,0 +1,241 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from pynput.keyboard import HotKey
+
+from . import windowing
+from .clipboard import ClipboardBackup, ClipboardManager
+from .hotkeys import HotkeyManager
+from .launcher import Launcher, PreparedLaunch
+
+
+STEP_KINDS = (
+    'type',
+    'paste',
+    'key',
+    'wait',
+    'wait_window',
+    'launch',
+    'clipboard_restore',
+)
+
+DEFAULT_WINDOW_TIMEOUT = 10.0
+WINDOW_POLL_INTERVAL = 0.05
+STEP_GAP = 0.05
+
+_hotkey_parser = HotkeyManager()
+
+
+class MacroError(ValueError):
+    pass
+
+
+@dataclass
+class _CompiledStep:
+
+    kind: str
+    delay: float = 0.0
+    action: Optional[Callable[[ClipboardBackup], bool]] = None
+
+
+def parse_script(script: str) -> List[Dict[str, str]]:
+    steps = []
+
+    for line_no, raw_line in enumerate(script.splitlines(), start=1):
+        line = raw_line.strip()
+        if not line or line.startswith('#'):
+            continue
+
+        kind, _, value = line.partition(' ')
+        kind = kind.lower()
+        if kind not in STEP_KINDS:
+            raise MacroError(f"Line {line_no}: unknown step '{kind}'")
+
+        steps.append({'kind': kind, 'value': value.strip()})
+
+    return steps
+
+
+def format_script(steps: List[Dict[str, str]]) -> str:
+    lines = []
+    for step in steps:
+        value = step.get('value', '')
+        lines.append(f"{step['kind']} {value}".rstrip())
+    return '\n'.join(lines)
+
+
+def _parse_wait(value: str) -> float:
+    try:
+        seconds = float(value)
+    except ValueError:
+        raise MacroError(f"Invalid wait duration '{value}'")
+
+    if seconds < 0:
+        raise MacroError("Wait duration must not be negative")
+    return seconds
+
+
+def _parse_window_target(value: str):
+    title, timeout = value, DEFAULT_WINDOW_TIMEOUT
+
+    head, sep, tail = value.rpartition('@')
+    if sep:
+        try:
+            timeout = float(tail.strip())
+            title = head.strip()
+        except ValueError:
+            pass
+
+    if not title:
+        raise MacroError("wait_window needs a window title")
+    if timeout < 0:
+        raise MacroError("wait_window timeout must not be negative")
+    return title, timeout
+
+
+def _parse_keys(value: str) -> List:
+    if not value:
+        raise MacroError("key step needs a key combination")
+
+    try:
+        return HotKey.parse(_hotkey_parser.parse_hotkey(value))
+    except ValueError:
+        raise MacroError(f"Invalid key combination '{value}'")
+
+
+def validate_steps(steps: List[Dict[str, str]]) -> None:
+    if not steps:
+        raise MacroError("Macro has no steps")
+
+    for index, step in enumerate(steps, start=1):
+        kind = step.get('kind')
+        value = step.get('value', '')
+
+        try:
+            if kind not in STEP_KINDS:
+                raise MacroError(f"unknown step '{kind}'")
+            elif kind == 'wait':
+                _parse_wait(value)
+            elif kind == 'wait_window':
+                _parse_window_target(value)
+            elif kind == 'key':
+                _parse_keys(value)
+        except MacroError as e:
+            raise MacroError(f"Step {index}: {e}")
+
+
+def _sleep_until(deadline: float) -> None:
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return
+        if remaining > 0.002:
+            time.sleep(remaining - 0.001)
+        else:
+            time.sleep(0)
+
+
+class MacroPlan:
+
+    def __init__(self, name: str, steps: List[_CompiledStep], launches: List[PreparedLaunch]):
+        self.name = name
+        self.steps = steps
+        self.launches = launches
+
+    def run(self, backup: ClipboardBackup) -> bool:
+        with backup:
+            deadline = time.perf_counter()
+
+            for step in self.steps:
+                if step.action is None:
+                    deadline += step.delay
+                    _sleep_until(deadline)
+                    continue
+
+                if step.action(backup) is False:
+                    print(f"Macro {self.name} stopped at '{step.kind}' step")
+                    return False
+
+                deadline = time.perf_counter() + step.delay
+                _sleep_until(deadline)
+
+        return True
+
+
+def _substitute(text: str, keybind) -> str:
+    return (
+        text.replace('{username}', keybind.username)
+        .replace('{password}', keybind.password)
+        .replace('{custom_text}', keybind.custom_text)
+    )
+
+
+def _wait_for_window(title: str, timeout: float) -> bool:
+    deadline = time.perf_counter() + timeout
+    while True:
+        if windowing.find_window(title) is not None:
+            return True
+        if time.perf_counter() >= deadline:
+            return False
+        time.sleep(WINDOW_POLL_INTERVAL)
+
+
+def compile_macro(keybind, clipboard: ClipboardManager, launcher: Launcher) -> MacroPlan:
+    validate_steps(keybind.macro_steps)
+
+    compiled: List[_CompiledStep] = []
+    launches: List[PreparedLaunch] = []
+
+    for step in keybind.macro_steps:
+        kind = step['kind']
+        value = step.get('value', '')
+
+        if kind == 'wait':
+            compiled.append(_CompiledStep(kind, delay=_parse_wait(value)))
+
+        elif kind == 'type':
+            text = _substitute(value, keybind)
+            compiled.append(_CompiledStep(
+                kind, STEP_GAP, lambda backup, t=text: clipboard.type_text(t)
+            ))
+
+        elif kind == 'paste':
+            text = _substitute(value, keybind)
+            compiled.append(_CompiledStep(
+                kind, STEP_GAP, lambda backup, t=text: clipboard.paste_text(t)
+            ))
+
+        elif kind == 'key':
+            keys = _parse_keys(value)
+            compiled.append(_CompiledStep(
+                kind, STEP_GAP, lambda backup, k=keys: clipboard.press_keys(k)
+            ))
+
+        elif kind == 'wait_window':
+            title, timeout = _parse_window_target(value)
+            compiled.append(_CompiledStep(
+                kind, 0.0, lambda backup, t=title, s=timeout: _wait_for_window(t, s)
+            ))
+
+        elif kind == 'launch':
+            if value:
+                parts = launcher._parse_args(value)
+                path, args = parts[0], parts[1:]
+            else:
+                path, args = keybind.program_path, launcher._parse_args(keybind.program_args)
+
+            if not path:
+                raise MacroError("launch step needs a program path")
+
+            prepared = launcher.prepare(path, args)
+            launches.append(prepared)
+            compiled.append(_CompiledStep(
+                kind, 0.0,
+                lambda backup, p=prepared: launcher.launch_prepared(p).ok
+            ))
+
+        elif kind == 'clipboard_restore':
+            compiled.append(_CompiledStep(kind, STEP_GAP, lambda backup: backup.restore()))
+
+    return MacroPlan(keybind.name, compiled, launches)
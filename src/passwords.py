@@ -0,0 +1,127 @@
+import math
+import secrets
+import string
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from itertools import combinations
+from typing import FrozenSet, List, Tuple
+
+from .storage import KeybindStore
+
+
+LOWERCASE = string.ascii_lowercase
+UPPERCASE = string.ascii_uppercase
+DIGITS = string.digits
+SPECIAL = "!@#$%^&*()_+-=[]{}|;:,.<>?"
+
+MIN_LENGTH = 8
+MAX_LENGTH = 64
+DEFAULT_LENGTH = 20
+
+
+@dataclass(frozen=True)
+class PasswordPolicy:
+    length: int = DEFAULT_LENGTH
+    include_numbers: bool = True
+    include_special: bool = True
+
+    @property
+    def classes(self) -> Tuple[str, ...]:
+        classes = [LOWERCASE, UPPERCASE]
+        if self.include_numbers:
+            classes.append(DIGITS)
+        if self.include_special:
+            classes.append(SPECIAL)
+        return tuple(classes)
+
+    @property
+    def charset(self) -> str:
+        return "".join(self.classes)
+
+    def validate(self) -> None:
+        if not MIN_LENGTH <= self.length <= MAX_LENGTH:
+            raise ValueError(f"Password length must be between {MIN_LENGTH} and {MAX_LENGTH}")
+
+    def entropy_bits(self) -> float:
+        return _entropy_bits(self)
+
+
+@lru_cache(maxsize=None)
+def _entropy_bits(policy: PasswordPolicy) -> float:
+    sizes = [len(chars) for chars in policy.classes]
+    total = sum(sizes)
+    valid = 0
+    for excluded in range(len(sizes) + 1):
+        sign = -1 if excluded % 2 else 1
+        for subset in combinations(sizes, excluded):
+            valid += sign * (total - sum(subset)) ** policy.length
+    return math.log2(valid)
+
+
+@lru_cache(maxsize=None)
+def _byte_table(charset: str) -> Tuple[bytes, bytes]:
+    limit = 256 - 256 % len(charset)
+    table = bytes(ord(charset[b % len(charset)]) if b < limit else 0 for b in range(256))
+    return table, bytes(range(limit, 256))
+
+
+@lru_cache(maxsize=None)
+def _required_sets(policy: PasswordPolicy) -> Tuple[FrozenSet[str], ...]:
+    return tuple(frozenset(chars) for chars in policy.classes)
+
+
+def generate_passwords(policy: PasswordPolicy, count: int) -> List[str]:
+    policy.validate()
+    table, rejected = _byte_table(policy.charset)
+    accept_rate = (256 - len(rejected)) / 256
+    required = _required_sets(policy)
+    length = policy.length
+
+    passwords: List[str] = []
+    pool = ""
+    while len(passwords) < count:
+        wanted = (count - len(passwords)) * length
+        pool += secrets.token_bytes(int(wanted / accept_rate) + length).translate(table, rejected).decode("ascii")
+
+        end = len(pool) - len(pool) % length
+        for start in range(0, end, length):
+            candidate = pool[start:start + length]
+            if all(not chars.isdisjoint(candidate) for chars in required):
+                passwords.append(candidate)
+                if len(passwords) == count:
+                    break
+        pool = pool[end:]
+
+    return passwords
+
+
+def generate_password(policy: PasswordPolicy) -> str:
+    return generate_passwords(policy, 1)[0]
+
+
+def rotate_passwords(store: KeybindStore, keybind_ids: List[str], policy: PasswordPolicy) -> List[str]:
+    keybinds = []
+    credential_ids: List[str] = []
+    for keybind in map(store.get, keybind_ids):
+        if keybind is None:
+            continue
+        credential = store.get_credential(keybind.credential_id) if keybind.credential_id else None
+        if credential is not None:
+            if credential.password and credential.id not in credential_ids:
+                credential_ids.append(credential.id)
+        elif keybind.password:
+            keybinds.append(keybind)
+
+    if not keybinds and not credential_ids:
+        return []
+
+    passwords = generate_passwords(policy, len(keybinds) + len(credential_ids))
+    credentials = [
+        replace(store.get_credential(credential_id), password=password)
+        for credential_id, password in zip(credential_ids, passwords[len(keybinds):])
+    ]
+    store.update_many(
+        [replace(kb, password=password) for kb, password in zip(keybinds, passwords)],
+        credentials,
+    )
+    return [kb.id for kb in keybinds] + store.credential_users(*credential_ids)
@@ -0,0 +1,262 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .launch_stats import LaunchStats
+from .settings import AppSettings
+
+
+@dataclass
+class PrewarmStats:
+
+    runs: int
+    bytes_warmed: int
+    hits: int
+    misses: int
+    hit_mean: Optional[float]
+    miss_mean: Optional[float]
+
+
+class Prewarmer:
+
+    FILE_NAME = "prewarm.json"
+
+    CHECK_INTERVAL = 15.0
+    IDLE_SECONDS = 60.0
+    REWARM_INTERVAL = 600.0
+    LEARN_DELAY = 5.0
+    MAX_LOAD_PER_CPU = 0.5
+    MEM_AVAILABLE_FRACTION = 0.1
+    IO_BYTES_PER_SECOND = 32 * 1024 * 1024
+    CHUNK_SIZE = 1024 * 1024
+    MAX_LATENCY_SAMPLES = 64
+
+    def __init__(self, data_dir: Path, settings: AppSettings, launch_stats: LaunchStats):
+        self.data_path = data_dir / self.FILE_NAME
+        self.settings = settings
+        self.launch_stats = launch_stats
+
+        self._candidates: Callable[[], Iterable[Tuple[str, str]]] = lambda: ()
+        self._libraries: Optional[Dict[str, List[str]]] = None
+        self._pending: List[Tuple[float, str, int]] = []
+        self._warmed: Dict[str, float] = {}
+        self._hit_latencies: List[float] = []
+        self._miss_latencies: List[float] = []
+        self._runs = 0
+        self._bytes_warmed = 0
+        self._last_activity = time.monotonic()
+        self._last_warm = float('-inf')
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _key(program_path: str) -> str:
+        return hashlib.sha256(program_path.encode('utf-8')).hexdigest()
+
+    def start(self, candidates: Callable[[], Iterable[Tuple[str, str]]]) -> None:
+        self._candidates = candidates
+        if self._thread is None:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._thread = None
+
+    def note_activity(self) -> None:
+        self._last_activity = time.monotonic()
+
+    def observe(self, program_path: str, pid: Optional[int]) -> None:
+        if pid is None:
+            return
+        with self._lock:
+            self._pending.append((time.monotonic(), program_path, pid))
+
+    def record_launch(self, program_path: str, seconds: float) -> None:
+        with self._lock:
+            warmed_at = self._warmed.get(program_path)
+            is_hit = (
+                warmed_at is not None and
+                time.monotonic() - warmed_at < self.REWARM_INTERVAL * 2
+            )
+            samples = self._hit_latencies if is_hit else self._miss_latencies
+            samples.append(seconds)
+            del samples[:-self.MAX_LATENCY_SAMPLES]
+
+    def stats(self) -> PrewarmStats:
+        with self._lock:
+            hits = list(self._hit_latencies)
+            misses = list(self._miss_latencies)
+            return PrewarmStats(
+                runs=self._runs,
+                bytes_warmed=self._bytes_warmed,
+                hits=len(hits),
+                misses=len(misses),
+                hit_mean=sum(hits) / len(hits) if hits else None,
+                miss_mean=sum(misses) / len(misses) if misses else None,
+            )
+
+    def _load_libraries(self) -> Dict[str, List[str]]:
+        if self._libraries is None:
+            try:
+                data = json.loads(self.data_path.read_text(encoding='utf-8'))
+                self._libraries = data.get('libraries', {})
+            except (OSError, ValueError, AttributeError):
+                self._libraries = {}
+        return self._libraries
+
+    def _save_libraries(self) -> None:
+        tmp_path = self.data_path.with_suffix('.tmp')
+        try:
+            tmp_path.write_text(
+                json.dumps({'libraries': self._libraries}),
+                encoding='utf-8'
+            )
+            os.replace(tmp_path, self.data_path)
+        except OSError as e:
+            print(f"Failed to save prewarm data: {e}")
+
+    @staticmethod
+    def _mapped_files(pid: int) -> List[str]:
+        paths: List[str] = []
+        try:
+            with open(f"/proc/{pid}/maps", encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    parts = line.split(None, 5)
+                    if len(parts) < 6:
+                        continue
+                    path = parts[5].strip()
+                    if path.startswith('/') and not path.startswith(('/dev/', '/memfd:')) and path not in paths:
+                        paths.append(path)
+        except OSError:
+            pass
+        return paths
+
+    def _learn_pending(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            ready = [item for item in self._pending if now - item[0] >= self.LEARN_DELAY]
+            self._pending = [item for item in self._pending if now - item[0] < self.LEARN_DELAY]
+
+        if not ready:
+            return
+
+        libraries = self._load_libraries()
+        changed = False
+        for _, program_path, pid in ready:
+            paths = self._mapped_files(pid)
+            if paths:
+                libraries[self._key(program_path)] = paths
+                changed = True
+
+        if changed:
+            self._save_libraries()
+
+    @staticmethod
+    def _load_is_low() -> bool:
+        try:
+            load = os.getloadavg()[0]
+        except (AttributeError, OSError):
+            return True
+        return load < (os.cpu_count() or 1) * Prewarmer.MAX_LOAD_PER_CPU
+
+    def _memory_budget(self) -> int:
+        budget = self.settings.prewarm_max_bytes
+        try:
+            with open("/proc/meminfo", encoding='utf-8') as f:
+                for line in f:
+                    if line.startswith("MemAvailable:"):
+                        available = int(line.split()[1]) * 1024
+                        budget = min(budget, int(available * self.MEM_AVAILABLE_FRACTION))
+                        break
+        except (OSError, ValueError, IndexError):
+            pass
+        return budget
+
+    def _is_idle(self) -> bool:
+        now = time.monotonic()
+        return (
+            now - self._last_activity >= self.IDLE_SECONDS and
+            now - self._last_warm >= self.REWARM_INTERVAL and
+            self._load_is_low()
+        )
+
+    def _ranked_candidates(self) -> List[Tuple[str, str]]:
+        seen: Set[str] = set()
+        candidates = []
+        for program_path, executable in self._candidates():
+            if program_path in seen:
+                continue
+            seen.add(program_path)
+            fires = self.launch_stats.fire_count(program_path)
+            if fires > 0:
+                candidates.append((fires, program_path, executable))
+
+        candidates.sort(key=lambda item: item[0], reverse=True)
+        return [(path, exe) for _, path, exe in candidates[:self.settings.prewarm_top_programs]]
+
+    def _warm_file(self, path: str, budget_left: int, buffer: bytearray) -> int:
+        try:
+            with open(path, 'rb', buffering=0) as f:
+                size = os.fstat(f.fileno()).st_size
+                if size > budget_left:
+                    return 0
+
+                offset = 0
+                while offset < size and not self._stop_event.is_set():
+                    length = min(self.CHUNK_SIZE, size - offset)
+                    if hasattr(os, 'posix_fadvise'):
+                        os.posix_fadvise(f.fileno(), offset, length, os.POSIX_FADV_WILLNEED)
+                    else:
+                        f.readinto(memoryview(buffer)[:length])
+                    offset += length
+                    self._stop_event.wait(length / self.IO_BYTES_PER_SECOND)
+                return offset
+        except OSError:
+            return 0
+
+    def warm(self) -> int:
+        libraries = self._load_libraries()
+        budget_left = self._memory_budget()
+        buffer = bytearray(0 if hasattr(os, 'posix_fadvise') else self.CHUNK_SIZE)
+        warmed_files: Set[str] = set()
+        total = 0
+
+        for program_path, executable in self._ranked_candidates():
+            files = [executable] + libraries.get(self._key(program_path), [])
+            program_total = 0
+            for path in files:
+                if path in warmed_files or self._stop_event.is_set():
+                    continue
+                warmed_files.add(path)
+                warmed = self._warm_file(path, budget_left, buffer)
+                budget_left -= warmed
+                program_total += warmed
+
+            if program_total:
+                total += program_total
+                with self._lock:
+                    self._warmed[program_path] = time.monotonic()
+
+        with self._lock:
+            self._runs += 1
+            self._bytes_warmed += total
+        self._last_warm = time.monotonic()
+        return total
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.CHECK_INTERVAL):
+            try:
+                self._learn_pending()
+                if self._is_idle():
+                    self.warm()
+            except Exception as e:
+                print(f"Prewarm failed: {e}")
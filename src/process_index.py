@@ -0,0 +1,115 @@
+import os
+import threading
+import time
+from typing import Dict, Optional, Set, Tuple
+
+from .readiness import process_tree
+from .supervisor import ProcessSupervisor
+
+
+class ProcessIndex:
+
+    PROC_DIR = "/proc"
+    MIN_REFRESH_INTERVAL = 0.5
+    DELETED_SUFFIX = " (deleted)"
+
+    def __init__(self, supervisor: ProcessSupervisor):
+        self.supervisor = supervisor
+        self._pid_exe: Dict[int, Optional[str]] = {}
+        self._pid_identity: Dict[int, Optional[Tuple[str, str]]] = {}
+        self._exe_pids: Dict[str, Set[int]] = {}
+        self._unsettled: Set[int] = set()
+        self._last_refresh = 0.0
+        self._lock = threading.RLock()
+        self._enabled = os.path.isdir(self.PROC_DIR)
+
+    def _read_exe(self, pid: int) -> Optional[str]:
+        try:
+            exe = os.readlink(f"{self.PROC_DIR}/{pid}/exe")
+        except OSError:
+            return None
+
+        if exe.endswith(self.DELETED_SUFFIX):
+            exe = exe[:-len(self.DELETED_SUFFIX)]
+        return exe
+
+    def _read_identity(self, pid: int) -> Optional[Tuple[str, str]]:
+        try:
+            with open(f"{self.PROC_DIR}/{pid}/stat") as f:
+                stat = f.read()
+        except OSError:
+            return None
+
+        end = stat.rfind(')')
+        fields = stat[end + 2:].split()
+        if len(fields) < 20:
+            return None
+        return fields[19], stat[stat.find('(') + 1:end]
+
+    def _forget(self, pid: int) -> None:
+        self._pid_identity.pop(pid, None)
+        exe = self._pid_exe.pop(pid, None)
+        if exe is not None:
+            pids = self._exe_pids.get(exe)
+            if pids is not None:
+                pids.discard(pid)
+                if not pids:
+                    del self._exe_pids[exe]
+
+    def _index(self, pid: int, identity: Optional[Tuple[str, str]]) -> None:
+        self._forget(pid)
+        exe = self._read_exe(pid)
+        self._pid_exe[pid] = exe
+        self._pid_identity[pid] = identity
+        if exe is not None:
+            self._exe_pids.setdefault(exe, set()).add(pid)
+
+    def refresh(self, force: bool = False) -> None:
+        if not self._enabled:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_refresh < self.MIN_REFRESH_INTERVAL:
+                return
+            self._last_refresh = now
+
+            try:
+                current = {int(entry) for entry in os.listdir(self.PROC_DIR) if entry.isdigit()}
+            except OSError:
+                return
+
+            for pid in set(self._pid_exe) - current:
+                self._forget(pid)
+
+            # A fresh pid is usually caught between fork and exec, so it is
+            # read once more on the following refresh before it settles.
+            for pid in self._unsettled & current:
+                identity = self._read_identity(pid)
+                if identity != self._pid_identity.get(pid):
+                    self._index(pid, identity)
+
+            self._unsettled = current - set(self._pid_exe)
+            for pid in self._unsettled:
+                self._index(pid, self._read_identity(pid))
+
+    def find(self, executable: str) -> Set[int]:
+        real_exe = os.path.realpath(executable)
+        pids = {
+            record.pid for record in self.supervisor.live_processes()
+            if record.executable in (executable, real_exe)
+        }
+
+        with self._lock:
+            self.refresh()
+            for pid in list(self._exe_pids.get(real_exe, ())):
+                identity = self._read_identity(pid)
+                if identity != self._pid_identity.get(pid):
+                    self._index(pid, identity)
+                if self._pid_exe.get(pid) == real_exe:
+                    pids.add(pid)
+
+        tree: Set[int] = set()
+        for pid in pids:
+            tree |= process_tree(pid)
+        return tree
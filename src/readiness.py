@@ -0,0 +1,179 @@
+import os
+import platform
+import time
+from typing import Dict, List, Optional, Set
+
+from . import windowing
+
+
+PROBE_MODES = ('auto', 'window', 'idle', 'path', 'fixed')
+
+POLL_INTERVAL = 0.05
+SETTLE_SECONDS = 0.2
+
+
+def process_tree(pid: int) -> Set[int]:
+    pids = {pid}
+    pending = [pid]
+
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/task/{current}/children") as f:
+                children = [int(child) for child in f.read().split()]
+        except (OSError, ValueError):
+            continue
+
+        for child in children:
+            if child not in pids:
+                pids.add(child)
+                pending.append(child)
+
+    return pids
+
+
+def _cpu_ticks(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            stat = f.read()
+    except OSError:
+        return None
+
+    fields = stat[stat.rfind(')') + 2:].split()
+    try:
+        return int(fields[11]) + int(fields[12])
+    except (IndexError, ValueError):
+        return None
+
+
+class ReadinessProbe:
+
+    def start(self, pid: int) -> None:
+        pass
+
+    def check(self, pid: int) -> bool:
+        raise NotImplementedError
+
+
+class WindowProbe(ReadinessProbe):
+
+    def __init__(self):
+        self._baseline: Set[int] = set()
+        self._window_pids: Dict[int, Optional[int]] = {}
+
+    def start(self, pid: int) -> None:
+        self._baseline = set(windowing.list_window_ids())
+        self._window_pids.clear()
+
+    def check(self, pid: int) -> bool:
+        new_windows = [
+            window for window in windowing.list_window_ids()
+            if window not in self._baseline
+        ]
+        if not new_windows:
+            return False
+
+        pids = process_tree(pid)
+        for window in new_windows:
+            if window not in self._window_pids:
+                self._window_pids[window] = windowing.get_window_pid(window)
+            if self._window_pids[window] in pids:
+                return True
+
+        return False
+
+
+class ProcIdleProbe(ReadinessProbe):
+
+    IDLE_TICKS = 1
+    IDLE_POLLS = 4
+
+    def __init__(self):
+        self._last_ticks: Optional[int] = None
+        self._idle_polls = 0
+
+    def _tree_ticks(self, pid: int) -> Optional[int]:
+        total = None
+        for member in process_tree(pid):
+            ticks = _cpu_ticks(member)
+            if ticks is not None:
+                total = (total or 0) + ticks
+        return total
+
+    def start(self, pid: int) -> None:
+        self._last_ticks = None
+        self._idle_polls = 0
+
+    def check(self, pid: int) -> bool:
+        ticks = self._tree_ticks(pid)
+        if ticks is None:
+            return False
+
+        last, self._last_ticks = self._last_ticks, ticks
+        if last is None or ticks == 0:
+            return False
+
+        if ticks - last <= self.IDLE_TICKS:
+            self._idle_polls += 1
+        else:
+            self._idle_polls = 0
+
+        return self._idle_polls >= self.IDLE_POLLS
+
+
+class PathProbe(ReadinessProbe):
+
+    def __init__(self, path: str):
+        self.path = os.path.expandvars(os.path.expanduser(path))
+
+    def check(self, pid: int) -> bool:
+        return os.path.exists(self.path)
+
+
+def build_probes(mode: str, ready_path: str = "") -> List[ReadinessProbe]:
+    if mode == 'fixed':
+        return []
+
+    if mode == 'path':
+        return [PathProbe(ready_path)] if ready_path else []
+
+    if mode == 'window':
+        return [WindowProbe()]
+
+    if mode == 'idle':
+        return [ProcIdleProbe()] if platform.system() == "Linux" else []
+
+    probes: List[ReadinessProbe] = []
+    if windowing.is_supported():
+        probes.append(WindowProbe())
+    elif platform.system() == "Linux":
+        probes.append(ProcIdleProbe())
+    return probes
+
+
+def wait_until_ready(
+    process,
+    probes: List[ReadinessProbe],
+    timeout: float,
+    interval: float = POLL_INTERVAL
+) -> Optional[float]:
+    start = time.perf_counter()
+    deadline = start + timeout
+
+    for probe in probes:
+        probe.start(process.pid)
+
+    while True:
+        if process.poll() is not None:
+            return None
+
+        if any(probe.check(process.pid) for probe in probes):
+            ready_after = time.perf_counter() - start
+            time.sleep(SETTLE_SECONDS)
+            return ready_after
+
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return None
+
+        time.sleep(min(interval, remaining))
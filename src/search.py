@@ -0,0 +1,153 @@
+import heapq
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from .storage import Keybind, KeybindStore, StoreChanges
+
+
+GRAM_SIZE = 3
+MAX_MISSING_FRACTION = 3
+COMMON_GRAM_FRACTION = 0.5
+COMMON_GRAM_MIN_KEYBINDS = 100
+
+_SEPARATORS = str.maketrans('<>+/\\', '     ')
+
+
+def _normalize(text: str) -> str:
+    return ' '.join(text.lower().translate(_SEPARATORS).split())
+
+
+def _grams(text: str, padded: bool = True) -> Set[str]:
+    if padded:
+        text = f" {text} "
+    return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+def _word_starts(text: str) -> Set[str]:
+    return {' ' + word[0] for word in text.split()}
+
+
+class KeybindSearchIndex:
+
+    def __init__(self, store: KeybindStore):
+        self.store = store
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._doc_grams: Dict[str, Set[str]] = {}
+        self._names: Dict[str, str] = {}
+        self._texts: Dict[str, str] = {}
+        self._source: Optional[dict] = None
+        store.add_listener(self._on_store_changed)
+
+    @staticmethod
+    def _fields(keybind: Keybind) -> Tuple[str, ...]:
+        return (
+            _normalize(keybind.name),
+            _normalize(keybind.hotkey),
+            _normalize(keybind.program_path),
+        )
+
+    def _add(self, keybind: Keybind) -> None:
+        fields = self._fields(keybind)
+        grams: Set[str] = set()
+        for field in fields:
+            if field:
+                grams |= _grams(field)
+                grams |= _word_starts(field)
+
+        for gram in grams:
+            self._postings[gram].add(keybind.id)
+        self._doc_grams[keybind.id] = grams
+        self._names[keybind.id] = fields[0]
+        self._texts[keybind.id] = '\n'.join(fields)
+
+    def _remove(self, keybind_id: str) -> None:
+        for gram in self._doc_grams.pop(keybind_id, ()):
+            ids = self._postings.get(gram)
+            if ids is not None:
+                ids.discard(keybind_id)
+                if not ids:
+                    del self._postings[gram]
+        self._names.pop(keybind_id, None)
+        self._texts.pop(keybind_id, None)
+
+    def _rebuild(self) -> None:
+        self._postings.clear()
+        self._doc_grams.clear()
+        self._names.clear()
+        self._texts.clear()
+        self._source = self.store.keybinds
+        for keybind in list(self._source.values()):
+            self._add(keybind)
+
+    def _on_store_changed(self, changes: StoreChanges) -> None:
+        with self._lock:
+            if self._source is None:
+                return
+            if self._source is not self.store.keybinds:
+                self._rebuild()
+                return
+            for keybind_id in changes.removed + changes.updated:
+                self._remove(keybind_id)
+            for keybind_id in changes.added + changes.updated:
+                keybind = self.store.get(keybind_id)
+                if keybind is not None:
+                    self._add(keybind)
+
+    def _informative_grams(self, query_grams: Set[str]) -> Set[str]:
+        if len(self._doc_grams) < COMMON_GRAM_MIN_KEYBINDS:
+            return query_grams
+        common = COMMON_GRAM_FRACTION * len(self._doc_grams)
+        informative = {
+            gram for gram in query_grams
+            if len(self._postings.get(gram, ())) <= common
+        }
+        return informative or query_grams
+
+    def _candidates(self, query_grams: Set[str], required: int) -> Set[str]:
+        postings = sorted(
+            (self._postings.get(gram, set()) for gram in query_grams),
+            key=len
+        )
+        candidates: Set[str] = set()
+        for ids in postings[:len(postings) - required + 1]:
+            candidates |= ids
+        return candidates
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        query = _normalize(query)
+        with self._lock:
+            if self._source is not self.store.keybinds:
+                self._rebuild()
+
+            if not query:
+                return []
+
+            scored: List[Tuple[float, str, str]] = []
+            if len(query) < GRAM_SIZE:
+                for keybind_id in self._postings.get(' ' + query, ()):
+                    name = self._names[keybind_id]
+                    scored.append((-2.0 if name.startswith(query) else -1.0, name, keybind_id))
+            else:
+                query_grams = self._informative_grams(_grams(query, padded=False))
+                total = len(query_grams)
+                required = max(1, total - total // MAX_MISSING_FRACTION)
+
+                for keybind_id in self._candidates(query_grams, required):
+                    hits = len(query_grams & self._doc_grams[keybind_id])
+                    if hits < required:
+                        continue
+                    score = hits / total
+                    name = self._names[keybind_id]
+                    if name.startswith(query):
+                        score += 2.0
+                    elif query in self._texts[keybind_id]:
+                        score += 1.0
+                    scored.append((-score, name, keybind_id))
+
+        if limit is not None:
+            scored = heapq.nsmallest(limit, scored)
+        else:
+            scored.sort()
+        return [keybind_id for _, _, keybind_id in scored]
@@ -0,0 +1,32 @@
+import json
+from dataclasses import dataclass, asdict, fields
+from pathlib import Path
+
+
+@dataclass
+class AppSettings:
+
+    clipboard_backup_max_bytes: int = 1024 * 1024
+    prewarm_enabled: bool = False
+    prewarm_max_bytes: int = 256 * 1024 * 1024
+    prewarm_top_programs: int = 5
+    hotkey_skeleton_enabled: bool = False
+    palette_hotkey: str = ""
+
+    FILE_NAME = "settings.json"
+
+    @classmethod
+    def load(cls, data_dir: Path) -> "AppSettings":
+        path = data_dir / cls.FILE_NAME
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return cls()
+
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+    def save(self, data_dir: Path) -> None:
+        path = data_dir / self.FILE_NAME
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(asdict(self), indent=2), encoding='utf-8')
@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional, Set
+
+from pynput import keyboard
+
+from .hotkeys import HotkeyManager
+
+
+SALT_SIZE = 16
+HASH_SIZE = 16
+MODIFIER_PARTS = {'<ctrl>', '<alt>', '<shift>', '<cmd>'}
+
+_hotkey_parser = HotkeyManager()
+
+
+def combo_key(hotkey: str) -> str:
+    return '+'.join(sorted(_hotkey_parser.parse_hotkey(hotkey).split('+')))
+
+
+@dataclass
+class HotkeySkeleton:
+
+    salt: bytes
+    hashes: Set[str] = field(default_factory=set)
+
+    def _hash(self, combo: str) -> str:
+        return hashlib.sha256(self.salt + combo.encode('utf-8')).hexdigest()[:HASH_SIZE * 2]
+
+    def matches(self, combo: str) -> bool:
+        return self._hash(combo) in self.hashes
+
+    @classmethod
+    def build(cls, hotkeys: Iterable[str]) -> "HotkeySkeleton":
+        skeleton = cls(salt=os.urandom(SALT_SIZE))
+        skeleton.hashes = {skeleton._hash(combo_key(hotkey)) for hotkey in hotkeys if hotkey}
+        return skeleton
+
+    def to_bytes(self) -> bytes:
+        return json.dumps({
+            'salt': self.salt.hex(),
+            'hashes': sorted(self.hashes),
+        }, separators=(',', ':')).encode('utf-8')
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Optional["HotkeySkeleton"]:
+        if not data:
+            return None
+        try:
+            parsed = json.loads(data.decode('utf-8'))
+            return cls(salt=bytes.fromhex(parsed['salt']), hashes=set(parsed['hashes']))
+        except (ValueError, KeyError, TypeError):
+            return None
+
+
+class SkeletonListener:
+
+    def __init__(self, skeleton: HotkeySkeleton, on_trigger: Callable[[str], None]):
+        self.skeleton = skeleton
+        self.on_trigger = on_trigger
+        self.listener: Optional[keyboard.Listener] = None
+        self._pressed: Set[str] = set()
+        self._fired = False
+        self._lock = threading.Lock()
+
+    def _key_part(self, key) -> Optional[str]:
+        if self.listener is not None:
+            key = self.listener.canonical(key)
+
+        if isinstance(key, keyboard.KeyCode):
+            if key.char:
+                return _hotkey_parser.parse_hotkey(key.char)
+            return None
+
+        name = getattr(key, 'name', None)
+        return f"<{name}>" if name else None
+
+    def _on_press(self, key):
+        part = self._key_part(key)
+        if part is None:
+            return
+
+        with self._lock:
+            self._pressed.add(part)
+            if self._fired or not (self._pressed - MODIFIER_PARTS):
+                return
+            combo = '+'.join(sorted(self._pressed))
+            if not self.skeleton.matches(combo):
+                return
+            self._fired = True
+
+        self.on_trigger(combo)
+
+    def _on_release(self, key):
+        part = self._key_part(key)
+        with self._lock:
+            self._pressed.discard(part)
+            if not self._pressed:
+                self._fired = False
+
+    def start(self) -> None:
+        if self.listener is not None:
+            return
+        self._pressed.clear()
+        self._fired = False
+        self.listener = keyboard.Listener(
+            on_press=self._on_press,
+            on_release=self._on_release
+        )
+        self.listener.start()
+
+    def stop(self) -> None:
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
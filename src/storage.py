@@ -1,11 +1,15 @@
 import json
+import os
+import struct
+import threading
 import time
 import uuid
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, asdict, field, replace
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 from .encryption import EncryptionManager
+from .skeleton import HotkeySkeleton
 
 
 @dataclass
@@ -19,10 +23,20 @@ class Keybind:
     username: str = ""
     password: str = ""
     custom_text: str = ""
+    restore_clipboard: bool = True
 
     program_path: str = ""
     program_args: str = ""
+    focus_existing: bool = False
     wait_seconds: float = 2.0
+    adaptive_wait: bool = False
+    ready_probe: str = "auto"
+    ready_path: str = ""
+
+    macro_steps: List[Dict[str, str]] = field(default_factory=list)
+    workspace_members: List[Dict] = field(default_factory=list)
+
+    credential_id: str = ""
 
     created_at: float = 0.0
 
@@ -35,9 +49,17 @@ class Keybind:
         username: str = "",
         password: str = "",
         custom_text: str = "",
+        restore_clipboard: bool = True,
         program_path: str = "",
         program_args: str = "",
-        wait_seconds: float = 2.0
+        focus_existing: bool = False,
+        wait_seconds: float = 2.0,
+        adaptive_wait: bool = False,
+        ready_probe: str = "auto",
+        ready_path: str = "",
+        macro_steps: Optional[List[Dict[str, str]]] = None,
+        workspace_members: Optional[List[Dict]] = None,
+        credential_id: str = ""
     ) -> "Keybind":
         return cls(
             id=str(uuid.uuid4()),
@@ -47,75 +69,508 @@ class Keybind:
             username=username,
             password=password,
             custom_text=custom_text,
+            restore_clipboard=restore_clipboard,
             program_path=program_path,
             program_args=program_args,
+            focus_existing=focus_existing,
             wait_seconds=wait_seconds,
+            adaptive_wait=adaptive_wait,
+            ready_probe=ready_probe,
+            ready_path=ready_path,
+            macro_steps=list(macro_steps or []),
+            workspace_members=list(workspace_members or []),
+            credential_id=credential_id,
             created_at=time.time()
         )
 
 
+@dataclass
+class Credential:
+
+    id: str
+    name: str
+    username: str = ""
+    password: str = ""
+    created_at: float = 0.0
+
+    @classmethod
+    def create_new(cls, name: str, username: str = "", password: str = "") -> "Credential":
+        return cls(
+            id=str(uuid.uuid4()),
+            name=name,
+            username=username,
+            password=password,
+            created_at=time.time()
+        )
+
+
+@dataclass
+class StoreChanges:
+
+    added: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    conflicts: List[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
+
+    def merge(self, later: "StoreChanges") -> "StoreChanges":
+        merged = StoreChanges(
+            list(self.added), list(self.updated), list(self.removed), list(self.conflicts)
+        )
+
+        for kid in later.added:
+            if kid in merged.removed:
+                merged.removed.remove(kid)
+                merged.updated.append(kid)
+            elif kid not in merged.added:
+                merged.added.append(kid)
+
+        for kid in later.updated:
+            if kid not in merged.added and kid not in merged.updated:
+                merged.updated.append(kid)
+
+        for kid in later.removed:
+            if kid in merged.added:
+                merged.added.remove(kid)
+                continue
+            if kid in merged.updated:
+                merged.updated.remove(kid)
+            if kid not in merged.removed:
+                merged.removed.append(kid)
+
+        merged.conflicts.extend(kid for kid in later.conflicts if kid not in merged.conflicts)
+        return merged
+
+
+class _FileLock:
+
+    def __init__(self, path: Path, exclusive: bool):
+        self.path = path
+        self.exclusive = exclusive
+        self._file = None
+
+    def __enter__(self) -> "_FileLock":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a+b')
+        if os.name == 'nt':
+            import msvcrt
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(
+                self._file.fileno(),
+                fcntl.LOCK_EX if self.exclusive else fcntl.LOCK_SH
+            )
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if os.name == 'nt':
+            import msvcrt
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        self._file.close()
+        self._file = None
+
+
 class KeybindStore:
 
-    STORE_VERSION = 1
+    STORE_VERSION = 2
+    MAGIC = b"QKS2"
+    LEGACY_MAGIC = b"QKS1"
+    HEADER = struct.Struct(">4sQ")
+    SKELETON_LENGTH = struct.Struct(">I")
 
     def __init__(self, encryption: EncryptionManager, data_dir: Path):
         self.encryption = encryption
         self.data_path = data_dir / "keybinds.enc"
+        self.lock_path = data_dir / "keybinds.enc.lock"
         self.keybinds: Dict[str, Keybind] = {}
+        self.credentials: Dict[str, Credential] = {}
+        self.generation = 0
+        self.last_conflicts: List[str] = []
+        self._base: Dict[str, dict] = {}
+        self._credential_base: Dict[str, dict] = {}
+        self._lock = threading.RLock()
+        self.skeleton_enabled = False
+        self._listeners: List[Callable[[StoreChanges], None]] = []
 
-    def load(self) -> bool:
-        if not self.data_path.exists():
-            return False
+    @classmethod
+    def _parse_header(cls, data: bytes) -> Tuple[int, bytes, int]:
+        magic = data[:len(cls.MAGIC)]
+        if magic not in (cls.MAGIC, cls.LEGACY_MAGIC) or len(data) < cls.HEADER.size:
+            return 0, b'', 0
 
-        encrypted_data = self.data_path.read_bytes()
-        json_str = self.encryption.decrypt(encrypted_data)
-        data = json.loads(json_str)
+        _, generation = cls.HEADER.unpack_from(data)
+        offset = cls.HEADER.size
+        skeleton = b''
+        if magic == cls.MAGIC:
+            (length,) = cls.SKELETON_LENGTH.unpack_from(data, offset)
+            offset += cls.SKELETON_LENGTH.size
+            skeleton = data[offset:offset + length]
+            offset += length
+        return generation, skeleton, offset
 
-        self.keybinds = {
-            kb['id']: Keybind(**kb) for kb in data.get('keybinds', [])
-        }
-        return True
+    @classmethod
+    def split_header(cls, data: bytes) -> Tuple[int, bytes]:
+        generation, _, offset = cls._parse_header(data)
+        return generation, data[offset:]
+
+    @classmethod
+    def read_skeleton(cls, data_path: Path) -> Optional[HotkeySkeleton]:
+        try:
+            with open(data_path, 'rb') as f:
+                header = f.read(cls.HEADER.size + cls.SKELETON_LENGTH.size)
+                if header[:len(cls.MAGIC)] != cls.MAGIC or len(header) < cls.HEADER.size + cls.SKELETON_LENGTH.size:
+                    return None
+                (length,) = cls.SKELETON_LENGTH.unpack_from(header, cls.HEADER.size)
+                return HotkeySkeleton.from_bytes(f.read(length))
+        except OSError:
+            return None
+
+    @classmethod
+    def read_encrypted(cls, data_path: Path) -> bytes:
+        return cls.split_header(data_path.read_bytes())[1]
+
+    def read_generation(self) -> Optional[int]:
+        try:
+            with open(self.data_path, 'rb') as f:
+                header = f.read(self.HEADER.size)
+        except OSError:
+            return None
+
+        if header[:len(self.MAGIC)] not in (self.MAGIC, self.LEGACY_MAGIC) or len(header) < self.HEADER.size:
+            return 0
+        return self.HEADER.unpack(header)[1]
 
-    def save(self) -> None:
+    def _read_disk(self) -> Tuple[int, Dict[str, dict], Dict[str, dict]]:
+        generation, encrypted_data = self.split_header(self.data_path.read_bytes())
+        data = json.loads(self.encryption.decrypt(encrypted_data))
+        return (
+            generation,
+            {kb['id']: kb for kb in data.get('keybinds', [])},
+            {cred['id']: cred for cred in data.get('credentials', [])},
+        )
+
+    def _write_disk(self, generation: int, records: List[dict], credentials: List[dict]) -> None:
         data = {
             'version': self.STORE_VERSION,
-            'keybinds': [asdict(kb) for kb in self.keybinds.values()]
+            'keybinds': records,
+            'credentials': credentials
         }
         json_str = json.dumps(data, indent=2)
         encrypted_data = self.encryption.encrypt(json_str)
 
         self.data_path.parent.mkdir(parents=True, exist_ok=True)
-        self.data_path.write_bytes(encrypted_data)
+        tmp_path = self.data_path.with_suffix('.tmp')
+        skeleton = b''
+        if self.skeleton_enabled:
+            skeleton = HotkeySkeleton.build(record['hotkey'] for record in records).to_bytes()
+
+        tmp_path.write_bytes(
+            self.HEADER.pack(self.MAGIC, generation) +
+            self.SKELETON_LENGTH.pack(len(skeleton)) +
+            skeleton +
+            encrypted_data
+        )
+        os.replace(tmp_path, self.data_path)
+
+    def _set_records(self, generation: int, records: Dict[str, dict], credentials: Dict[str, dict]) -> None:
+        self.keybinds = {kid: Keybind(**record) for kid, record in records.items()}
+        self._base = {kid: dict(record) for kid, record in records.items()}
+        self.credentials = {cid: Credential(**record) for cid, record in credentials.items()}
+        self._credential_base = {cid: dict(record) for cid, record in credentials.items()}
+        self.generation = generation
+
+    def clear(self) -> None:
+        with self._lock:
+            self.keybinds = {}
+            self._base = {}
+            self.credentials = {}
+            self._credential_base = {}
+            self.generation = 0
+
+    def load(self) -> bool:
+        if not self.data_path.exists():
+            return False
+
+        with self._lock, _FileLock(self.lock_path, exclusive=False):
+            self._set_records(*self._read_disk())
+        return True
+
+    @staticmethod
+    def _merge(objects: Dict[str, object], base: Dict[str, dict], remote: Dict[str, dict]) -> Tuple[Dict[str, dict], StoreChanges]:
+        local = {kid: asdict(obj) for kid, obj in objects.items()}
+        merged: Dict[str, dict] = {}
+        changes = StoreChanges()
+
+        for kid in list(local) + [kid for kid in remote if kid not in local]:
+            original = base.get(kid)
+            mine = local.get(kid)
+            theirs = remote.get(kid)
+
+            if mine == original:
+                chosen = theirs
+            elif theirs == original or theirs == mine:
+                chosen = mine
+            else:
+                chosen = mine
+                changes.conflicts.append(kid)
+
+            if chosen is not None:
+                merged[kid] = chosen
+
+            if chosen != mine:
+                if mine is None:
+                    changes.added.append(kid)
+                elif chosen is None:
+                    changes.removed.append(kid)
+                else:
+                    changes.updated.append(kid)
+
+        return merged, changes
+
+    def _add_dependents(self, changes: StoreChanges, credential_changes: StoreChanges) -> None:
+        changed = set(credential_changes.added + credential_changes.updated + credential_changes.removed)
+        if changed:
+            seen = set(changes.added + changes.updated + changes.removed)
+            changes.updated.extend(
+                kid for kid, kb in self.keybinds.items()
+                if kb.credential_id in changed and kid not in seen
+            )
+        changes.conflicts.extend(credential_changes.conflicts)
+
+    def save(self) -> StoreChanges:
+        with self._lock, _FileLock(self.lock_path, exclusive=True):
+            disk_generation = self.read_generation() if self.data_path.exists() else None
+
+            if disk_generation is None or disk_generation == self.generation:
+                records = {kid: asdict(kb) for kid, kb in self.keybinds.items()}
+                credentials = {cid: asdict(cred) for cid, cred in self.credentials.items()}
+                self._write_disk(self.generation + 1, list(records.values()), list(credentials.values()))
+                self._base = records
+                self._credential_base = credentials
+                self.generation += 1
+                changes = StoreChanges()
+            else:
+                generation, remote, remote_credentials = self._read_disk()
+                records, changes = self._merge(self.keybinds, self._base, remote)
+                credentials, credential_changes = self._merge(
+                    self.credentials, self._credential_base, remote_credentials
+                )
+                self._write_disk(generation + 1, list(records.values()), list(credentials.values()))
+
+                kept = {kid: kb for kid, kb in self.keybinds.items() if records.get(kid) == asdict(kb)}
+                kept_credentials = {
+                    cid: cred for cid, cred in self.credentials.items()
+                    if credentials.get(cid) == asdict(cred)
+                }
+                self._set_records(generation + 1, records, credentials)
+                self.keybinds.update(kept)
+                self.credentials.update(kept_credentials)
+                self._add_dependents(changes, credential_changes)
+
+            self.last_conflicts = changes.conflicts
+            if changes.conflicts:
+                print(f"Keybind store changed on disk; kept local version of {len(changes.conflicts)} conflicting record(s)")
+            return changes
+
+    def add_listener(self, listener: Callable[[StoreChanges], None]) -> None:
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[StoreChanges], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, changes: StoreChanges) -> None:
+        if not changes:
+            return
+        for listener in list(self._listeners):
+            try:
+                listener(changes)
+            except Exception as e:
+                print(f"Keybind store listener failed: {e}")
+
+    @staticmethod
+    def _pull(objects: Dict[str, object], base: Dict[str, dict], remote: Dict[str, dict], factory: Callable[..., object]) -> StoreChanges:
+        changes = StoreChanges()
+
+        for kid in set(remote) | set(base):
+            original = base.get(kid)
+            theirs = remote.get(kid)
+            if theirs == original:
+                continue
+
+            current = objects.get(kid)
+            if (asdict(current) if current else None) != original:
+                changes.conflicts.append(kid)
+                continue
+
+            if theirs is None:
+                del objects[kid]
+                del base[kid]
+                changes.removed.append(kid)
+            else:
+                objects[kid] = factory(**theirs)
+                base[kid] = dict(theirs)
+                (changes.updated if original else changes.added).append(kid)
+
+        return changes
+
+    def reload_changes(self) -> Optional[StoreChanges]:
+        if self.encryption.key is None:
+            return None
+
+        with self._lock, _FileLock(self.lock_path, exclusive=False):
+            disk_generation = self.read_generation()
+            if disk_generation is None or disk_generation == self.generation:
+                return None
+
+            generation, remote, remote_credentials = self._read_disk()
+            changes = self._pull(self.keybinds, self._base, remote, Keybind)
+            credential_changes = self._pull(
+                self.credentials, self._credential_base, remote_credentials, Credential
+            )
+            self._add_dependents(changes, credential_changes)
+
+            if not changes.conflicts:
+                self.generation = generation
+
+        self._notify(changes)
+        return changes
 
     def add(self, keybind: Keybind) -> None:
-        self.keybinds[keybind.id] = keybind
-        self.save()
+        self.add_many([keybind])
+
+    def add_many(self, keybinds: List[Keybind]) -> None:
+        with self._lock:
+            for keybind in keybinds:
+                self.keybinds[keybind.id] = keybind
+            changes = self.save()
+        changes.added.extend(keybind.id for keybind in keybinds)
+        self._notify(changes)
 
     def update(self, keybind: Keybind) -> None:
-        if keybind.id not in self.keybinds:
-            raise KeyError(f"Keybind with id {keybind.id} not found")
-        self.keybinds[keybind.id] = keybind
-        self.save()
+        self.update_many([keybind])
+
+    def update_many(self, keybinds: List[Keybind], credentials: Iterable[Credential] = ()) -> None:
+        credentials = list(credentials)
+        with self._lock:
+            for keybind in keybinds:
+                if keybind.id not in self.keybinds:
+                    raise KeyError(f"Keybind with id {keybind.id} not found")
+            for credential in credentials:
+                if credential.id not in self.credentials:
+                    raise KeyError(f"Credential with id {credential.id} not found")
+            for keybind in keybinds:
+                self.keybinds[keybind.id] = keybind
+            for credential in credentials:
+                self.credentials[credential.id] = credential
+            changes = self.save()
+            updated = [keybind.id for keybind in keybinds]
+            updated.extend(
+                kid for kid in self.credential_users(*(credential.id for credential in credentials))
+                if kid not in updated
+            )
+        changes.updated.extend(kid for kid in updated if kid not in changes.updated)
+        self._notify(changes)
 
     def remove(self, keybind_id: str) -> None:
-        if keybind_id in self.keybinds:
-            del self.keybinds[keybind_id]
-            self.save()
+        self.remove_many([keybind_id])
+
+    def remove_many(self, keybind_ids: List[str]) -> None:
+        with self._lock:
+            removed = [kid for kid in keybind_ids if self.keybinds.pop(kid, None) is not None]
+            if not removed:
+                return
+            changes = self.save()
+        changes.removed.extend(removed)
+        self._notify(changes)
+
+    def add_credential(self, credential: Credential, keybind_ids: Iterable[str] = ()) -> None:
+        with self._lock:
+            self.credentials[credential.id] = credential
+            attached = []
+            for kid in keybind_ids:
+                keybind = self.keybinds.get(kid)
+                if keybind is not None:
+                    self.keybinds[kid] = replace(keybind, credential_id=credential.id, username="", password="")
+                    attached.append(kid)
+            changes = self.save()
+        changes.updated.extend(kid for kid in attached if kid not in changes.updated)
+        self._notify(changes)
+
+    def save_keybind(self, keybind: Keybind, credential: Optional[Credential] = None) -> None:
+        with self._lock:
+            is_new = keybind.id not in self.keybinds
+            self.keybinds[keybind.id] = keybind
+            if credential is not None:
+                self.credentials[credential.id] = credential
+            changes = self.save()
+            users = self.credential_users(credential.id) if credential is not None else []
+        (changes.added if is_new else changes.updated).append(keybind.id)
+        changes.updated.extend(kid for kid in users if kid != keybind.id and kid not in changes.updated)
+        self._notify(changes)
+
+    def update_credential(self, credential: Credential) -> None:
+        self.update_many([], [credential])
+
+    def remove_credential(self, credential_id: str) -> None:
+        with self._lock:
+            credential = self.credentials.pop(credential_id, None)
+            if credential is None:
+                return
+            detached = self.credential_users(credential_id)
+            for kid in detached:
+                self.keybinds[kid] = replace(
+                    self.keybinds[kid],
+                    credential_id="",
+                    username=credential.username,
+                    password=credential.password,
+                )
+            changes = self.save()
+        changes.updated.extend(kid for kid in detached if kid not in changes.updated)
+        self._notify(changes)
+
+    def get_credential(self, credential_id: str) -> Optional[Credential]:
+        return self.credentials.get(credential_id)
+
+    def get_credentials(self) -> List[Credential]:
+        with self._lock:
+            return sorted(self.credentials.values(), key=lambda cred: (cred.name.lower(), cred.created_at))
+
+    def credential_users(self, *credential_ids: str) -> List[str]:
+        wanted = set(credential_ids)
+        if not wanted:
+            return []
+        with self._lock:
+            return [kid for kid, kb in self.keybinds.items() if kb.credential_id in wanted]
+
+    def resolve(self, keybind: Keybind) -> Keybind:
+        credential = self.credentials.get(keybind.credential_id) if keybind.credential_id else None
+        if credential is None:
+            return keybind
+        return replace(keybind, username=credential.username, password=credential.password)
 
     def get(self, keybind_id: str) -> Optional[Keybind]:
         return self.keybinds.get(keybind_id)
 
     def get_all(self) -> List[Keybind]:
-        return list(self.keybinds.values())
+        with self._lock:
+            return list(self.keybinds.values())
 
     def get_by_hotkey(self, hotkey: str) -> Optional[Keybind]:
-        for kb in self.keybinds.values():
+        for kb in self.get_all():
             if kb.hotkey.lower() == hotkey.lower():
                 return kb
         return None
 
     def hotkey_exists(self, hotkey: str, exclude_id: Optional[str] = None) -> bool:
-        for kb in self.keybinds.values():
+        if not hotkey:
+            return False
+        for kb in self.get_all():
             if kb.hotkey.lower() == hotkey.lower():
                 if exclude_id is None or kb.id != exclude_id:
                     return True
@@ -0,0 +1,130 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+from typing import Optional
+
+from .storage import KeybindStore
+
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_libc():
+    if not hasattr(os, 'uname') or os.uname().sysname != 'Linux':
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class StoreWatcher:
+
+    POLL_INTERVAL = 1.0
+    DEBOUNCE_SECONDS = 0.1
+
+    def __init__(self, store: KeybindStore):
+        self.store = store
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(self._stop_event, self._open_inotify()),
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._thread = None
+
+    def _open_inotify(self) -> Optional[int]:
+        libc = _load_libc()
+        if libc is None:
+            return None
+
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return None
+
+        directory = str(self.store.data_path.parent).encode()
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(fd, directory, mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+
+    def _drain_events(self, fd: int) -> bool:
+        target = self.store.data_path.name
+        touched = False
+        while True:
+            try:
+                data = os.read(fd, 4096)
+            except BlockingIOError:
+                return touched
+            except OSError:
+                return touched
+
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                _, _, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + name_len].rstrip(b'\0').decode(errors='replace')
+                offset += name_len
+                if name == target:
+                    touched = True
+
+    def _stat_key(self):
+        try:
+            stat = os.stat(self.store.data_path)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _check(self) -> None:
+        try:
+            self.store.reload_changes()
+        except Exception as e:
+            print(f"Failed to reload keybinds: {e}")
+
+    def _run(self, stop_event: threading.Event, fd: Optional[int]) -> None:
+        last_stat = self._stat_key()
+
+        try:
+            while not stop_event.is_set():
+                if fd is not None:
+                    readable, _, _ = select.select([fd], [], [], self.POLL_INTERVAL)
+                    if not readable or not self._drain_events(fd):
+                        continue
+                    stop_event.wait(self.DEBOUNCE_SECONDS)
+                    self._drain_events(fd)
+                else:
+                    stop_event.wait(self.POLL_INTERVAL)
+                    current = self._stat_key()
+                    if current == last_stat:
+                        continue
+                    last_stat = current
+
+                if not stop_event.is_set():
+                    self._check()
+        finally:
+            if fd is not None:
+                os.close(fd)
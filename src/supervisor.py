@@ -0,0 +1,186 @@
+import os
+import selectors
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
+
+
+@dataclass
+class ProcessRecord:
+
+    pid: int
+    program_path: str
+    started_at: float
+    executable: str = ""
+    exited_at: Optional[float] = None
+    returncode: Optional[int] = None
+
+    @property
+    def runtime(self) -> float:
+        end = self.exited_at if self.exited_at is not None else time.time()
+        return end - self.started_at
+
+
+@dataclass
+class SupervisorStats:
+
+    live: int
+    started: int
+    exited: int
+    failed: int
+    recent: List[ProcessRecord] = field(default_factory=list)
+
+
+@dataclass
+class _Child:
+
+    record: ProcessRecord
+    process: object
+    pidfd: Optional[int] = None
+
+
+class ProcessSupervisor:
+
+    MAX_HISTORY = 256
+    SWEEP_INTERVAL = 1.0
+
+    def __init__(self):
+        self._children: Dict[int, _Child] = {}
+        self._history: Deque[ProcessRecord] = deque(maxlen=self.MAX_HISTORY)
+        self._started = 0
+        self._exited = 0
+        self._failed = 0
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._selector = self._create_selector()
+
+    @staticmethod
+    def _create_selector() -> Optional[selectors.BaseSelector]:
+        if not hasattr(os, 'pidfd_open'):
+            return None
+        try:
+            return selectors.DefaultSelector()
+        except OSError:
+            return None
+
+    def track(
+        self,
+        process,
+        program_path: str,
+        executable: str = ""
+    ) -> ProcessRecord:
+        record = ProcessRecord(
+            pid=process.pid,
+            program_path=program_path,
+            started_at=time.time(),
+            executable=executable,
+        )
+        child = _Child(record=record, process=process)
+
+        if self._selector is not None:
+            try:
+                child.pidfd = os.pidfd_open(process.pid)
+            except OSError:
+                child.pidfd = None
+
+        with self._lock:
+            self._children[process.pid] = child
+            self._started += 1
+            if child.pidfd is not None:
+                self._selector.register(child.pidfd, selectors.EVENT_READ, process.pid)
+
+            if self._thread is None:
+                self._stop_event.clear()
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+        return record
+
+    def _reap(self, pid: int) -> None:
+        with self._lock:
+            child = self._children.get(pid)
+            if child is None:
+                return
+
+            returncode = child.process.poll()
+            if returncode is None:
+                return
+
+            del self._children[pid]
+            if child.pidfd is not None:
+                self._selector.unregister(child.pidfd)
+                os.close(child.pidfd)
+
+            child.record.exited_at = time.time()
+            child.record.returncode = returncode
+            self._history.append(child.record)
+            self._exited += 1
+            if returncode != 0:
+                self._failed += 1
+
+    def _sweep(self) -> None:
+        with self._lock:
+            pids = list(self._children)
+
+        for pid in pids:
+            self._reap(pid)
+
+    def _run(self) -> None:
+        next_sweep = time.monotonic() + self.SWEEP_INTERVAL
+
+        while True:
+            if self._selector is not None:
+                with self._lock:
+                    has_fds = bool(self._selector.get_map())
+                if has_fds:
+                    for key, _ in self._selector.select(self.SWEEP_INTERVAL):
+                        self._reap(key.data)
+                else:
+                    self._stop_event.wait(self.SWEEP_INTERVAL)
+            else:
+                self._stop_event.wait(self.SWEEP_INTERVAL)
+
+            if time.monotonic() >= next_sweep:
+                self._sweep()
+                next_sweep = time.monotonic() + self.SWEEP_INTERVAL
+
+            with self._lock:
+                if not self._children or self._stop_event.is_set():
+                    self._thread = None
+                    return
+
+    def live_processes(self) -> List[ProcessRecord]:
+        with self._lock:
+            return [child.record for child in self._children.values()]
+
+    def is_alive(self, pid: int) -> bool:
+        with self._lock:
+            return pid in self._children
+
+    def stats(self) -> SupervisorStats:
+        with self._lock:
+            return SupervisorStats(
+                live=len(self._children),
+                started=self._started,
+                exited=self._exited,
+                failed=self._failed,
+                recent=list(self._history),
+            )
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        with self._lock:
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(self.SWEEP_INTERVAL * 2)
+
+        with self._lock:
+            for child in self._children.values():
+                if child.pidfd is not None:
+                    self._selector.unregister(child.pidfd)
+                    os.close(child.pidfd)
+                    child.pidfd = None
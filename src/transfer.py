@@ -0,0 +1,426 @@
+import csv
+import io
+import json
+import os
+import struct
+import time
+import uuid
+from dataclasses import MISSING, asdict, dataclass, field, fields
+from itertools import chain
+from pathlib import Path
+from typing import Any, Callable, Dict, IO, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from .encryption import EncryptionManager
+from .macro import MacroError, validate_steps
+from .skeleton import combo_key
+from .storage import Keybind, KeybindStore
+
+
+IMPORT_FORMATS = ('auto', 'jsonl', 'csv', 'bitwarden', 'lastpass', 'browser')
+EXPORT_FORMATS = ('jsonl', 'csv')
+ACTION_TYPES = ('paste', 'launch', 'launch_paste', 'macro', 'workspace')
+
+ENCRYPTED_MAGIC = b"QKX1"
+CHUNK_SIZE = 64 * 1024
+FRAME = struct.Struct(">I")
+FINAL_FLAG = 0x80000000
+PROGRESS_EVERY = 200
+
+KEYBIND_FIELDS = [f.name for f in fields(Keybind)]
+EXPORT_FIELDS = KEYBIND_FIELDS
+
+Progress = Callable[[int, int], None]
+
+
+class TransferError(ValueError):
+    pass
+
+
+@dataclass
+class ImportResult:
+
+    imported: List[str] = field(default_factory=list)
+    skipped: List[Tuple[int, str]] = field(default_factory=list)
+
+
+def _parse_bool(value: str) -> bool:
+    return value.strip().lower() in ('1', 'true', 'yes', 'y', 'on')
+
+
+def _field_parsers() -> Dict[str, Callable[[str], Any]]:
+    parsers = {}
+    for f in fields(Keybind):
+        if f.default_factory is not MISSING:
+            parsers[f.name] = json.loads
+        elif isinstance(f.default, bool):
+            parsers[f.name] = _parse_bool
+        elif isinstance(f.default, float):
+            parsers[f.name] = float
+        else:
+            parsers[f.name] = str
+    return parsers
+
+
+_FIELD_PARSERS = _field_parsers()
+
+
+class _EncryptedWriter(io.RawIOBase):
+
+    def __init__(self, raw: IO[bytes], passphrase: str):
+        salt = os.urandom(EncryptionManager.SALT_SIZE)
+        self._aes = AESGCM(EncryptionManager().derive_key(passphrase, salt))
+        self._raw = raw
+        self._buffer = bytearray()
+        self._index = 0
+        raw.write(ENCRYPTED_MAGIC + salt)
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        while len(self._buffer) >= CHUNK_SIZE:
+            self._write_frame(bytes(self._buffer[:CHUNK_SIZE]), final=False)
+            del self._buffer[:CHUNK_SIZE]
+        return len(data)
+
+    def _write_frame(self, chunk: bytes, final: bool) -> None:
+        nonce = os.urandom(EncryptionManager.NONCE_SIZE)
+        ciphertext = self._aes.encrypt(nonce, chunk, struct.pack(">Q?", self._index, final))
+        length = len(ciphertext) | (FINAL_FLAG if final else 0)
+        self._raw.write(FRAME.pack(length) + nonce + ciphertext)
+        self._index += 1
+
+    def close(self) -> None:
+        if not self.closed:
+            self._write_frame(bytes(self._buffer), final=True)
+            self._buffer.clear()
+        super().close()
+
+
+class _EncryptedReader(io.RawIOBase):
+
+    def __init__(self, raw: IO[bytes], passphrase: str):
+        header = raw.read(len(ENCRYPTED_MAGIC) + EncryptionManager.SALT_SIZE)
+        if not header.startswith(ENCRYPTED_MAGIC):
+            raise TransferError("Not an encrypted QuickKeys export")
+        salt = header[len(ENCRYPTED_MAGIC):]
+        self._aes = AESGCM(EncryptionManager().derive_key(passphrase, salt))
+        self._raw = raw
+        self._pending = b""
+        self._index = 0
+        self._finished = False
+
+    def readable(self) -> bool:
+        return True
+
+    def _read_frame(self) -> None:
+        header = self._raw.read(FRAME.size)
+        if len(header) < FRAME.size:
+            raise TransferError("Encrypted export is truncated")
+
+        (length,) = FRAME.unpack(header)
+        final = bool(length & FINAL_FLAG)
+        length &= ~FINAL_FLAG
+        nonce = self._raw.read(EncryptionManager.NONCE_SIZE)
+        ciphertext = self._raw.read(length)
+        if len(ciphertext) < length:
+            raise TransferError("Encrypted export is truncated")
+
+        try:
+            self._pending = self._aes.decrypt(nonce, ciphertext, struct.pack(">Q?", self._index, final))
+        except InvalidTag:
+            if self._index == 0:
+                raise TransferError("Wrong passphrase for encrypted export")
+            raise TransferError("Encrypted export is corrupted")
+        self._index += 1
+        self._finished = final
+
+    def readinto(self, buffer) -> int:
+        while not self._pending and not self._finished:
+            self._read_frame()
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def is_encrypted(path: Path) -> bool:
+    with open(path, 'rb') as f:
+        return f.read(len(ENCRYPTED_MAGIC)) == ENCRYPTED_MAGIC
+
+
+def _detect_csv_format(header: List[str]) -> str:
+    columns = {column.strip().lower() for column in header}
+    if 'action_type' in columns:
+        return 'csv'
+    if 'login_password' in columns:
+        return 'bitwarden'
+    if 'grouping' in columns and 'extra' in columns:
+        return 'lastpass'
+    if 'password' in columns and 'username' in columns:
+        return 'browser'
+    raise TransferError("Unrecognised CSV header")
+
+
+def _credential_record(name: str, username: str, password: str, url: str) -> Dict[str, Any]:
+    if not name:
+        name = urlparse(url).hostname or url
+    return {
+        'name': name,
+        'hotkey': "",
+        'action_type': 'paste',
+        'username': username,
+        'password': password,
+    }
+
+
+Record = Union[Dict[str, Any], TransferError, None]
+
+
+def _csv_records(lines: Iterable[str], fmt: str) -> Iterator[Record]:
+    reader = csv.reader(lines)
+    try:
+        header = next(reader)
+    except StopIteration:
+        return
+    if fmt == 'auto':
+        fmt = _detect_csv_format(header)
+    columns = [column.strip().lower() for column in header]
+
+    for row in reader:
+        if not any(row):
+            continue
+        values = dict(zip(columns, row))
+
+        if fmt == 'csv':
+            yield {key: value for key, value in values.items() if key in _FIELD_PARSERS and value != ""}
+        elif fmt == 'bitwarden':
+            if values.get('type', 'login') != 'login':
+                yield None
+                continue
+            yield _credential_record(
+                values.get('name', ""), values.get('login_username', ""),
+                values.get('login_password', ""), values.get('login_uri', ""),
+            )
+        elif fmt == 'lastpass':
+            yield _credential_record(
+                values.get('name', ""), values.get('username', ""),
+                values.get('password', ""), values.get('url', ""),
+            )
+        else:
+            yield _credential_record(
+                values.get('name') or values.get('title', ""), values.get('username', ""),
+                values.get('password', ""), values.get('url', ""),
+            )
+
+
+def _jsonl_records(lines: Iterable[str]) -> Iterator[Record]:
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield TransferError(f"Invalid JSON: {e.msg}")
+            continue
+        if not isinstance(record, dict):
+            yield TransferError("Expected a JSON object")
+            continue
+        yield record
+
+
+class _RecordStream:
+
+    def __init__(self, lines: Iterator[str], fmt: str):
+        self.lines = lines
+        self.fmt = fmt
+
+    def __iter__(self) -> Iterator[Record]:
+        try:
+            first = next(self.lines)
+        except StopIteration:
+            return iter(())
+        lines = chain([first], self.lines)
+
+        fmt = self.fmt
+        if fmt == 'auto' and first.lstrip().startswith('{'):
+            fmt = 'jsonl'
+        if fmt == 'jsonl':
+            return _jsonl_records(lines)
+        return _csv_records(lines, fmt)
+
+
+class _HotkeyIndex:
+
+    def __init__(self, keybinds: Iterable[Keybind]):
+        self._combos: Dict[str, str] = {}
+        for keybind in keybinds:
+            if keybind.hotkey:
+                try:
+                    self._combos[combo_key(keybind.hotkey)] = keybind.id
+                except ValueError:
+                    continue
+
+    def claim(self, hotkey: str, keybind_id: str) -> None:
+        if not hotkey:
+            return
+        try:
+            combo = combo_key(hotkey)
+        except ValueError as e:
+            raise TransferError(f"Invalid hotkey '{hotkey}': {e}")
+        if combo in self._combos:
+            raise TransferError(f"The hotkey '{hotkey}' is already in use")
+        self._combos[combo] = keybind_id
+
+
+def _build_keybind(record: Dict[str, Any], hotkeys: _HotkeyIndex, ids: set, credentials: set) -> Keybind:
+    unknown = set(record) - set(KEYBIND_FIELDS)
+    if unknown:
+        raise TransferError(f"Unknown keybind fields: {', '.join(sorted(unknown))}")
+
+    values = {}
+    for key, value in record.items():
+        parser = _FIELD_PARSERS[key]
+        if isinstance(value, str) and parser is not str:
+            try:
+                value = parser(value)
+            except ValueError:
+                raise TransferError(f"Invalid value for '{key}'")
+        values[key] = value
+
+    for required in ('name', 'action_type'):
+        if not values.get(required):
+            raise TransferError(f"Keybind is missing '{required}'")
+    if values['action_type'] not in ACTION_TYPES:
+        raise TransferError(f"Unknown action type '{values['action_type']}'")
+    if values['action_type'] == 'macro':
+        steps = values.get('macro_steps') or []
+        if not isinstance(steps, list) or not all(isinstance(step, dict) for step in steps):
+            raise TransferError("Invalid macro: steps must be a list of objects")
+        try:
+            validate_steps(steps)
+        except MacroError as e:
+            raise TransferError(f"Invalid macro: {e}")
+
+    if not values.get('id') or values['id'] in ids:
+        values['id'] = str(uuid.uuid4())
+    values.setdefault('hotkey', "")
+    values.setdefault('created_at', time.time())
+    if values.get('credential_id') and values['credential_id'] not in credentials:
+        values['credential_id'] = ""
+    elif values.get('credential_id'):
+        values['username'] = ""
+        values['password'] = ""
+
+    try:
+        keybind = Keybind(**values)
+    except TypeError as e:
+        raise TransferError(str(e))
+
+    hotkeys.claim(keybind.hotkey, keybind.id)
+    ids.add(keybind.id)
+    return keybind
+
+
+def import_keybinds(
+    store: KeybindStore,
+    path: Path,
+    fmt: str = 'auto',
+    passphrase: Optional[str] = None,
+    progress: Optional[Progress] = None,
+) -> ImportResult:
+    if fmt not in IMPORT_FORMATS:
+        raise TransferError(f"Unknown import format '{fmt}'")
+
+    total = os.path.getsize(path)
+    result = ImportResult()
+    keybinds: List[Keybind] = []
+
+    with open(path, 'rb') as raw:
+        if raw.read(len(ENCRYPTED_MAGIC)) == ENCRYPTED_MAGIC:
+            if not passphrase:
+                raise TransferError("This export is encrypted; a passphrase is required")
+            raw.seek(0)
+            binary = io.BufferedReader(_EncryptedReader(raw, passphrase))
+        else:
+            raw.seek(0)
+            binary = raw
+
+        text = io.TextIOWrapper(binary, encoding='utf-8-sig', newline='')
+        hotkeys = _HotkeyIndex(store.get_all())
+        ids = set(store.keybinds)
+        credentials = set(store.credentials)
+
+        for number, record in enumerate(_RecordStream(text, fmt), 1):
+            if isinstance(record, TransferError):
+                result.skipped.append((number, str(record)))
+            elif record is not None:
+                try:
+                    keybinds.append(_build_keybind(record, hotkeys, ids, credentials))
+                except (TransferError, ValueError) as e:
+                    result.skipped.append((number, str(e)))
+            if progress and number % PROGRESS_EVERY == 0:
+                progress(raw.tell(), total)
+
+    if keybinds:
+        store.add_many(keybinds)
+    result.imported = [keybind.id for keybind in keybinds]
+    if progress:
+        progress(total, total)
+    return result
+
+
+def export_keybinds(
+    keybinds: List[Keybind],
+    path: Path,
+    fmt: str = 'jsonl',
+    passphrase: Optional[str] = None,
+    progress: Optional[Progress] = None,
+) -> int:
+    if fmt not in EXPORT_FORMATS:
+        raise TransferError(f"Unknown export format '{fmt}'")
+
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    total = len(keybinds)
+
+    try:
+        with open(tmp_path, 'wb') as raw:
+            if passphrase:
+                binary = io.BufferedWriter(_EncryptedWriter(raw, passphrase), CHUNK_SIZE)
+            else:
+                binary = raw
+
+            text = io.TextIOWrapper(binary, encoding='utf-8', newline='')
+            writer = csv.writer(text) if fmt == 'csv' else None
+            if writer:
+                writer.writerow(EXPORT_FIELDS)
+
+            for number, keybind in enumerate(keybinds, 1):
+                data = asdict(keybind)
+                if writer:
+                    writer.writerow([
+                        json.dumps(data[name]) if isinstance(data[name], list) else data[name]
+                        for name in EXPORT_FIELDS
+                    ])
+                else:
+                    text.write(json.dumps(data, ensure_ascii=False))
+                    text.write("\n")
+                if progress and number % PROGRESS_EVERY == 0:
+                    progress(number, total)
+
+            text.close()
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_path, path)
+
+    if progress:
+        progress(total, total)
+    return total
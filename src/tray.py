@@ -5,11 +5,13 @@ from typing import Callable, Optional
 from PIL import Image
 import pystray
 
-from .config import get_icon_path, get_png_icon_path
+from .config import get_cache_dir, get_icon_path, get_png_icon_path
 
 
 class SystemTray:
 
+    ICON_SIZE = 64
+
     def __init__(
         self,
         on_configure: Callable,
@@ -36,14 +38,39 @@ class SystemTray:
 
         return image
 
+    def _load_png_icon(self, png_path: Path) -> Image.Image:
+        stat = png_path.stat()
+        cache_name = f"tray_{self.ICON_SIZE}_{stat.st_mtime_ns}_{stat.st_size}.png"
+
+        try:
+            cache_dir = get_cache_dir()
+            cache_path = cache_dir / cache_name
+            if cache_path.exists():
+                img = Image.open(cache_path)
+                img.load()
+                return img
+        except Exception:
+            cache_dir = None
+
+        img = Image.open(png_path)
+        img = img.convert('RGBA')
+        img = img.resize((self.ICON_SIZE, self.ICON_SIZE), Image.LANCZOS)
+
+        if cache_dir is not None:
+            try:
+                for stale in cache_dir.glob(f"tray_{self.ICON_SIZE}_*.png"):
+                    stale.unlink()
+                img.save(cache_dir / cache_name)
+            except OSError:
+                pass
+
+        return img
+
     def _load_icon(self) -> Image.Image:
         png_path = get_png_icon_path()
         if png_path and png_path.exists():
             try:
-                img = Image.open(png_path)
-                img = img.convert('RGBA')
-                img = img.resize((64, 64), Image.LANCZOS)
-                return img
+                return self._load_png_icon(png_path)
             except Exception:
                 pass
 
@@ -0,0 +1,322 @@
+import ctypes
+import ctypes.util
+import os
+import platform
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+@dataclass
+class WindowInfo:
+
+    window_id: int
+    pid: Optional[int]
+    title: str
+
+
+class _XClientMessageEvent(ctypes.Structure):
+
+    _fields_ = [
+        ('type', ctypes.c_int),
+        ('serial', ctypes.c_ulong),
+        ('send_event', ctypes.c_int),
+        ('display', ctypes.c_void_p),
+        ('window', ctypes.c_ulong),
+        ('message_type', ctypes.c_ulong),
+        ('format', ctypes.c_int),
+        ('data', ctypes.c_long * 5),
+        ('pad', ctypes.c_long * 12),
+    ]
+
+
+class _X11Backend:
+
+    SUCCESS = 0
+    ANY_PROPERTY_TYPE = 0
+    CLIENT_MESSAGE = 33
+    SUBSTRUCTURE_MASK = (1 << 19) | (1 << 20)
+    ATOM_NAMES = ('_NET_ACTIVE_WINDOW', '_NET_CLIENT_LIST', '_NET_WM_PID', '_NET_WM_NAME', 'WM_NAME')
+
+    def __init__(self):
+        library = ctypes.util.find_library('X11')
+        if not library or not os.environ.get('DISPLAY'):
+            raise OSError("X11 is not available")
+
+        xlib = ctypes.cdll.LoadLibrary(library)
+
+        xlib.XOpenDisplay.restype = ctypes.c_void_p
+        xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+        xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        xlib.XInternAtom.restype = ctypes.c_ulong
+        xlib.XInternAtom.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int]
+        xlib.XGetWindowProperty.restype = ctypes.c_int
+        xlib.XGetWindowProperty.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong,
+            ctypes.c_long, ctypes.c_long, ctypes.c_int, ctypes.c_ulong,
+            ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_int),
+            ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_ulong),
+            ctypes.POINTER(ctypes.c_void_p),
+        ]
+        xlib.XFree.argtypes = [ctypes.c_void_p]
+        xlib.XSendEvent.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.c_int, ctypes.c_long, ctypes.c_void_p,
+        ]
+        xlib.XMapRaised.argtypes = [ctypes.c_void_p, ctypes.c_ulong]
+        xlib.XSync.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XSetErrorHandler.restype = ctypes.c_void_p
+        xlib.XSetErrorHandler.argtypes = [ctypes.c_void_p]
+
+        error_handler_type = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p)
+        self._error_handler = error_handler_type(lambda display, event: 0)
+        self._error_handler_ptr = ctypes.cast(self._error_handler, ctypes.c_void_p).value
+
+        display = xlib.XOpenDisplay(None)
+        if not display:
+            raise OSError("Cannot open X display")
+
+        self.xlib = xlib
+        self.display = display
+        self.root = xlib.XDefaultRootWindow(display)
+        self._lock = threading.Lock()
+        self._atoms = {
+            name: xlib.XInternAtom(display, name.encode('ascii'), 0)
+            for name in self.ATOM_NAMES
+        }
+
+    @contextmanager
+    def _trap_errors(self):
+        previous = self.xlib.XSetErrorHandler(self._error_handler_ptr)
+        try:
+            yield
+        finally:
+            self.xlib.XSync(self.display, 0)
+            self.xlib.XSetErrorHandler(previous)
+
+    def _get_property(self, window: int, name: str):
+        actual_type = ctypes.c_ulong()
+        actual_format = ctypes.c_int()
+        nitems = ctypes.c_ulong()
+        bytes_after = ctypes.c_ulong()
+        data = ctypes.c_void_p()
+
+        status = self.xlib.XGetWindowProperty(
+            self.display, window, self._atoms[name],
+            0, 1 << 20, 0, self.ANY_PROPERTY_TYPE,
+            ctypes.byref(actual_type), ctypes.byref(actual_format),
+            ctypes.byref(nitems), ctypes.byref(bytes_after),
+            ctypes.byref(data),
+        )
+
+        if status != self.SUCCESS or not data.value:
+            return None
+
+        try:
+            if actual_format.value == 32:
+                values = ctypes.cast(data, ctypes.POINTER(ctypes.c_ulong))
+                return [values[i] for i in range(nitems.value)]
+            return ctypes.string_at(data, nitems.value)
+        finally:
+            self.xlib.XFree(data)
+
+    def _window_pid(self, window: int) -> Optional[int]:
+        value = self._get_property(window, '_NET_WM_PID')
+        if isinstance(value, list) and value:
+            return int(value[0])
+        return None
+
+    def _window_title(self, window: int) -> str:
+        for name in ('_NET_WM_NAME', 'WM_NAME'):
+            value = self._get_property(window, name)
+            if isinstance(value, bytes):
+                return value.decode('utf-8', errors='replace')
+        return ""
+
+    def list_window_ids(self) -> List[int]:
+        with self._lock, self._trap_errors():
+            clients = self._get_property(self.root, '_NET_CLIENT_LIST')
+            return clients if isinstance(clients, list) else []
+
+    def get_window_pid(self, window_id: int) -> Optional[int]:
+        with self._lock, self._trap_errors():
+            return self._window_pid(window_id)
+
+    def activate_window(self, window_id: int) -> bool:
+        event = _XClientMessageEvent()
+        event.type = self.CLIENT_MESSAGE
+        event.send_event = 1
+        event.display = self.display
+        event.window = window_id
+        event.message_type = self._atoms['_NET_ACTIVE_WINDOW']
+        event.format = 32
+        event.data[0] = 2
+        event.data[1] = 0
+
+        with self._lock, self._trap_errors():
+            self.xlib.XMapRaised(self.display, window_id)
+            status = self.xlib.XSendEvent(
+                self.display, self.root, 0,
+                self.SUBSTRUCTURE_MASK, ctypes.byref(event),
+            )
+        return status != 0
+
+    def list_windows(self) -> List[WindowInfo]:
+        with self._lock, self._trap_errors():
+            clients = self._get_property(self.root, '_NET_CLIENT_LIST')
+            if not isinstance(clients, list):
+                return []
+
+            return [
+                WindowInfo(
+                    window_id=window,
+                    pid=self._window_pid(window),
+                    title=self._window_title(window),
+                )
+                for window in clients
+            ]
+
+
+class _Win32Backend:
+
+    def __init__(self):
+        from ctypes import wintypes
+
+        self.user32 = ctypes.windll.user32
+        self._wintypes = wintypes
+        self._enum_proc_type = ctypes.WINFUNCTYPE(
+            ctypes.c_bool, wintypes.HWND, wintypes.LPARAM
+        )
+
+    def list_window_ids(self) -> List[int]:
+        user32 = self.user32
+        window_ids: List[int] = []
+
+        def callback(hwnd, lparam):
+            if user32.IsWindowVisible(hwnd):
+                window_ids.append(hwnd)
+            return True
+
+        user32.EnumWindows(self._enum_proc_type(callback), 0)
+        return window_ids
+
+    def get_window_pid(self, window_id: int) -> Optional[int]:
+        pid = self._wintypes.DWORD()
+        self.user32.GetWindowThreadProcessId(window_id, ctypes.byref(pid))
+        return pid.value or None
+
+    SW_RESTORE = 9
+
+    def activate_window(self, window_id: int) -> bool:
+        if self.user32.IsIconic(window_id):
+            self.user32.ShowWindow(window_id, self.SW_RESTORE)
+        return bool(self.user32.SetForegroundWindow(window_id))
+
+    def list_windows(self) -> List[WindowInfo]:
+        user32 = self.user32
+        windows: List[WindowInfo] = []
+
+        def callback(hwnd, lparam):
+            if not user32.IsWindowVisible(hwnd):
+                return True
+
+            length = user32.GetWindowTextLengthW(hwnd)
+            buffer = ctypes.create_unicode_buffer(length + 1)
+            user32.GetWindowTextW(hwnd, buffer, length + 1)
+
+            pid = self._wintypes.DWORD()
+            user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+
+            windows.append(WindowInfo(window_id=hwnd, pid=pid.value, title=buffer.value))
+            return True
+
+        user32.EnumWindows(self._enum_proc_type(callback), 0)
+        return windows
+
+
+_backend = None
+_backend_loaded = False
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend, _backend_loaded
+
+    with _backend_lock:
+        if not _backend_loaded:
+            _backend_loaded = True
+            try:
+                system = platform.system()
+                if system == "Windows":
+                    _backend = _Win32Backend()
+                elif system == "Linux":
+                    _backend = _X11Backend()
+            except Exception:
+                _backend = None
+
+    return _backend
+
+
+def is_supported() -> bool:
+    return get_backend() is not None
+
+
+def list_windows() -> List[WindowInfo]:
+    backend = get_backend()
+    if backend is None:
+        return []
+
+    try:
+        return backend.list_windows()
+    except Exception:
+        return []
+
+
+def list_window_ids() -> List[int]:
+    backend = get_backend()
+    if backend is None:
+        return []
+
+    try:
+        return backend.list_window_ids()
+    except Exception:
+        return []
+
+
+def get_window_pid(window_id: int) -> Optional[int]:
+    backend = get_backend()
+    if backend is None:
+        return None
+
+    try:
+        return backend.get_window_pid(window_id)
+    except Exception:
+        return None
+
+
+def activate_window(window_id: int) -> bool:
+    backend = get_backend()
+    if backend is None:
+        return False
+
+    try:
+        return backend.activate_window(window_id)
+    except Exception:
+        return False
+
+
+def find_window_for_pids(pids) -> Optional[int]:
+    match = None
+    for window_id in list_window_ids():
+        if get_window_pid(window_id) in pids:
+            match = window_id
+    return match
+
+
+def find_window(title: str) -> Optional[WindowInfo]:
+    needle = title.lower()
+    for window in list_windows():
+        if needle in window.title.lower():
+            return window
+    return None
@@ -0,0 +1,167 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from . import windowing
+from .launcher import Launcher, LaunchResult, PreparedLaunch
+from .readiness import process_tree
+
+
+MEMBER_ACTION_TYPES = ('launch', 'launch_paste')
+DEPENDENCY_SEPARATOR = '<-'
+
+
+class WorkspaceError(ValueError):
+    pass
+
+
+def parse_members(text: str, keybinds) -> List[Dict]:
+    by_name = {
+        kb.name.lower(): kb for kb in keybinds
+        if kb.action_type in MEMBER_ACTION_TYPES
+    }
+
+    def resolve(name: str, line_no: int) -> str:
+        keybind = by_name.get(name.strip().lower())
+        if keybind is None:
+            raise WorkspaceError(f"Line {line_no}: no launch keybind named '{name.strip()}'")
+        return keybind.id
+
+    members = []
+    for line_no, raw_line in enumerate(text.splitlines(), start=1):
+        line = raw_line.strip()
+        if not line or line.startswith('#'):
+            continue
+
+        name, _, deps = line.partition(DEPENDENCY_SEPARATOR)
+        members.append({
+            'keybind_id': resolve(name, line_no),
+            'depends_on': [resolve(dep, line_no) for dep in deps.split(',') if dep.strip()],
+        })
+
+    order_members(members)
+    return members
+
+
+def format_members(members: List[Dict], keybinds) -> str:
+    names = {kb.id: kb.name for kb in keybinds}
+
+    lines = []
+    for member in members:
+        line = names.get(member['keybind_id'], member['keybind_id'])
+        deps = [names.get(dep, dep) for dep in member.get('depends_on', [])]
+        if deps:
+            line += f" {DEPENDENCY_SEPARATOR} " + ", ".join(deps)
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def order_members(members: List[Dict]) -> List[Dict]:
+    if not members:
+        raise WorkspaceError("Workspace has no programs")
+
+    by_id = {}
+    for member in members:
+        if member['keybind_id'] in by_id:
+            raise WorkspaceError("A program is listed more than once")
+        by_id[member['keybind_id']] = member
+
+    ordered: List[Dict] = []
+    state: Dict[str, int] = {}
+
+    def visit(member_id: str):
+        if state.get(member_id) == 2:
+            return
+        if state.get(member_id) == 1:
+            raise WorkspaceError("Workspace dependencies form a cycle")
+
+        member = by_id.get(member_id)
+        if member is None:
+            raise WorkspaceError("A dependency is not part of the workspace")
+
+        state[member_id] = 1
+        for dep in member.get('depends_on', []):
+            visit(dep)
+        state[member_id] = 2
+        ordered.append(member)
+
+    for member in members:
+        visit(member['keybind_id'])
+    return ordered
+
+
+@dataclass
+class WorkspaceMember:
+
+    keybind: object
+    launch: PreparedLaunch
+    depends_on: List[str] = field(default_factory=list)
+    has_dependents: bool = False
+
+
+@dataclass
+class _MemberRun:
+
+    member: WorkspaceMember
+    result: Optional[LaunchResult] = None
+    ready: threading.Event = field(default_factory=threading.Event)
+    succeeded: bool = False
+
+
+class WorkspacePlan:
+
+    def __init__(
+        self,
+        name: str,
+        members: List[WorkspaceMember],
+        launcher: Launcher,
+        paste: Callable,
+        wait_ready: Callable
+    ):
+        self.name = name
+        self.members = members
+        self.launcher = launcher
+        self.paste = paste
+        self.wait_ready = wait_ready
+
+    def _start_member(self, run: _MemberRun, runs: Dict[str, _MemberRun]) -> None:
+        member = run.member
+        keybind = member.keybind
+        try:
+            for dep in member.depends_on:
+                runs[dep].ready.wait()
+                if not runs[dep].succeeded:
+                    return
+
+            run.result = self.launcher.launch_prepared(member.launch)
+            if keybind.action_type == 'launch_paste' or member.has_dependents:
+                run.succeeded = self.wait_ready(keybind, run.result)
+            else:
+                run.succeeded = run.result.ok
+        finally:
+            run.ready.set()
+
+    def _focus(self, run: _MemberRun, paste_count: int) -> bool:
+        if not windowing.is_supported():
+            return paste_count == 1
+
+        window_id = windowing.find_window_for_pids(process_tree(run.result.pid))
+        return window_id is not None and windowing.activate_window(window_id)
+
+    def run(self) -> None:
+        runs = {member.keybind.id: _MemberRun(member) for member in self.members}
+
+        with ThreadPoolExecutor(max_workers=len(runs)) as executor:
+            for run in runs.values():
+                executor.submit(self._start_member, run, runs)
+
+        paste_runs = [
+            runs[member.keybind.id] for member in self.members
+            if member.keybind.action_type == 'launch_paste'
+        ]
+        for run in paste_runs:
+            if not run.succeeded:
+                print(f"Workspace {self.name}: {run.member.keybind.name} did not become ready")
+            elif self._focus(run, len(paste_runs)):
+                self.paste(run.member.keybind)